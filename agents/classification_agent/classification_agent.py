@@ -8,13 +8,16 @@ from agents.classification_agent.src.agent.tools import (
     ingest_review
 )
 
+from agents.classification_agent.src.config import NOTION_OUTBOX_ENABLED
+from agents.classification_agent.src.nodes.notion_outbox import NotionOutboxSyncer
+
 from nicegui.events import UploadEventArguments
-from common.ChatManager import ChatManager
+from common.ChatManager import ChatManager, LaneQueue, AGENT_WORKERS, thread_id_for
 from nicegui import app, ui
 import asyncio
 import os
 import logging
-from common.ConnectionManager import ConnectionManager
+from common.ConnectionManager import ConnectionManager, current_correlation_id
 from common.tools.communicate import create_comm_tool
 #from common.tools.knowledgebase import retriever_tool
 #from common.utils import IngestKnowledge
@@ -30,7 +33,7 @@ class AgentManager():
 
     def __init__(self):
         self.chat_manager = ChatManager(name="ClassificationAgent")
-        self.task_queue = asyncio.Queue()
+        self.task_queue = LaneQueue()
         self.connection_manager = ConnectionManager("ClassificationAgent",
                                                     "An agent that performs complete review analysis workflow: ingests reviews, classifies criticality, analyzes sentiment, and logs all results to Notion database. This agent handles the ENTIRE workflow end-to-end.",
                                                     ["classify_review_criticality",
@@ -40,22 +43,27 @@ class AgentManager():
                                                      "ingest_review"]
                                                     )
         self.update_ui_callback = None
+        self.notion_syncer = NotionOutboxSyncer()
 
     async def worker(self):
         logging.info("Starting worker thread")
         while True:
             task_data = await self.task_queue.get()
-            logging.info(f"Worker thread picked up {task_data}")
-            logging.info(type(self.chat_manager))
-            message = ""
-            if isinstance(task_data, dict):
-                message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
-            elif isinstance(task_data, str):
-                message = task_data
-            else:
-                logging.info(f"Incorrect message format")
-            await self.chat_manager.run_agent(message)
-            self.task_queue.task_done()
+            try:
+                logging.info(f"Worker thread picked up {task_data}")
+                logging.info(type(self.chat_manager))
+                message = ""
+                current_correlation_id.set(task_data.get("correlation_id") if isinstance(task_data, dict) else None)
+                if isinstance(task_data, dict):
+                    message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
+                elif isinstance(task_data, str):
+                    message = task_data
+                else:
+                    logging.info(f"Incorrect message format")
+                await self.chat_manager.run_agent(message, thread_id_for(task_data))
+            finally:
+                # frees the conversation's lane for its next request
+                self.task_queue.task_done(task_data)
             if self.update_ui_callback:
                 self.update_ui_callback()
 
@@ -81,7 +89,10 @@ class AgentManager():
         ]
 
         await self.chat_manager.setup(tools=tools, prompt="", type="classify")
-        asyncio.create_task(self.worker())
+        for _ in range(AGENT_WORKERS):
+            asyncio.create_task(self.worker())
+        if NOTION_OUTBOX_ENABLED:
+            self.notion_syncer.start()
 
 
 application = AgentManager()
@@ -15,36 +15,34 @@ def show_stats():
 
 def show_recent_reviews(limit=5):
     """Show recent reviews"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("""
-        SELECT review_id, reviewer_name, rating, processed, created_at
-        FROM raw_reviews
-        ORDER BY created_at DESC
-        LIMIT %s
-    """, (limit,))
+        cursor.execute("""
+            SELECT review_id, reviewer_name, rating, processed, created_at
+            FROM raw_reviews
+            ORDER BY created_at DESC
+            LIMIT %s
+        """, (limit,))
 
-    rows = cursor.fetchall()
-    print(f"\n Recent {limit} reviews:")
-    for row in rows:
-        status = "" if row[3] else ""
-        print(f"  {status} {row[0]} | {row[1]} | Rating: {row[2]} | {row[4]}")
+        rows = cursor.fetchall()
+        print(f"\n Recent {limit} reviews:")
+        for row in rows:
+            status = "" if row[3] else ""
+            print(f"  {status} {row[0]} | {row[1]} | Rating: {row[2]} | {row[4]}")
 
-    cursor.close()
-    conn.close()
+        cursor.close()
 
 def mark_review_unprocessed(review_id):
     """Mark a review as unprocessed for testing"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
-    cursor.execute("UPDATE raw_reviews SET processed = FALSE WHERE review_id = %s", (review_id,))
-    affected = cursor.rowcount
+        cursor.execute("UPDATE raw_reviews SET processed = FALSE, status = 'pending', lease_owner = NULL, lease_expires_at = NULL WHERE review_id = %s", (review_id,))
+        affected = cursor.rowcount
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+        conn.commit()
+        cursor.close()
 
     if affected:
         print(f" Marked {review_id} as unprocessed")
@@ -53,26 +51,25 @@ def mark_review_unprocessed(review_id):
 
 def search_reviews(search_term):
     """Search reviews by content"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT review_id, reviewer_name, review, processed
-        FROM raw_reviews
-        WHERE review ILIKE %s
-        ORDER BY created_at DESC
-        LIMIT 10
-    """, (f"%{search_term}%",))
-
-    rows = cursor.fetchall()
-    print(f"\n Found {len(rows)} reviews containing '{search_term}':")
-    for row in rows:
-        status = "" if row[3] else ""
-        print(f"  {status} {row[0]} | {row[1]}")
-        print(f"    {row[2][:100]}...")
-
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT review_id, reviewer_name, review, processed
+            FROM raw_reviews
+            WHERE review ILIKE %s
+            ORDER BY created_at DESC
+            LIMIT 10
+        """, (f"%{search_term}%",))
+
+        rows = cursor.fetchall()
+        print(f"\n Found {len(rows)} reviews containing '{search_term}':")
+        for row in rows:
+            status = "" if row[3] else ""
+            print(f"  {status} {row[0]} | {row[1]}")
+            print(f"    {row[2][:100]}...")
+
+        cursor.close()
 
 def main():
     if len(sys.argv) < 2:
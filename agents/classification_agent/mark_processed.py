@@ -7,16 +7,15 @@ from src.database import get_connection
 def mark_all_processed():
     print("Marking all existing reviews as processed...")
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    with get_connection() as conn:
+        cursor = conn.cursor()
 
-    # Update all reviews to processed = TRUE
-    cursor.execute("UPDATE raw_reviews SET processed = TRUE")
-    affected_rows = cursor.rowcount
+        # Update all reviews to processed = TRUE
+        cursor.execute("UPDATE raw_reviews SET processed = TRUE, status = 'done', lease_owner = NULL, lease_expires_at = NULL")
+        affected_rows = cursor.rowcount
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+        conn.commit()
+        cursor.close()
 
     print(f" Marked {affected_rows} reviews as processed")
     print("Now only new reviews will be processed in future runs")
@@ -1,19 +1,24 @@
 from typing import Literal
-from langchain.chat_models import init_chat_model
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver    # type: ignore 
-from langchain_core.messages import ToolMessage                  # type: ignore
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage  # type: ignore
 import aiosqlite                                                     # type: ignore
+import asyncio
+import json
+import uuid
 from typing import List, Any
 from agents.classification_agent.src.config import (
     AGENT_CHECKPOINT_DB,
-    AGENT_VERBOSE
+    AGENT_VERBOSE,
+    TOOL_CONCURRENCY,
+    FAST_PATH_ENABLED
 )
 from agents.classification_agent.src.agent.agent_state import ReviewAgentState
 
 
 
 from agents.classification_agent.src.agent.prompts import get_system_prompt
+from agents.classification_agent.src.agent.fast_path import FastPathRequest, parse_classification_request
 from agents.classification_agent.src.agent.tools.memory_tool import memory_search_tool
 from agents.classification_agent.src.memory.qdrant_store import QdrantStore
 from agents.classification_agent.src.memory.memory_manager import MemoryManager
@@ -23,7 +28,35 @@ from agents.classification_agent.src.agent.tools import (
     log_reviews_to_notion,
     get_current_datetime
 )
-from config.config_helper import get_model_config
+from config.config_helper import get_llm
+from common.concurrency import run_blocking, gather_ordered, runs_sequentially
+
+# tools the fast path needs, and the one it replies to other agents with
+FAST_PATH_TOOLS = {"classify_review_criticality", "analyze_review_sentiment", "log_reviews_to_notion"}
+FAST_PATH_REPLY_TOOL = "CommunicateTool"
+
+
+def _load_json(result) -> dict:
+    try:
+        data = json.loads(result)
+        return data if isinstance(data, dict) else {}
+    except (TypeError, json.JSONDecodeError):
+        return {}
+
+
+def _needs_classified_ids(tool_call) -> bool:
+    return tool_call["name"] == "analyze_review_sentiment" and not tool_call["args"].get("review_ids")
+
+
+def _classified_review_ids(messages) -> List[str]:
+    """review_ids of the latest classify_review_criticality result of the current turn"""
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        if isinstance(message, ToolMessage) and message.name == "classify_review_criticality":
+            return _load_json(message.content).get("review_ids") or []
+    return []
+
 
 class ReviewAgent:
     """A Review Classification Agent class for analyzing customer reviews"""
@@ -38,8 +71,7 @@ class ReviewAgent:
             enable_critique: Whether to enable the critique/self-review loop
             enable_memory: Whether to enable long term memory (needs qdrant running)
         """
-        model_config = get_model_config()
-        self.llm = init_chat_model(f"{model_config["provider"]}:{model_config['model']}")
+        self.llm = get_llm()
         self.name = name
         self.description = description or get_system_prompt()
         self.enable_critique = enable_critique
@@ -82,7 +114,7 @@ class ReviewAgent:
             print(f"[{self.name}] Initialized with {len(self.tools)} tools")
             print(f"[{self.name}] Critique enabled: {self.enable_critique}")
 
-    def retrieve_memory(self, state: ReviewAgentState) -> ReviewAgentState:
+    async def retrieve_memory(self, state: ReviewAgentState) -> ReviewAgentState:
         """retrieve relevant memories before planning"""
         if not self.enable_memory or not self.memory_store:
             return {}
@@ -93,7 +125,7 @@ class ReviewAgent:
         user_message = state["messages"][-1].content if state["messages"] else ""
 
         try:
-            memories = self.memory_store.get(user_message, top_k=5, score_threshold=0.7)
+            memories = await run_blocking(self.memory_store.get, user_message, top_k=5, score_threshold=0.7)
 
             if memories:
                 memory_context = "## past experiences:\n\n"
@@ -117,7 +149,128 @@ class ReviewAgent:
 
         return {}
 
-    def planner(self, state: ReviewAgentState) -> ReviewAgentState:
+    def route_start(self, state: ReviewAgentState) -> Literal["fast_path", "agent"]:
+        """
+        Send plain classification requests down the fixed pipeline, everything else to the planner
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            Next node to visit
+        """
+        if not FAST_PATH_ENABLED or not state["messages"]:
+            return "agent"
+
+        content = state["messages"][-1].content
+        request = parse_classification_request(content) if isinstance(content, str) else None
+        if request is None:
+            return "agent"
+
+        required = FAST_PATH_TOOLS | ({"ingest_review"} if request.review_text else set())
+        if not required.issubset({tool.name for tool in self.tools}):
+            return "agent"
+        return "fast_path"
+
+    async def fast_path(self, state: ReviewAgentState) -> ReviewAgentState:
+        """
+        Run ingest -> classify + sentiment -> notion -> reply straight from code
+
+        The tool chain is fixed for these requests, so the only LLM call is the
+        one that writes the final reply.
+
+        Args:
+            state: Current agent state
+
+        Returns:
+            Updated state with tool call/result messages and the final reply
+        """
+        request = parse_classification_request(state["messages"][-1].content)
+        tools_by_name = {tool.name: tool for tool in self.tools}
+        messages = []
+
+        if AGENT_VERBOSE:
+            print(f"\n[{self.name}] Fast path: {request}")
+
+        async def run_step(*calls):
+            """run one stage of tool calls concurrently, recording it like a normal tool turn"""
+            tool_calls = [
+                {"name": name, "args": args, "id": f"fast_{uuid.uuid4().hex[:12]}", "type": "tool_call"}
+                for name, args in calls
+            ]
+            messages.append(AIMessage(content="", tool_calls=tool_calls))
+
+            async def run_call(tool_call):
+                try:
+                    return await tools_by_name[tool_call["name"]].ainvoke(tool_call["args"])
+                except Exception as e:
+                    if AGENT_VERBOSE:
+                        print(f"[Tool] {tool_call['name']} failed: {str(e)}")
+                    return json.dumps({"error": f"Error executing {tool_call['name']}: {str(e)}"})
+
+            results = await asyncio.gather(*(run_call(tool_call) for tool_call in tool_calls))
+            for tool_call, result in zip(tool_calls, results):
+                messages.append(ToolMessage(content=result, name=tool_call["name"], tool_call_id=tool_call["id"]))
+            return [_load_json(result) for result in results]
+
+        review_ids = list(request.review_ids)
+        if request.review_text:
+            [ingested] = await run_step(("ingest_review", {"review_text": request.review_text}))
+            if ingested.get("review_id"):
+                review_ids = [ingested["review_id"]]
+
+        classification, sentiment, logged = {}, {}, {}
+        if review_ids:
+            classification, sentiment = await run_step(
+                ("classify_review_criticality", {"review_ids": review_ids}),
+                ("analyze_review_sentiment", {"review_ids": review_ids}),
+            )
+            merged = {
+                "reviews": classification.get("reviews", []),
+                "sentiments": sentiment.get("sentiments", []),
+            }
+            [logged] = await run_step(("log_reviews_to_notion", {"review_data": json.dumps(merged)}))
+
+        reply = await self._fast_path_reply(request, review_ids, classification, sentiment, logged)
+
+        if request.sender_id and FAST_PATH_REPLY_TOOL in tools_by_name:
+            await run_step((FAST_PATH_REPLY_TOOL, {"recipient_id": request.sender_id, "message": reply}))
+
+        messages.append(AIMessage(content=reply))
+
+        return {
+            "messages": messages,
+            "plan": "fast path: ingest_review -> classify_review_criticality + analyze_review_sentiment -> log_reviews_to_notion -> reply",
+            "last_review_ids": review_ids,
+            "last_classified_reviews": json.dumps(classification),
+            "last_sentiment_analysis": json.dumps(sentiment),
+        }
+
+    async def _fast_path_reply(self, request: FastPathRequest, review_ids: List[str],
+                               classification: dict, sentiment: dict, logged: dict) -> str:
+        """write the final reply from the pipeline results, the only LLM call on the fast path"""
+        if not review_ids:
+            return "Could not store the review for classification, please try again."
+
+        system_msg = (
+            "You report the results of a review classification pipeline. Write a short reply that includes:\n"
+            "- the review text\n"
+            "- the criticality level (P0/P1/P2/P3 or Critical/Major/Minor) and error categories detected\n"
+            "- the overall sentiment and notable aspects\n"
+            "- whether the results were logged to Notion\n"
+            "Use only the data provided. Do not invent results."
+        )
+        results = {
+            "review_text": request.review_text,
+            "review_ids": review_ids,
+            "classification": classification.get("reviews", classification),
+            "sentiment": sentiment.get("sentiments", sentiment),
+            "notion": {key: value for key, value in logged.items() if key != "reviews"},
+        }
+        response = await self.llm.ainvoke([("system", system_msg), ("user", json.dumps(results, default=str)[:6000])])
+        return response.content
+
+    async def planner(self, state: ReviewAgentState) -> ReviewAgentState:
         """
         Create a step-by-step plan for handling the user's request
 
@@ -163,14 +316,14 @@ class ReviewAgent:
 
         planner_messages = [("system", system_msg), ("user", user_message)]
 
-        plan = self.llm.invoke(planner_messages).content
+        plan = (await self.llm.ainvoke(planner_messages)).content
 
         if AGENT_VERBOSE:
             print(f"[{self.name}] Plan created:\n{plan}")
 
         return {"plan": plan}
 
-    def chat(self, state: ReviewAgentState) -> ReviewAgentState:
+    async def chat(self, state: ReviewAgentState) -> ReviewAgentState:
         """
         Main agent node that processes messages and calls tools
 
@@ -445,7 +598,7 @@ This is MANDATORY.
                     print(f"[{self.name}] >> FILTERING tools to ONLY: log_reviews_to_notion")
 
         # Invoke LLM with (possibly filtered) tools
-        ai_response = tools_to_use.invoke(messages_with_prompt)
+        ai_response = await tools_to_use.ainvoke(messages_with_prompt)
 
         if AGENT_VERBOSE:
             if hasattr(ai_response, "tool_calls") and ai_response.tool_calls:
@@ -456,7 +609,7 @@ This is MANDATORY.
 
         return {"messages": [ai_response]}
 
-    def tools_node(self, state: ReviewAgentState) -> ReviewAgentState:
+    async def tools_node(self, state: ReviewAgentState) -> ReviewAgentState:
         """
         Execute tools called by the agent
 
@@ -466,99 +619,128 @@ This is MANDATORY.
         Returns:
             Updated state with tool results
         """
-        outputs = []
         last_message = state["messages"][-1]
 
         tools_by_name = {tool.name: tool for tool in self.tools}
 
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id = tool_call["id"]
+        if not (hasattr(last_message, "tool_calls") and last_message.tool_calls):
+            return {"messages": []}
 
-                if AGENT_VERBOSE:
-                    print(f"[Tool] Executing {tool_name}...")
+        async def run_tool_call(tool_call) -> ToolMessage:
+            tool_name = tool_call["name"]
+            tool_args = tool_call["args"]
+            tool_id = tool_call["id"]
 
-                tool = tools_by_name[tool_name]
+            if AGENT_VERBOSE:
+                print(f"[Tool] Executing {tool_name}...")
 
-                # SPECIAL HANDLING: Auto-merge data for log_reviews_to_notion if LLM didn't do it
-                if tool_name == "log_reviews_to_notion" and "review_data" in tool_args:
-                    import json
-                    try:
-                        # Check if review_data is just a reviews array instead of merged format
-                        review_data_raw = tool_args["review_data"]
+            tool = tools_by_name[tool_name]
 
-                        # LangChain might have already parsed the JSON, or it might be a string
-                        if isinstance(review_data_raw, str):
-                            parsed = json.loads(review_data_raw)
+            # SPECIAL HANDLING: Auto-merge data for log_reviews_to_notion if LLM didn't do it
+            if tool_name == "log_reviews_to_notion" and "review_data" in tool_args:
+                import json
+                try:
+                    # Check if review_data is just a reviews array instead of merged format
+                    review_data_raw = tool_args["review_data"]
+
+                    # LangChain might have already parsed the JSON, or it might be a string
+                    if isinstance(review_data_raw, str):
+                        parsed = json.loads(review_data_raw)
+                    else:
+                        parsed = review_data_raw  # Already parsed
+
+                    # If it's a list or missing sentiments, we need to merge
+                    if isinstance(parsed, list) or (isinstance(parsed, dict) and "sentiments" not in parsed):
+                        if AGENT_VERBOSE:
+                            print(f"[{self.name}] >> AUTO-FIXING: LLM didn't merge data properly, doing it now...")
+
+                        # Extract reviews and sentiments from message history
+                        reviews_data = None
+                        sentiments_data = None
+
+                        for msg in state["messages"]:
+                            if hasattr(msg, "content") and isinstance(msg.content, str):
+                                try:
+                                    msg_data = json.loads(msg.content)
+
+                                    # Find classification result
+                                    if "reviews" in msg_data and "total_processed" in msg_data:
+                                        reviews_data = msg_data["reviews"]
+                                        if AGENT_VERBOSE:
+                                            print(f"[{self.name}] >> Found reviews data: {len(reviews_data)} reviews")
+
+                                    # Find sentiment result
+                                    if "sentiments" in msg_data and "total_analyzed" in msg_data:
+                                        sentiments_data = msg_data["sentiments"]
+                                        if AGENT_VERBOSE:
+                                            print(f"[{self.name}] >> Found sentiments data: {len(sentiments_data)} sentiments")
+                                except:
+                                    pass
+
+                        # Merge the data
+                        if reviews_data and sentiments_data:
+                            merged_data = {
+                                "reviews": reviews_data,
+                                "sentiments": sentiments_data
+                            }
+                            tool_args["review_data"] = json.dumps(merged_data)
+                            if AGENT_VERBOSE:
+                                print(f"[{self.name}] >> Successfully merged reviews and sentiments!")
                         else:
-                            parsed = review_data_raw  # Already parsed
-
-                        # If it's a list or missing sentiments, we need to merge
-                        if isinstance(parsed, list) or (isinstance(parsed, dict) and "sentiments" not in parsed):
                             if AGENT_VERBOSE:
-                                print(f"[{self.name}] >> AUTO-FIXING: LLM didn't merge data properly, doing it now...")
-
-                            # Extract reviews and sentiments from message history
-                            reviews_data = None
-                            sentiments_data = None
-
-                            for msg in state["messages"]:
-                                if hasattr(msg, "content") and isinstance(msg.content, str):
-                                    try:
-                                        msg_data = json.loads(msg.content)
-
-                                        # Find classification result
-                                        if "reviews" in msg_data and "total_processed" in msg_data:
-                                            reviews_data = msg_data["reviews"]
-                                            if AGENT_VERBOSE:
-                                                print(f"[{self.name}] >> Found reviews data: {len(reviews_data)} reviews")
-
-                                        # Find sentiment result
-                                        if "sentiments" in msg_data and "total_analyzed" in msg_data:
-                                            sentiments_data = msg_data["sentiments"]
-                                            if AGENT_VERBOSE:
-                                                print(f"[{self.name}] >> Found sentiments data: {len(sentiments_data)} sentiments")
-                                    except:
-                                        pass
-
-                            # Merge the data
-                            if reviews_data and sentiments_data:
-                                merged_data = {
-                                    "reviews": reviews_data,
-                                    "sentiments": sentiments_data
-                                }
-                                tool_args["review_data"] = json.dumps(merged_data)
-                                if AGENT_VERBOSE:
-                                    print(f"[{self.name}] >> Successfully merged reviews and sentiments!")
-                            else:
-                                if AGENT_VERBOSE:
-                                    print(f"[{self.name}] >> WARNING: Could not find reviews or sentiments data to merge")
-                    except json.JSONDecodeError:
-                        # If it's not valid JSON, let the tool handle the error
-                        pass
+                                print(f"[{self.name}] >> WARNING: Could not find reviews or sentiments data to merge")
+                except json.JSONDecodeError:
+                    # If it's not valid JSON, let the tool handle the error
+                    pass
 
-                try:
-                    result = tool.invoke(tool_args)
-                    if AGENT_VERBOSE:
-                        print(f"[Tool] {tool_name} completed successfully")
-                except Exception as e:
-                    result = f"Error executing {tool_name}: {str(e)}"
-                    if AGENT_VERBOSE:
-                        print(f"[Tool] {tool_name} failed: {str(e)}")
+            try:
+                # sync-only tools (DeBERTa, psycopg) run in an executor via BaseTool.ainvoke
+                result = await tool.ainvoke(tool_args)
+                if AGENT_VERBOSE:
+                    print(f"[Tool] {tool_name} completed successfully")
+            except Exception as e:
+                result = f"Error executing {tool_name}: {str(e)}"
+                if AGENT_VERBOSE:
+                    print(f"[Tool] {tool_name} failed: {str(e)}")
 
-                # Create tool message
-                tool_message = ToolMessage(
-                    content=result,
-                    name=tool_name,
-                    tool_call_id=tool_id
-                )
-                outputs.append(tool_message)
+            # Create tool message
+            return ToolMessage(
+                content=result,
+                name=tool_name,
+                tool_call_id=tool_id
+            )
+
+        def run_batch(tool_calls):
+            # independent calls run concurrently, results keep call order
+            return gather_ordered(
+                tool_calls,
+                run_tool_call,
+                limit=TOOL_CONCURRENCY,
+                sequential=lambda call: runs_sequentially(tools_by_name.get(call["name"])),
+            )
+
+        # sentiment without review_ids runs after the other calls and scores the batch
+        # classification claimed in this turn instead of claiming a different one
+        tool_calls = last_message.tool_calls
+        deferred = [index for index, call in enumerate(tool_calls) if _needs_classified_ids(call)]
+        first = [index for index in range(len(tool_calls)) if index not in deferred]
+        outputs = [None] * len(tool_calls)
+        for index, output in zip(first, await run_batch([tool_calls[index] for index in first])):
+            outputs[index] = output
+
+        if deferred:
+            review_ids = _classified_review_ids(state["messages"] + [outputs[index] for index in first])
+            if AGENT_VERBOSE:
+                print(f"[{self.name}] >> Passing classified review_ids to analyze_review_sentiment: {review_ids}")
+            calls = [tool_calls[index] for index in deferred]
+            if review_ids:
+                calls = [{**call, "args": {**call["args"], "review_ids": review_ids}} for call in calls]
+            for index, output in zip(deferred, await run_batch(calls)):
+                outputs[index] = output
 
         return {"messages": outputs}
 
-    def critique(self, state: ReviewAgentState) -> ReviewAgentState:
+    async def critique(self, state: ReviewAgentState) -> ReviewAgentState:
         """
         Review the agent's response for quality and completeness
 
@@ -591,7 +773,7 @@ This is MANDATORY.
             ("system", critique_prompt)
         ]
 
-        critique = self.llm.invoke(critique_message).content
+        critique = (await self.llm.ainvoke(critique_message)).content
 
         if AGENT_VERBOSE:
             print(f"[{self.name}] Critique: {critique}")
@@ -641,7 +823,7 @@ This is MANDATORY.
             # Good to go
             return "end"
 
-    def store_memory(self, state: ReviewAgentState) -> ReviewAgentState:
+    async def store_memory(self, state: ReviewAgentState) -> ReviewAgentState:
         """extract and store memories from conversation"""
         if not self.enable_memory or not self.memory_manager:
             return {}
@@ -650,12 +832,12 @@ This is MANDATORY.
             print(f"\n[{self.name}] Storing memories...")
 
         try:
-            extracted = self.memory_manager.extract(state["messages"])
+            extracted = await run_blocking(self.memory_manager.extract, state["messages"])
 
             stored_count = 0
             for memory in extracted:
                 try:
-                    self.memory_store.put(memory, check_duplicates=True)
+                    await run_blocking(self.memory_store.put, memory, check_duplicates=True)
                     stored_count += 1
                 except:
                     pass
@@ -689,6 +871,7 @@ This is MANDATORY.
         graph.add_node("planner", self.planner)
         graph.add_node("chat", self.chat)
         graph.add_node("tools", self.tools_node)
+        graph.add_node("fast_path", self.fast_path)
 
         if self.enable_critique:
             graph.add_node("critique", self.critique)
@@ -697,12 +880,20 @@ This is MANDATORY.
             graph.add_node("retrieve_memory", self.retrieve_memory)
             graph.add_node("store_memory", self.store_memory)
 
-        # Add edges
+        # Add edges - classification requests skip the planner entirely
+        graph.add_conditional_edges(
+            START,
+            self.route_start,
+            {
+                "fast_path": "fast_path",
+                "agent": "retrieve_memory" if self.enable_memory else "planner"
+            }
+        )
         if self.enable_memory:
-            graph.add_edge(START, "retrieve_memory")
             graph.add_edge("retrieve_memory", "planner")
+            graph.add_edge("fast_path", "store_memory")
         else:
-            graph.add_edge(START, "planner")
+            graph.add_edge("fast_path", END)
 
         graph.add_edge("planner", "chat")
         graph.add_edge("tools", "chat")
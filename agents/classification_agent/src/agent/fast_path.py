@@ -0,0 +1,72 @@
+"""
+Recognise plain "classify this review" requests so they can skip the LLM planner
+
+The workflow for these requests is fixed (ingest -> classify + sentiment -> notion -> reply),
+so the agent runs it straight from code and only asks the LLM to write the final reply.
+Anything that does not clearly match falls back to the normal planner/chat loop.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+# "You have a new message from: <sender>\n+ Message:<text>" is how AgentManager wraps agent messages
+_ENVELOPE = re.compile(r"^You have a new message from:\s*(?:sender_id:\s*)?(?P<sender>[^\n]+)\n\+?\s*Message:(?P<message>.*)$", re.S)
+# only requests that start with the verb and carry the review itself take the fast path:
+#   "classify the review: <text>", "analyze the sentiment of review REV-0012 and REV-0013"
+# questions that merely mention reviews, quotes or ids go to the planner
+_REQUEST = re.compile(
+    r"^(?:please\s+)?(?:classify|categori[sz]e|analy[sz]e)"
+    r"(?:\s+the)?(?:\s+(?:sentiment|criticality)(?:\s+and\s+(?:sentiment|criticality))?\s+of)?"
+    r"(?:\s+(?:this|the|a|new))?\s+reviews?\b"
+    r"(?:(?:\s+text)?\s*:\s*(?P<text>.+)"
+    r"|\s+(?P<ids>REV-\d+(?:\s*(?:,|and|,\s*and)\s*REV-\d+)*)\s*[.!]?)$",
+    re.I | re.S,
+)
+_REVIEW_IDS = re.compile(r"\bREV-\d+\b", re.I)
+_QUOTES = "\"'“”‘’"
+
+
+@dataclass
+class FastPathRequest:
+    """A classification request the agent can run without planning"""
+    sender_id: Optional[str] = None
+    review_text: Optional[str] = None
+    review_ids: List[str] = field(default_factory=list)
+
+
+def parse_classification_request(content: str) -> Optional[FastPathRequest]:
+    """
+    Match a message against the fixed classification workflow
+
+    Args:
+        content: Latest human message, possibly wrapped in the agent message envelope
+
+    Returns:
+        FastPathRequest with either review text to ingest or existing review IDs,
+        or None if the message is not a plain classification request
+    """
+    if not content:
+        return None
+
+    sender_id = None
+    message = content.strip()
+    envelope = _ENVELOPE.match(message)
+    if envelope:
+        sender_id = envelope.group("sender").strip()
+        message = envelope.group("message").strip()
+
+    match = _REQUEST.match(message)
+    if not match:
+        return None
+
+    if match.group("ids"):
+        review_ids = [review_id.upper() for review_id in _REVIEW_IDS.findall(match.group("ids"))]
+        return FastPathRequest(sender_id=sender_id, review_ids=list(dict.fromkeys(review_ids)))
+
+    review_text = match.group("text").strip().strip(_QUOTES).strip()
+    if not review_text:
+        return None
+
+    return FastPathRequest(sender_id=sender_id, review_text=review_text)
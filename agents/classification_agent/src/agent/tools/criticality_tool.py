@@ -9,8 +9,9 @@ from langchain_core.tools import BaseTool
 
 from agents.classification_agent.src.config import AGENT_MODEL
 from agents.classification_agent.src.utils import RawReview
-from agents.classification_agent.src.nodes.detect_errors import detect_errors_with_ollama
-from agents.classification_agent.src.database import load_unprocessed_reviews, get_connection
+from agents.classification_agent.src.result_cache import ResultCache, get_result_cache
+from agents.classification_agent.src.nodes.detect_errors import detect_errors_batch
+from agents.classification_agent.src.database import load_unprocessed_reviews, load_reviews_by_ids, insert_detected_errors
 
 
 class CriticalityTool(BaseTool):
@@ -22,7 +23,7 @@ class CriticalityTool(BaseTool):
     # Pydantic fields - must be declared as class attributes
     llm_model: str = AGENT_MODEL  # use same LLM model as agent
     batch_size: int = 50
-    _cache: Dict[str, Any] = {}
+    _cache: Optional[ResultCache] = None  # shared content-hash result cache
 
     def __init__(
         self,
@@ -44,9 +45,9 @@ class CriticalityTool(BaseTool):
         super().__init__(
             llm_model=llm_model,
             batch_size=batch_size,
-            _cache={},
             **kwargs
         )
+        self._cache = get_result_cache("detect")
 
     def _load_reviews_by_ids(self, review_ids: List[str]) -> List[RawReview]:
         """
@@ -58,44 +59,7 @@ class CriticalityTool(BaseTool):
         Returns:
             List of RawReview objects
         """
-        if not review_ids:
-            return []
-
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        placeholders = ','.join(['%s'] * len(review_ids))
-        query = f"""
-            SELECT review_id, review, username, email, date, reviewer_name, rating
-            FROM raw_reviews
-            WHERE review_id IN ({placeholders})
-            ORDER BY created_at DESC
-        """
-
-        cursor.execute(query, review_ids)
-        rows = cursor.fetchall()
-
-        reviews = []
-        for row in rows:
-            # Convert datetime to string
-            date_str = row[4]
-            if hasattr(date_str, 'strftime'):
-                date_str = date_str.strftime('%Y-%m-%d %H:%M:%S')
-
-            reviews.append(RawReview(
-                review_id=row[0],
-                review=row[1],
-                username=row[2],
-                email=row[3],
-                date=str(date_str),
-                reviewer_name=row[5],
-                rating=row[6]
-            ))
-
-        cursor.close()
-        conn.close()
-
-        return reviews
+        return load_reviews_by_ids(review_ids)
 
     def _load_unprocessed_reviews(self, limit: int) -> List[RawReview]:
         """
@@ -120,10 +84,13 @@ class CriticalityTool(BaseTool):
             List of classification results
         """
         results = []
+        pending_errors = []
+
+        # Detect errors and severity using LLM, several reviews per request
+        detected_by_id = detect_errors_batch(reviews, cache=self._cache)
 
         for review in reviews:
-            # Detect errors and severity using LLM
-            detected_errors = detect_errors_with_ollama(review, self.llm_model)
+            detected_errors = detected_by_id.get(review.review_id, [])
 
             classified_errors = []
             for error in detected_errors:
@@ -135,20 +102,13 @@ class CriticalityTool(BaseTool):
                     "rationale": error.rationale
                 })
 
-                # Save error to database
-                from agents.classification_agent.src.database import insert_detected_error
-                print(f"[DEBUG] Inserting error to DB: {review.review_id} - {error.error_summary}")
-                success = insert_detected_error(
-                    review_id=review.review_id,
-                    error_summary=error.error_summary,
-                    error_type=error.error_type,
-                    criticality=error.severity,
-                    rationale=error.rationale
-                )
-                if success:
-                    print(f"[DEBUG] Successfully inserted error for {review.review_id}")
-                else:
-                    print(f"[DEBUG] Failed to insert error for {review.review_id}")
+                pending_errors.append({
+                    "review_id": review.review_id,
+                    "error_summary": error.error_summary,
+                    "error_type": error.error_type,
+                    "criticality": error.severity,
+                    "rationale": error.rationale
+                })
 
             results.append({
                 "review_id": review.review_id,
@@ -159,6 +119,16 @@ class CriticalityTool(BaseTool):
                 "error_count": len(classified_errors)
             })
 
+        # Save all errors to database in one batched write
+        if pending_errors:
+            try:
+                counts = insert_detected_errors(pending_errors)
+                print(f"[DEBUG] Saved detected errors: {counts['inserted']} inserted, {counts['skipped']} already present")
+            except Exception as e:
+                print(f"[ERROR] Failed to insert detected errors: {type(e).__name__}: {e}")
+                import traceback
+                traceback.print_exc()
+
         return results
 
     def _run(
@@ -199,7 +169,8 @@ class CriticalityTool(BaseTool):
             return json.dumps({
                 "reviews": results,
                 "total_processed": len(results),
-                "review_ids": [r.review_id for r in reviews]
+                "review_ids": [r.review_id for r in reviews],
+                "cache": self._cache.stats() if self._cache else None
             }, indent=2)
 
         except Exception as e:
@@ -1,6 +1,7 @@
 """Review Ingestion Tool - Parse and store raw reviews from other agents"""
 
 from langchain_core.tools import tool
+from common.concurrency import SEQUENTIAL_HINT
 from agents.classification_agent.src.database import insert_new_review, get_next_review_id
 from agents.classification_agent.src.utils import get_llm_from_config
 import json
@@ -119,3 +120,7 @@ Important:
             "error": str(e),
             "message": "Failed to ingest review"
         }, indent=2)
+
+
+# later calls classify the review this one stores
+ingest_review.metadata = {SEQUENTIAL_HINT: True}
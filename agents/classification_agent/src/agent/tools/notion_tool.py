@@ -8,15 +8,19 @@ import json
 from typing import List, Optional
 from langchain_core.tools import BaseTool
 
+from common.concurrency import SEQUENTIAL_HINT
 from agents.classification_agent.src.utils import RawReview, DetectedError, EnrichedError, SentimentData, hash_error
-from agents.classification_agent.src.nodes.notion_logger import upsert_enriched_error
-from agents.classification_agent.src.database import mark_reviews_processed
+from agents.classification_agent.src.nodes.notion_sync import sync_enriched_errors, get_sync_metrics
+from agents.classification_agent.src.config import NOTION_OUTBOX_ENABLED
+from agents.classification_agent.src.database import mark_reviews_processed, enqueue_notion_sync
 
 
 class NotionTool(BaseTool):
     """Tool for logging review analysis results to Notion database"""
 
     name: str = "log_reviews_to_notion"
+    # needs the classification and sentiment results, never run alongside them
+    metadata: Optional[dict] = {SEQUENTIAL_HINT: True}
     description: str = """Log processed reviews to Notion database for team tracking and collaboration.
 
 REQUIRED INPUT FORMAT - You MUST merge classification and sentiment results:
@@ -225,23 +229,23 @@ CORRECT: {"reviews": [...], "sentiments": [...]}"""
         processed_review_ids = []
         logged_count = 0
 
-        for enriched_error in enriched_errors:
-            if dry_run:
+        if dry_run:
+            for enriched_error in enriched_errors:
                 print(f"[DRY RUN] Would upsert: {enriched_error.review.review_id} | "
                       f"{enriched_error.error.error_summary} | {enriched_error.criticality}")
-            else:
-                # Actually write to Notion
-                try:
-                    print(f"  Logging {enriched_error.review.review_id} to Notion...")
-                    upsert_enriched_error(enriched_error)
-                    print(f"  Successfully logged {enriched_error.review.review_id}")
-                except Exception as notion_error:
-                    print(f"  ERROR logging {enriched_error.review.review_id}: "
-                          f"{type(notion_error).__name__}: {str(notion_error)}")
-                    import traceback
-                    traceback.print_exc()
-                    raise
+        elif NOTION_OUTBOX_ENABLED:
+            # Queue for the background syncer, the turn does not wait on Notion
+            queued = enqueue_notion_sync(enriched_errors)
+            print(f"  Queued {queued} review(s) for Notion sync")
+        else:
+            # Actually write to Notion (rate-limited, concurrent upserts)
+            print(f"  Logging {len(enriched_errors)} review(s) to Notion...")
+            page_ids = sync_enriched_errors(enriched_errors)
+            failed = [e.review.review_id for e, page_id in zip(enriched_errors, page_ids) if page_id is None]
+            if failed:
+                raise RuntimeError(f"Failed to log {len(failed)} review(s) to Notion: {', '.join(failed)}")
 
+        for enriched_error in enriched_errors:
             logged_count += 1
             if enriched_error.review.review_id not in processed_review_ids:
                 processed_review_ids.append(enriched_error.review.review_id)
@@ -293,6 +297,8 @@ CORRECT: {"reviews": [...], "sentiments": [...]}"""
             # Log to Notion
             logged_count, processed_review_ids = self._log_to_notion(enriched_errors, dry_run)
 
+            queued_for_sync = NOTION_OUTBOX_ENABLED and not dry_run
+
             # Mark reviews as processed in database
             if self.use_database and processed_review_ids and not dry_run:
                 mark_reviews_processed(processed_review_ids)
@@ -303,7 +309,9 @@ CORRECT: {"reviews": [...], "sentiments": [...]}"""
                 "total_reviews": len(processed_review_ids),
                 "review_ids": processed_review_ids,
                 "dry_run": dry_run,
-                "message": f"{'[DRY RUN] Would log' if dry_run else 'Successfully logged'} "
+                "queued": queued_for_sync,
+                "sync_metrics": {} if dry_run or queued_for_sync else get_sync_metrics()["last_batch"],
+                "message": f"{'[DRY RUN] Would log' if dry_run else 'Queued' if queued_for_sync else 'Successfully logged'} "
                           f"{logged_count} error(s) from {len(processed_review_ids)} review(s) to Notion"
             }, indent=2)
 
@@ -9,8 +9,12 @@ from typing import Optional, List, Any, Dict
 from langchain_core.tools import BaseTool
 
 from agents.classification_agent.src.utils import RawReview
-from agents.classification_agent.src.nodes.sentiment_analysis import analyze_review_sentiment as analyze_sentiment_node
-from agents.classification_agent.src.database import load_unprocessed_reviews
+from agents.classification_agent.src.result_cache import ResultCache, get_result_cache
+from agents.classification_agent.src.nodes.sentiment_analysis import (
+    analyze_review_sentiment as analyze_sentiment_node,
+    analyze_batch_sentiments,
+)
+from agents.classification_agent.src.database import load_unprocessed_reviews, load_reviews_by_ids
 
 
 class SentimentTool(BaseTool):
@@ -22,7 +26,7 @@ class SentimentTool(BaseTool):
     # Pydantic fields - must be declared as class attributes
     sentiment_enabled: bool = True
     batch_size: int = 50
-    _cache: Dict[str, Any] = {}
+    _cache: Optional[ResultCache] = None  # shared content-hash result cache
 
     def __init__(
         self,
@@ -44,9 +48,9 @@ class SentimentTool(BaseTool):
         super().__init__(
             sentiment_enabled=sentiment_enabled,
             batch_size=batch_size,
-            _cache={},
             **kwargs
         )
+        self._cache = get_result_cache("sentiment")
 
     def _load_reviews_by_ids(self, review_ids: List[str]) -> List[RawReview]:
         """
@@ -58,46 +62,7 @@ class SentimentTool(BaseTool):
         Returns:
             List of RawReview objects
         """
-        if not review_ids:
-            return []
-
-        from agents.classification_agent.src.database import get_connection
-
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        placeholders = ','.join(['%s'] * len(review_ids))
-        query = f"""
-            SELECT review_id, review, username, email, date, reviewer_name, rating
-            FROM raw_reviews
-            WHERE review_id IN ({placeholders})
-            ORDER BY created_at DESC
-        """
-
-        cursor.execute(query, review_ids)
-        rows = cursor.fetchall()
-
-        reviews = []
-        for row in rows:
-            # Convert datetime to string
-            date_str = row[4]
-            if hasattr(date_str, 'strftime'):
-                date_str = date_str.strftime('%Y-%m-%d %H:%M:%S')
-
-            reviews.append(RawReview(
-                review_id=row[0],
-                review=row[1],
-                username=row[2],
-                email=row[3],
-                date=str(date_str),
-                reviewer_name=row[5],
-                rating=row[6]
-            ))
-
-        cursor.close()
-        conn.close()
-
-        return reviews
+        return load_reviews_by_ids(review_ids)
 
     def _load_unprocessed_reviews(self, limit: int) -> List[RawReview]:
         """
@@ -121,6 +86,15 @@ class SentimentTool(BaseTool):
         Returns:
             List of sentiment analysis results
         """
+        # One batched forward pass per bucket; if the batch fails, fall back to
+        # per-review analysis so a single bad review only costs its own entry
+        try:
+            print(f"[DEBUG SentimentTool] Batch analyzing {len(reviews)} reviews")
+            sentiments = analyze_batch_sentiments(reviews, cache=self._cache)
+            return [self._format_result(review, sentiment_data) for review, sentiment_data in zip(reviews, sentiments)]
+        except Exception as batch_error:
+            print(f"  ERROR in batch sentiment analysis: {type(batch_error).__name__}: {str(batch_error)}, retrying per review")
+
         results = []
 
         for idx, review in enumerate(reviews, 1):
@@ -129,18 +103,7 @@ class SentimentTool(BaseTool):
                 sentiment_data = analyze_sentiment_node(review)
                 print(f"[DEBUG SentimentTool] Sentiment result for {review.review_id}: {sentiment_data.overall_sentiment} (confidence={sentiment_data.overall_confidence:.4f}, polarity={sentiment_data.sentiment_polarity:.4f})")
 
-                results.append({
-                    "review_id": review.review_id,
-                    "review_text": review.review[:200] + "..." if len(review.review) > 200 else review.review,
-                    "rating": review.rating,
-                    "reviewer_name": review.reviewer_name,
-                    "sentiment": {
-                        "overall_sentiment": sentiment_data.overall_sentiment,
-                        "confidence": round(sentiment_data.overall_confidence, 4),
-                        "polarity": round(sentiment_data.sentiment_polarity, 4)
-                    }
-                })
-                print(f"[DEBUG SentimentTool] Added sentiment result for {review.review_id}")
+                results.append(self._format_result(review, sentiment_data))
 
                 # Progress logging
                 if idx % 10 == 0:
@@ -165,6 +128,29 @@ class SentimentTool(BaseTool):
 
         return results
 
+    def _format_result(self, review: RawReview, sentiment_data) -> dict:
+        """
+        Build the tool output entry for one analyzed review
+
+        Args:
+            review: The analyzed review
+            sentiment_data: SentimentData for the review
+
+        Returns:
+            Result dict with review details and sentiment
+        """
+        return {
+            "review_id": review.review_id,
+            "review_text": review.review[:200] + "..." if len(review.review) > 200 else review.review,
+            "rating": review.rating,
+            "reviewer_name": review.reviewer_name,
+            "sentiment": {
+                "overall_sentiment": sentiment_data.overall_sentiment,
+                "confidence": round(sentiment_data.overall_confidence, 4),
+                "polarity": round(sentiment_data.sentiment_polarity, 4)
+            }
+        }
+
     def _run(
         self,
         review_ids: Optional[List[str]] = None,
@@ -230,7 +216,8 @@ class SentimentTool(BaseTool):
                     "negative": sum(1 for r in successful_results if r["sentiment"]["overall_sentiment"] == "Negative"),
                     "neutral": sum(1 for r in successful_results if r["sentiment"]["overall_sentiment"] == "Neutral"),
                     "avg_polarity": round(sum(r["sentiment"]["polarity"] for r in successful_results) / len(successful_results), 4) if successful_results else 0
-                }
+                },
+                "cache": self._cache.stats() if self._cache else None
             }, indent=2)
 
             print(f"[DEBUG SentimentTool] Returning result: {result_json[:500]}...")
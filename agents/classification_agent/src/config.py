@@ -11,10 +11,26 @@ ENABLE_SENTIMENT = os.getenv("ENABLE_SENTIMENT", "true").lower() in ("true", "1"
 SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "yangheng/deberta-v3-base-absa-v1.1")
 SENTIMENT_CONFIDENCE_THRESHOLD = float(os.getenv("SENTIMENT_CONFIDENCE_THRESHOLD", "0.8"))
 SENTIMENT_BOOST_THRESHOLD = float(os.getenv("SENTIMENT_BOOST_THRESHOLD", "-0.85"))
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+SENTIMENT_THREADS = int(os.getenv("SENTIMENT_THREADS", "0"))  # 0 = library default
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "torch").lower()  # torch | onnx
+SENTIMENT_QUANTIZE = os.getenv("SENTIMENT_QUANTIZE", "false").lower() in ("true", "1", "yes")  # int8 dynamic quantization
+SENTIMENT_ONNX_DIR = os.getenv("SENTIMENT_ONNX_DIR", "./models/sentiment_onnx")
 
 # Notion
 NOTION_API_KEY = os.getenv("NOTION_API_KEY")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
+NOTION_RATE_LIMIT = float(os.getenv("NOTION_RATE_LIMIT", "3"))  # requests per second (Notion's documented average)
+NOTION_BURST = int(os.getenv("NOTION_BURST", "3"))
+NOTION_MAX_CONCURRENCY = int(os.getenv("NOTION_MAX_CONCURRENCY", "3"))
+NOTION_MAX_RETRIES = int(os.getenv("NOTION_MAX_RETRIES", "5"))
+NOTION_INDEX_TTL = float(os.getenv("NOTION_INDEX_TTL", "300"))  # seconds before the Hash -> page id index is rebuilt
+# Notion outbox: classification only queues rows in detected_errors, a background syncer writes them
+NOTION_OUTBOX_ENABLED = os.getenv("NOTION_OUTBOX_ENABLED", "true").lower() in ("true", "1", "yes")
+NOTION_OUTBOX_BATCH_SIZE = int(os.getenv("NOTION_OUTBOX_BATCH_SIZE", "50"))
+NOTION_OUTBOX_INTERVAL = float(os.getenv("NOTION_OUTBOX_INTERVAL", "2"))  # seconds between polls when idle
+NOTION_OUTBOX_LEASE_SECONDS = int(os.getenv("NOTION_OUTBOX_LEASE_SECONDS", "120"))
+NOTION_OUTBOX_MAX_ATTEMPTS = int(os.getenv("NOTION_OUTBOX_MAX_ATTEMPTS", "10"))
 
 # OpenAI
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -27,9 +43,41 @@ AGENT_TEMPERATURE = float(os.getenv("AGENT_TEMPERATURE", "0"))
 AGENT_CHECKPOINT_DB = os.getenv("AGENT_CHECKPOINT_DB", "classification_agent.db")
 AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "true").lower() in ("true", "1", "yes")
 AGENT_MAX_ITERATIONS = int(os.getenv("AGENT_MAX_ITERATIONS", "10"))
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() in ("true", "1", "yes")
+
+# Category normalizer store (append-only vectors + metadata log)
+CATEGORY_FLUSH_INTERVAL = float(os.getenv("CATEGORY_FLUSH_INTERVAL", "2.0"))  # seconds before buffered variants are written
+CATEGORY_FLUSH_MAX = int(os.getenv("CATEGORY_FLUSH_MAX", "50"))  # buffered variants that force a write
+CATEGORY_COMPACT_RATIO = float(os.getenv("CATEGORY_COMPACT_RATIO", "2.0"))  # compact once log records exceed this x live records
+
+# Persistent result cache for error detection / sentiment (SQLite)
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "./result_cache.db")
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", str(7 * 24 * 3600)))  # seconds, 0 = never expire
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "50000"))  # per namespace, LRU beyond this
+
+# Error detection batching (reviews packed per LLM request, requests in flight)
+DETECT_BATCH_SIZE = int(os.getenv("DETECT_BATCH_SIZE", "8"))
+DETECT_MAX_CONCURRENCY = int(os.getenv("DETECT_MAX_CONCURRENCY", "4"))
 
 # Database Configuration (Cloud/Supabase support)
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds to wait for a free connection
+DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))  # close idle connections after this many seconds
+DB_POOL_CHECK = os.getenv("DB_POOL_CHECK", "true").lower() in ("true", "1", "yes")  # ping connections before handing them out
+# Prepare a statement server-side after it runs this many times on a connection.
+# Set to "none" when going through a transaction-mode pgbouncer (Supabase pooler port 6543)
+DB_PREPARE_THRESHOLD = None if os.getenv("DB_PREPARE_THRESHOLD", "5").lower() == "none" else int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "5000"))  # rows per COPY batch / transaction in bulk inserts
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "10000"))  # CSV rows read per chunk when streaming a migration
+REVIEW_ID_BLOCK_SIZE = int(os.getenv("REVIEW_ID_BLOCK_SIZE", "100"))  # REV ids reserved per sequence round-trip for bulk ingest
+# Work queue: a worker claims unprocessed reviews for REVIEW_LEASE_SECONDS; reviews whose
+# lease runs out before they are marked processed go back to the queue
+REVIEW_LEASE_SECONDS = int(os.getenv("REVIEW_LEASE_SECONDS", "600"))
+CLASSIFICATION_WORKER_ID = os.getenv("CLASSIFICATION_WORKER_ID")  # defaults to host:pid
 
 # Memory Configuration (local, no docker/api needed)
 MEMORY_ENABLED = os.getenv("MEMORY_ENABLED", "false").lower() in ("true", "1", "yes")
@@ -1,5 +1,12 @@
 import os
-import psycopg
+import atexit
+import socket
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from psycopg.conninfo import make_conninfo
+from psycopg_pool import ConnectionPool, AsyncConnectionPool
 from typing import List, Optional
 from agents.classification_agent.src.utils import RawReview
 
@@ -16,237 +23,613 @@ DB_CONFIG = {
 if os.getenv('DB_PASSWORD'):
     DB_CONFIG['password'] = os.getenv('DB_PASSWORD')
 
+_pool: Optional[ConnectionPool] = None
+_async_pool: Optional[AsyncConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_options() -> tuple:
+    """Connection string and pool settings shared by the sync and async pools"""
+    from agents.classification_agent.src import config
+
+    conninfo = config.DATABASE_URL or make_conninfo(**DB_CONFIG)
+    return {
+        'conninfo': conninfo,
+        'min_size': config.DB_POOL_MIN_SIZE,
+        'max_size': max(config.DB_POOL_MAX_SIZE, config.DB_POOL_MIN_SIZE),
+        'timeout': config.DB_POOL_TIMEOUT,
+        'max_idle': config.DB_POOL_MAX_IDLE,
+        'kwargs': {'prepare_threshold': config.DB_PREPARE_THRESHOLD},
+        'name': 'classification',
+    }, config.DB_POOL_CHECK
+
+
+def get_pool() -> ConnectionPool:
+    """Shared connection pool, opened on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                options, check = _pool_options()
+                if check:
+                    options['check'] = ConnectionPool.check_connection
+                _pool = ConnectionPool(open=True, **options)
+                atexit.register(close_pool)
+    return _pool
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Shared async connection pool, opened on first use inside the running loop"""
+    global _async_pool
+    if _async_pool is None:
+        options, check = _pool_options()
+        if check:
+            options['check'] = AsyncConnectionPool.check_connection
+        pool = AsyncConnectionPool(open=False, **options)
+        await pool.open()
+        _async_pool = pool
+    return _async_pool
+
+
+def close_pool():
+    """Close the sync pool (registered with atexit)"""
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+async def close_async_pool():
+    """Close the async pool"""
+    global _async_pool
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+
+
 def get_connection():
-    """Get database connection (DATABASE_URL or DB_* variables)"""
-    from agents.classification_agent.src.config import DATABASE_URL
+    """Borrow a pooled database connection (DATABASE_URL or DB_* variables)
 
-    if DATABASE_URL:
-        return psycopg.connect(DATABASE_URL)
+    Use as a context manager: the transaction is committed on exit (rolled back on
+    error) and the connection goes back to the pool.
 
-    return psycopg.connect(**DB_CONFIG)
+        with get_connection() as conn:
+            conn.execute(...)
+    """
+    return get_pool().connection()
+
+
+@asynccontextmanager
+async def get_async_connection():
+    """Async counterpart of get_connection: `async with get_async_connection() as conn`"""
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        yield conn
+
+
+def _row_to_review(row) -> RawReview:
+    """Map a (review_id, review, username, email, date, reviewer_name, rating) row"""
+    #DT to stirng
+    date_str = row[4]
+    if hasattr(date_str, 'strftime'):
+        date_str = date_str.strftime('%Y-%m-%d %H:%M:%S')
+
+    return RawReview(
+        review_id=row[0],
+        review=row[1],
+        username=row[2],
+        email=row[3],
+        date=str(date_str),
+        reviewer_name=row[5],
+        rating=row[6]
+    )
 
 def init_database():
     """Initialize database with required tables"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    #reviews table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS raw_reviews (
-            review_id VARCHAR(20) PRIMARY KEY,
-            review TEXT NOT NULL,
-            username VARCHAR(100),
-            email VARCHAR(255) NOT NULL,
-            date TIMESTAMP,
-            reviewer_name VARCHAR(100),
-            rating INTEGER CHECK (rating >= 1 AND rating <= 5),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            processed BOOLEAN DEFAULT FALSE
-        );
-    """)
-
-    #detected_errors table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS detected_errors (
-            id SERIAL PRIMARY KEY,
-            review_id VARCHAR(20) REFERENCES raw_reviews(review_id) ON DELETE CASCADE,
-            error_summary TEXT NOT NULL,
-            error_type VARCHAR(50),
-            criticality VARCHAR(20),
-            rationale TEXT,
-            error_hash VARCHAR(64) UNIQUE,
-            detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            notion_synced BOOLEAN DEFAULT FALSE
-        );
-    """)
-
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+
+        #reviews table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS raw_reviews (
+                review_id VARCHAR(20) PRIMARY KEY,
+                review TEXT NOT NULL,
+                username VARCHAR(100),
+                email VARCHAR(255) NOT NULL,
+                date TIMESTAMP,
+                reviewer_name VARCHAR(100),
+                rating INTEGER CHECK (rating >= 1 AND rating <= 5),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                processed BOOLEAN DEFAULT FALSE
+            );
+        """)
+
+        #detected_errors table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS detected_errors (
+                id SERIAL PRIMARY KEY,
+                review_id VARCHAR(20) REFERENCES raw_reviews(review_id) ON DELETE CASCADE,
+                error_summary TEXT NOT NULL,
+                error_type VARCHAR(50),
+                criticality VARCHAR(20),
+                rationale TEXT,
+                error_hash VARCHAR(64) UNIQUE,
+                detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                notion_synced BOOLEAN DEFAULT FALSE
+            );
+        """)
+
+        _ensure_work_queue(cursor, migrate=True)
+        _ensure_notion_outbox(cursor, migrate=True)
+        _ensure_review_id_sequence(cursor, sync=True)
+
+        conn.commit()
+        cursor.close()
     print("Database initialized successfully")
 
 
-#ONLY AT INIT
-def migrate_csv_to_db(csv_path: str):
-    """Migrate CSV data to PostgreSQL"""
-    from agents.classification_agent.src.nodes.load_reviews import load_reviews
+_work_queue_ready = False
 
-   
-    reviews = load_reviews(csv_path)
 
-    conn = get_connection()
-    cursor = conn.cursor()
+def _ensure_work_queue(cursor, migrate: bool = False):
+    """Add the claim/lease columns and the unprocessed partial index to raw_reviews
+    (in place on existing tables). Checked once per process; the ALTER only runs
+    when the columns are missing."""
+    global _work_queue_ready
+    if _work_queue_ready and not migrate:
+        return
 
-    for review in reviews:
+    if not migrate:
         cursor.execute("""
-            INSERT INTO raw_reviews (review_id, review, username, email, date, reviewer_name, rating)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (review_id) DO NOTHING
-        """, (
-            review.review_id,
-            review.review,
-            review.username,
-            review.email,
-            review.date,
-            review.reviewer_name,
-            review.rating
-        ))
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_name = 'raw_reviews' AND column_name IN ('status', 'lease_owner', 'lease_expires_at')
+        """)
+        migrate = cursor.fetchone()[0] < 3
+
+    if migrate:
+        cursor.execute("""
+            ALTER TABLE raw_reviews
+                ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                ADD COLUMN IF NOT EXISTS lease_owner VARCHAR(100),
+                ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+        """)
+        cursor.execute("UPDATE raw_reviews SET status = 'done' WHERE processed = TRUE AND status <> 'done'")
+
+        #the claim query only scans unprocessed rows
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_raw_reviews_unprocessed
+            ON raw_reviews (created_at) WHERE processed = FALSE;
+        """)
+    _work_queue_ready = True
+
+
+_notion_outbox_ready = False
+
+
+def _ensure_notion_outbox(cursor, migrate: bool = False):
+    """Add the Notion outbox columns and the pending partial index to detected_errors"""
+    global _notion_outbox_ready
+    if _notion_outbox_ready and not migrate:
+        return
+
+    if not migrate:
+        cursor.execute("""
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_name = 'detected_errors' AND column_name = 'notion_payload'
+        """)
+        migrate = cursor.fetchone()[0] == 0
+
+    if migrate:
+        cursor.execute("""
+            ALTER TABLE detected_errors
+                ADD COLUMN IF NOT EXISTS notion_payload JSONB,
+                ADD COLUMN IF NOT EXISTS notion_attempts INTEGER NOT NULL DEFAULT 0,
+                ADD COLUMN IF NOT EXISTS notion_next_attempt_at TIMESTAMPTZ,
+                ADD COLUMN IF NOT EXISTS notion_last_error TEXT,
+                ADD COLUMN IF NOT EXISTS notion_page_id VARCHAR(64),
+                ADD COLUMN IF NOT EXISTS notion_synced_at TIMESTAMPTZ;
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_detected_errors_notion_pending
+            ON detected_errors (detected_at) WHERE notion_synced = FALSE AND notion_payload IS NOT NULL;
+        """)
+    _notion_outbox_ready = True
+
+
+# REV-XXXX ids come from review_id_seq; next_review_id() formats the next value so an
+# INSERT can allocate its id in the same statement
+_REVIEW_ID_SQL = [
+    "CREATE SEQUENCE IF NOT EXISTS review_id_seq",
+    """
+    CREATE OR REPLACE FUNCTION next_review_id() RETURNS VARCHAR AS $$
+        SELECT 'REV-' || CASE WHEN n < 10000 THEN LPAD(n::text, 4, '0') ELSE n::text END
+        FROM nextval('review_id_seq') AS n
+    $$ LANGUAGE SQL VOLATILE
+    """,
+]
+
+# move the sequence past every REV id already in the table (and never backwards)
+_SYNC_REVIEW_ID_SQL = """
+    SELECT setval('review_id_seq', GREATEST(v, 1), v > 0)
+    FROM (
+        SELECT GREATEST(
+            (SELECT COALESCE(MAX(CAST(SUBSTRING(review_id FROM 5) AS BIGINT)), 0)
+             FROM raw_reviews WHERE review_id ~ '^REV-[0-9]+$'),
+            (SELECT CASE WHEN is_called THEN last_value ELSE last_value - 1 END FROM review_id_seq)
+        ) AS v
+    ) AS current_max
+"""
+
+_review_ids_ready = False
+
+
+def _ensure_review_id_sequence(cursor, sync: bool = False):
+    """Create review_id_seq / next_review_id() if missing and seed them from existing ids"""
+    global _review_ids_ready
+    if _review_ids_ready and not sync:
+        return
+
+    if not sync:
+        cursor.execute("SELECT to_regclass('review_id_seq') IS NOT NULL")
+        sync = not cursor.fetchone()[0]
 
-    conn.commit()
-    cursor.close()
-    conn.close()
-    print(f"Migrated {len(reviews)} reviews to database")
+    for statement in _REVIEW_ID_SQL:
+        cursor.execute(statement)
+    if sync:
+        _sync_review_id_sequence(cursor)
+    _review_ids_ready = True
 
-def load_unprocessed_reviews(batch_size: Optional[int] = None) -> List[RawReview]:
-    """load unprocessed reviews from PostgreSQL DB"""
-    conn = get_connection()
-    cursor = conn.cursor()
+
+def _sync_review_id_sequence(cursor):
+    """Move review_id_seq past REV ids written with explicit values (CSV loads, bulk
+    inserts) and drop locally reserved ids they may have taken"""
+    cursor.execute(_SYNC_REVIEW_ID_SQL)
+    synced = cursor.fetchone()[0]
+    if _review_id_allocator is not None:
+        _review_id_allocator.discard_through(synced)
+
+
+def format_review_id(number: int) -> str:
+    """REV-XXXX, matching next_review_id() in the database"""
+    return f"REV-{number:04d}"
+
+
+class ReviewIdAllocator:
+    """
+    Hands out REV ids from blocks reserved on review_id_seq, so bulk ingest costs
+    one sequence round-trip per block instead of one per review.
+
+    Ids are unique across processes; ids reserved but never used leave gaps.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = max(1, block_size)
+        self._ids = deque()
+        self._lock = threading.Lock()
+
+    def allocate(self, count: int = 1) -> List[str]:
+        with self._lock:
+            if len(self._ids) < count:
+                self._reserve(max(self.block_size, count - len(self._ids)))
+            return [self._ids.popleft() for _ in range(count)]
+
+    def discard_through(self, number: int):
+        """Forget reserved ids at or below `number`, they may now exist in the table"""
+        with self._lock:
+            self._ids = deque(i for i in self._ids if int(i[4:]) > number)
+
+    def _reserve(self, count: int):
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            _ensure_review_id_sequence(cursor)
+            cursor.execute("SELECT nextval('review_id_seq') FROM generate_series(1, %s)", (count,))
+            numbers = sorted(row[0] for row in cursor.fetchall())
+            cursor.close()
+        self._ids.extend(format_review_id(n) for n in numbers)
+
+
+_review_id_allocator: Optional[ReviewIdAllocator] = None
+
+
+def allocate_review_ids(count: int = 1) -> List[str]:
+    """Reserve `count` fresh REV ids (served from an in-memory block when possible)"""
+    global _review_id_allocator
+    if _review_id_allocator is None:
+        from agents.classification_agent.src.config import REVIEW_ID_BLOCK_SIZE
+        _review_id_allocator = ReviewIdAllocator(REVIEW_ID_BLOCK_SIZE)
+    return _review_id_allocator.allocate(count)
+
+
+RAW_REVIEW_COLUMNS = ("review_id", "review", "username", "email", "date", "reviewer_name", "rating")
+DETECTED_ERROR_COLUMNS = ("review_id", "error_summary", "error_type", "criticality", "rationale", "error_hash")
+
+
+def _bulk_insert(table: str, columns: tuple, conflict_column: str, rows: List[tuple],
+                 batch_size: Optional[int] = None) -> dict:
+    """
+    COPY rows into a temporary staging table and move them over with
+    INSERT ... SELECT ... ON CONFLICT (conflict_column) DO NOTHING.
+
+    Each batch is one transaction, so a failure only rolls back its own batch.
+
+    Returns:
+        dict: {'inserted': n, 'skipped': m} where skipped rows hit the conflict
+    """
+    from agents.classification_agent.src.config import DB_WRITE_BATCH_SIZE
+
+    batch_size = batch_size or DB_WRITE_BATCH_SIZE
+    column_list = ", ".join(columns)
+    stage = f"_stage_{table}"
+    inserted = 0
+
+    with get_connection() as conn:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            with conn.transaction():
+                cursor = conn.cursor()
+                # column types only: no defaults (serial ids) or constraints on the stage
+                cursor.execute(f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA")
+                with cursor.copy(f"COPY {stage} ({column_list}) FROM STDIN") as copy:
+                    for row in batch:
+                        copy.write_row(row)
+                cursor.execute(f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {stage}
+                    ON CONFLICT ({conflict_column}) DO NOTHING
+                """)
+                inserted += cursor.rowcount
+                cursor.close()
+
+        if table == "raw_reviews" and inserted:
+            # explicit REV ids bypass the sequence; keep next_review_id() ahead of them
+            cursor = conn.cursor()
+            _ensure_review_id_sequence(cursor)
+            _sync_review_id_sequence(cursor)
+            cursor.close()
+
+    return {'inserted': inserted, 'skipped': len(rows) - inserted}
+
+
+def insert_reviews(reviews: List[RawReview], batch_size: Optional[int] = None) -> dict:
+    """Bulk insert reviews, skipping review_ids that already exist; reviews without
+    an id get one from the block allocator"""
+    missing = sum(1 for r in reviews if not r.review_id)
+    new_ids = iter(allocate_review_ids(missing) if missing else [])
+    rows = [
+        (r.review_id or next(new_ids), r.review, r.username, r.email, r.date, r.reviewer_name, r.rating)
+        for r in reviews
+    ]
+    return _bulk_insert("raw_reviews", RAW_REVIEW_COLUMNS, "review_id", rows, batch_size)
+
+
+def insert_detected_errors(errors: List[dict], batch_size: Optional[int] = None) -> dict:
+    """
+    Bulk insert detected errors, skipping ones whose error_hash already exists
+
+    Args:
+        errors: Dicts with review_id, error_summary, error_type, criticality, rationale
+        batch_size: Rows per transaction (defaults to DB_WRITE_BATCH_SIZE)
+
+    Returns:
+        dict: {'inserted': n, 'skipped': m}
+    """
+    from agents.classification_agent.src.utils import hash_error
+
+    rows = []
+    for e in errors:
+        # LLM categories arrive as a list, the column is VARCHAR(50); an over-long
+        # value would fail the whole COPY batch, so clip it
+        error_type = e['error_type']
+        if isinstance(error_type, (list, tuple)):
+            error_type = ", ".join(error_type)
+        if error_type:
+            error_type = error_type[:50]
+        rows.append((e['review_id'], e['error_summary'], error_type, e['criticality'], e['rationale'],
+                     hash_error(e['review_id'], e['error_summary'])))
+    return _bulk_insert("detected_errors", DETECTED_ERROR_COLUMNS, "error_hash", rows, batch_size)
+
+
+#ONLY AT INIT
+def migrate_csv_to_db(csv_path: str, chunk_size: Optional[int] = None):
+    """Stream a CSV export into PostgreSQL chunk by chunk (constant memory)"""
+    from agents.classification_agent.src.nodes.load_reviews import iter_review_chunks, iter_review_rows
+
+    counts = {'inserted': 0, 'skipped': 0}
+    total = 0
+    start = time.perf_counter()
+
+    for chunk in iter_review_chunks(csv_path, chunk_size):
+        rows = list(iter_review_rows(chunk))
+        chunk_counts = _bulk_insert("raw_reviews", RAW_REVIEW_COLUMNS, "review_id", rows, len(rows))
+        counts['inserted'] += chunk_counts['inserted']
+        counts['skipped'] += chunk_counts['skipped']
+        total += len(rows)
+
+        elapsed = time.perf_counter() - start
+        print(f"  ... {total} rows ({total / elapsed:.0f} rows/sec), "
+              f"{counts['inserted']} inserted, {counts['skipped']} skipped")
+
+    elapsed = time.perf_counter() - start
+    print(f"Migrated {total} reviews to database in {elapsed:.1f}s "
+          f"({counts['inserted']} inserted, {counts['skipped']} already present)")
+    return counts
+
+def _worker_id() -> str:
+    from agents.classification_agent.src.config import CLASSIFICATION_WORKER_ID
+    return CLASSIFICATION_WORKER_ID or f"{socket.gethostname()}:{os.getpid()}"
+
+def load_unprocessed_reviews(batch_size: Optional[int] = None, worker_id: Optional[str] = None,
+                             lease_seconds: Optional[int] = None) -> List[RawReview]:
+    """
+    Claim a batch of unprocessed reviews from PostgreSQL DB
+
+    Rows are locked with FOR UPDATE SKIP LOCKED and leased to this worker, so
+    concurrent workers never get the same review. Reviews whose lease expired
+    without being marked processed are claimable again.
+    """
+    from agents.classification_agent.src.config import REVIEW_LEASE_SECONDS
 
     #default to reasonable batch size
     if batch_size is None:
         batch_size = int(os.getenv('BATCH_SIZE', '50'))
+    if lease_seconds is None:
+        lease_seconds = REVIEW_LEASE_SECONDS
 
     query = """
-        SELECT review_id, review, username, email, date, reviewer_name, rating
-        FROM raw_reviews
-        WHERE processed = FALSE
-        ORDER BY created_at ASC
-        LIMIT %s
+        WITH claimable AS (
+            SELECT review_id
+            FROM raw_reviews
+            WHERE processed = FALSE
+              AND (status = 'pending' OR lease_expires_at < NOW())
+            ORDER BY created_at ASC
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE raw_reviews r
+        SET status = 'claimed',
+            lease_owner = %s,
+            lease_expires_at = NOW() + make_interval(secs => %s)
+        FROM claimable
+        WHERE r.review_id = claimable.review_id
+        RETURNING r.review_id, r.review, r.username, r.email, r.date, r.reviewer_name, r.rating, r.created_at
     """
 
-    cursor.execute(query, (batch_size,))
-    rows = cursor.fetchall()
-
-    reviews = []
-    for row in rows:
-        #DT to stirng
-        date_str = row[4]
-        if hasattr(date_str, 'strftime'):
-            date_str = date_str.strftime('%Y-%m-%d %H:%M:%S')
-
-        reviews.append(RawReview(
-            review_id=row[0],  
-            review=row[1],     
-            username=row[2],   
-            email=row[3],      
-            date=str(date_str),
-            reviewer_name=row[5],
-            rating=row[6]      
-        ))
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_work_queue(cursor)
+        rows = cursor.execute(query, (batch_size, worker_id or _worker_id(), lease_seconds)).fetchall()
+        cursor.close()
 
-    cursor.close()
-    conn.close()
+    #RETURNING has no order, keep oldest first
+    rows.sort(key=lambda row: row[7])
+    reviews = [_row_to_review(row) for row in rows]
 
     if reviews:
-        print(f" Loaded {len(reviews)} unprocessed reviews")
+        print(f" Claimed {len(reviews)} unprocessed reviews")
     else:
         print(" No unprocessed reviews found")
 
     return reviews
 
+def release_reviews(review_ids: List[str]):
+    """Give claimed reviews back to the queue (e.g. after a failed batch)"""
+    if not review_ids:
+        return
+
+    with get_connection() as conn:
+        _ensure_work_queue(conn.cursor())
+        conn.execute("""
+            UPDATE raw_reviews
+            SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL
+            WHERE review_id = ANY(%s) AND processed = FALSE
+        """, (list(review_ids),))
+
+def requeue_expired_leases() -> int:
+    """Reset reviews whose lease ran out to pending; returns how many were requeued"""
+    with get_connection() as conn:
+        _ensure_work_queue(conn.cursor())
+        cursor = conn.execute("""
+            UPDATE raw_reviews
+            SET status = 'pending', lease_owner = NULL, lease_expires_at = NULL
+            WHERE processed = FALSE AND status = 'claimed' AND lease_expires_at < NOW()
+        """)
+        requeued = cursor.rowcount
+
+    if requeued:
+        print(f" Requeued {requeued} reviews with expired leases")
+    return requeued
+
+def load_reviews_by_ids(review_ids: List[str]) -> List[RawReview]:
+    """Load specific reviews by their IDs, newest first"""
+    if not review_ids:
+        return []
+
+    with get_connection() as conn:
+        rows = conn.execute("""
+            SELECT review_id, review, username, email, date, reviewer_name, rating
+            FROM raw_reviews
+            WHERE review_id = ANY(%s)
+            ORDER BY created_at DESC
+        """, (list(review_ids),)).fetchall()
+
+    return [_row_to_review(row) for row in rows]
+
 def load_reviews_from_db(limit: Optional[int] = None) -> List[RawReview]:
     """Legacy function - redirects to load_unprocessed_reviews"""
     return load_unprocessed_reviews(limit)
 
 def mark_review_processed(review_id: str):
     """Mark a single review as processed"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("UPDATE raw_reviews SET processed = TRUE WHERE review_id = %s", (review_id,))
-
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        _ensure_work_queue(conn.cursor())
+        conn.execute("""
+            UPDATE raw_reviews
+            SET processed = TRUE, status = 'done', lease_owner = NULL, lease_expires_at = NULL
+            WHERE review_id = %s
+        """, (review_id,))
 
 def mark_reviews_processed(review_ids: List[str]):
     """Mark multiple reviews as processed in a single transaction"""
     if not review_ids:
         return
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    
-    placeholders = ','.join(['%s'] * len(review_ids))
-    query = f"UPDATE raw_reviews SET processed = TRUE WHERE review_id IN ({placeholders})"
-
-    cursor.execute(query, review_ids)
-    affected_rows = cursor.rowcount
-
-    conn.commit()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        _ensure_work_queue(conn.cursor())
+        cursor = conn.execute("""
+            UPDATE raw_reviews
+            SET processed = TRUE, status = 'done', lease_owner = NULL, lease_expires_at = NULL
+            WHERE review_id = ANY(%s)
+        """, (list(review_ids),))
+        affected_rows = cursor.rowcount
 
     print(f" Marked {affected_rows} reviews as processed")
 
 def get_processing_stats():
     """Get statistics about processed vs unprocessed reviews"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT
-            COUNT(*) as total,
-            COUNT(CASE WHEN processed = TRUE THEN 1 END) as processed,
-            COUNT(CASE WHEN processed = FALSE THEN 1 END) as unprocessed
-        FROM raw_reviews
-    """)
-
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    with get_connection() as conn:
+        _ensure_work_queue(conn.cursor())
+        row = conn.execute("""
+            SELECT
+                COUNT(*) as total,
+                COUNT(CASE WHEN processed = TRUE THEN 1 END) as processed,
+                COUNT(CASE WHEN processed = FALSE THEN 1 END) as unprocessed,
+                COUNT(CASE WHEN processed = FALSE AND status = 'claimed' AND lease_expires_at >= NOW() THEN 1 END) as claimed
+            FROM raw_reviews
+        """).fetchone()
 
     return {
         'total': row[0],
         'processed': row[1],
-        'unprocessed': row[2]
+        'unprocessed': row[2],
+        'claimed': row[3]
     }
 
 def get_next_review_id():
-    """Generate next review ID in sequence (REV-XXXX)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    #find the highest existing review ID
-    cursor.execute("""
-        SELECT review_id FROM raw_reviews
-        WHERE review_id ~ '^REV-[0-9]+$'
-        ORDER BY CAST(SUBSTRING(review_id FROM 5) AS INTEGER) DESC
-        LIMIT 1
-    """)
-
-    row = cursor.fetchone()
-    cursor.close()
-    conn.close()
-
-    if row:
-        #extract number and increment
-        last_num = int(row[0].split('-')[1])
-        next_num = last_num + 1
-    else:
-        #start from 1 if no reviews exist
-        next_num = 1
+    """Preview the next review ID (REV-XXXX); the id is only taken on insert"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_review_id_sequence(cursor)
+        cursor.execute("SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END FROM review_id_seq")
+        next_num = cursor.fetchone()[0]
+        cursor.close()
 
-    return f"REV-{next_num:04d}"
+    return format_review_id(next_num)
 
 def insert_new_review(review_text: str, username: str, email: str,
                      reviewer_name: str, rating: int):
-    """Insert a new review with auto-generated ID"""
-    review_id = get_next_review_id()
-
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        INSERT INTO raw_reviews
-        (review_id, review, username, email, date, reviewer_name, rating, processed)
-        VALUES (%s, %s, %s, %s, NOW(), %s, %s, FALSE)
-    """, (review_id, review_text, username, email, reviewer_name, rating))
+    """Insert a new review with an auto-generated ID, allocated by the INSERT itself"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_review_id_sequence(cursor)
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+        cursor.execute("""
+            INSERT INTO raw_reviews
+            (review_id, review, username, email, date, reviewer_name, rating, processed)
+            VALUES (next_review_id(), %s, %s, %s, NOW(), %s, %s, FALSE)
+            RETURNING review_id
+        """, (review_text, username, email, reviewer_name, rating))
+        review_id = cursor.fetchone()[0]
+        cursor.close()
 
     print(f" Added new review {review_id} by {reviewer_name}")
     return review_id
@@ -261,23 +644,17 @@ def insert_detected_error(review_id: str, error_summary: str, error_type: str,
         error_hash = hash_error(review_id, error_summary)
         print(f"[DEBUG] Generated error_hash: {error_hash}")
 
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        print(f"[DEBUG] Executing INSERT for review_id={review_id}, error_type={error_type}, criticality={criticality}")
-        cursor.execute("""
-            INSERT INTO detected_errors
-            (review_id, error_summary, error_type, criticality, rationale, error_hash)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (error_hash) DO NOTHING
-        """, (review_id, error_summary, error_type, criticality, rationale, error_hash))
-
-        rows_affected = cursor.rowcount
-        print(f"[DEBUG] Rows affected: {rows_affected}")
+        with get_connection() as conn:
+            print(f"[DEBUG] Executing INSERT for review_id={review_id}, error_type={error_type}, criticality={criticality}")
+            cursor = conn.execute("""
+                INSERT INTO detected_errors
+                (review_id, error_summary, error_type, criticality, rationale, error_hash)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (error_hash) DO NOTHING
+            """, (review_id, error_summary, error_type, criticality, rationale, error_hash))
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+            rows_affected = cursor.rowcount
+            print(f"[DEBUG] Rows affected: {rows_affected}")
 
         if rows_affected > 0:
             print(f"[DEBUG] Successfully inserted error into detected_errors table")
@@ -290,4 +667,135 @@ def insert_detected_error(review_id: str, error_summary: str, error_type: str,
         print(f"[ERROR] Error type: {type(e).__name__}")
         import traceback
         traceback.print_exc()
-        return False
\ No newline at end of file
+        return False
+
+
+def enqueue_notion_sync(items) -> int:
+    """
+    Queue EnrichedErrors for the Notion syncer (outbox)
+
+    Each item is stored on its detected_errors row (inserted if missing, keyed by
+    error_hash) with the full payload and notion_synced = FALSE. Re-queuing an
+    item resets its retry state.
+
+    Args:
+        items: EnrichedError objects to write to Notion
+
+    Returns:
+        int: Number of queued rows
+    """
+    from agents.classification_agent.src.utils import hash_error
+
+    if not items:
+        return 0
+
+    rows = []
+    for e in items:
+        error_hash = getattr(e, "error_hash", None) or hash_error(e.review.review_id, e.error.error_summary)
+        rows.append((
+            e.review.review_id, e.error.error_summary, ", ".join(e.error.error_type)[:50],
+            e.criticality, e.error.rationale, error_hash, e.model_dump_json()
+        ))
+
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_notion_outbox(cursor)
+        cursor.executemany("""
+            INSERT INTO detected_errors
+            (review_id, error_summary, error_type, criticality, rationale, error_hash, notion_payload)
+            VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb)
+            ON CONFLICT (error_hash) DO UPDATE SET
+                notion_payload = EXCLUDED.notion_payload,
+                criticality = EXCLUDED.criticality,
+                notion_synced = FALSE,
+                notion_attempts = 0,
+                notion_next_attempt_at = NULL,
+                notion_last_error = NULL
+        """, rows)
+        cursor.close()
+
+    return len(rows)
+
+def claim_notion_outbox(limit: int, lease_seconds: int, max_attempts: int) -> List[tuple]:
+    """
+    Claim pending outbox rows for one sync batch
+
+    Rows are leased by pushing notion_next_attempt_at forward, so concurrent
+    syncers skip them and a crashed syncer's rows come back after the lease.
+
+    Returns:
+        List of (error_hash, payload dict) tuples, oldest first
+    """
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_notion_outbox(cursor)
+        rows = cursor.execute("""
+            WITH claimable AS (
+                SELECT id
+                FROM detected_errors
+                WHERE notion_synced = FALSE
+                  AND notion_payload IS NOT NULL
+                  AND notion_attempts < %s
+                  AND (notion_next_attempt_at IS NULL OR notion_next_attempt_at <= NOW())
+                ORDER BY detected_at ASC
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE detected_errors d
+            SET notion_next_attempt_at = NOW() + make_interval(secs => %s)
+            FROM claimable
+            WHERE d.id = claimable.id
+            RETURNING d.error_hash, d.notion_payload, d.detected_at
+        """, (max_attempts, limit, lease_seconds)).fetchall()
+        cursor.close()
+
+    rows.sort(key=lambda row: row[2])
+    return [(row[0], row[1]) for row in rows]
+
+def mark_notion_synced(page_ids: dict):
+    """Flip notion_synced for rows written to Notion ({error_hash: page_id})"""
+    if not page_ids:
+        return
+
+    with get_connection() as conn:
+        conn.cursor().executemany("""
+            UPDATE detected_errors
+            SET notion_synced = TRUE, notion_page_id = %s, notion_synced_at = NOW(),
+                notion_next_attempt_at = NULL, notion_last_error = NULL
+            WHERE error_hash = %s
+        """, [(page_id, error_hash) for error_hash, page_id in page_ids.items()])
+
+def mark_notion_failed(error_hashes: List[str], error: str):
+    """Record a failed attempt and back off exponentially (10s, 20s, ... capped at 1h)"""
+    if not error_hashes:
+        return
+
+    with get_connection() as conn:
+        conn.execute("""
+            UPDATE detected_errors
+            SET notion_attempts = notion_attempts + 1,
+                notion_last_error = %s,
+                notion_next_attempt_at = NOW() + make_interval(secs => LEAST(3600, 10 * power(2, notion_attempts)))
+            WHERE error_hash = ANY(%s)
+        """, (error[:1000], list(error_hashes)))
+
+def get_notion_outbox_stats(max_attempts: int) -> dict:
+    """Counts of outbox rows by state"""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        _ensure_notion_outbox(cursor)
+        row = cursor.execute("""
+            SELECT
+                COUNT(CASE WHEN notion_synced = FALSE AND notion_attempts < %s THEN 1 END) as pending,
+                COUNT(CASE WHEN notion_synced = FALSE AND notion_attempts >= %s THEN 1 END) as dead,
+                COUNT(CASE WHEN notion_synced = TRUE THEN 1 END) as synced
+            FROM detected_errors
+            WHERE notion_payload IS NOT NULL
+        """, (max_attempts, max_attempts)).fetchone()
+        cursor.close()
+
+    return {
+        'pending': row[0],
+        'dead': row[1],
+        'synced': row[2]
+    }
@@ -3,13 +3,13 @@ import hashlib
 from typing import List, Tuple
 from langgraph.graph import Graph
 
-from agents.classification_agent.src.config import OLLAMA_MODEL
-from agents.classification_agent.src.database import load_unprocessed_reviews, mark_reviews_processed, get_processing_stats
-from agents.classification_agent.src.nodes.detect_errors import detect_errors_with_ollama
+from agents.classification_agent.src.config import NOTION_OUTBOX_ENABLED
+from agents.classification_agent.src.database import load_unprocessed_reviews, mark_reviews_processed, get_processing_stats, enqueue_notion_sync
+from agents.classification_agent.src.nodes.detect_errors import detect_errors_batch
 from agents.classification_agent.src.nodes.normalize import normalize
 from agents.classification_agent.src.utils import RawReview, DetectedError, EnrichedError, SentimentData
-from agents.classification_agent.src.nodes.notion_logger import upsert_enriched_error
-from agents.classification_agent.src.nodes.sentiment_analysis import analyze_review_sentiment
+from agents.classification_agent.src.nodes.notion_sync import sync_enriched_errors
+from agents.classification_agent.src.nodes.sentiment_analysis import analyze_batch_sentiments
 
 
 def _sha12(text: str) -> str:
@@ -23,9 +23,9 @@ def build_graph() -> Graph:
     def n_load(_: dict) -> List[RawReview]:
         # Load unprocessed reviews from database
         stats = get_processing_stats()
-        print(f"Processing stats: {stats['unprocessed']} unprocessed / {stats['total']} total reviews")
+        print(f"Processing stats: {stats['unprocessed']} unprocessed ({stats['claimed']} claimed by workers) / {stats['total']} total reviews")
 
-        # Load unprocessed reviews
+        # Claim a batch of unprocessed reviews (leased to this worker until marked processed)
         data = load_unprocessed_reviews()
 
         if not data:
@@ -36,11 +36,8 @@ def build_graph() -> Graph:
 
     #detect errors with LLM
     def n_detect(reviews: List[RawReview]) -> List[Tuple[RawReview, List[DetectedError]]]:
-        pairs: List[Tuple[RawReview, List[DetectedError]]] = []
-        for r in reviews:
-            errs = detect_errors_with_ollama(r, OLLAMA_MODEL)
-            pairs.append((r, errs))
-        return pairs
+        detected = detect_errors_batch(reviews)
+        return [(r, detected.get(r.review_id, [])) for r in reviews]
 
     #analyze sentiment for each review
     def n_sentiment(pairs: List[Tuple[RawReview, List[DetectedError]]]) -> List[Tuple[RawReview, List[DetectedError], SentimentData]]:
@@ -61,18 +58,8 @@ def build_graph() -> Graph:
                 sentiment_polarity=0.0
             )) for r, errs in pairs]
 
-        print(f"Analyzing sentiment for {len(pairs)} reviews...")
-        enriched = []
-
-        for idx, (review, errors) in enumerate(pairs, 1):
-            sentiment = analyze_review_sentiment(review)
-            enriched.append((review, errors, sentiment))
-
-            if idx % 10 == 0:
-                print(f"  ... {idx}/{len(pairs)} analyzed")
-
-        print("Sentiment analysis complete")
-        return enriched
+        sentiments = analyze_batch_sentiments([review for review, _ in pairs])
+        return [(review, errors, sentiment) for (review, errors), sentiment in zip(pairs, sentiments)]
 
     #normalise and classify based on severity (now with sentiment)
     def n_normalize(enriched_pairs: List[Tuple[RawReview, List[DetectedError], SentimentData]]) -> List[EnrichedError]:
@@ -87,26 +74,30 @@ def build_graph() -> Graph:
             return items
 
         dry = os.getenv("NOTION_DRY_RUN", "0") in ("1", "true", "True")
-        processed_review_ids = []
 
-        for i, e in enumerate(items, 1):
-            hash_value = getattr(e, "error_hash", None) or _sha12(
-                f"{e.review.review_id}|{e.error.error_summary}"
-            )
-            if dry:
+        if dry:
+            for e in items:
+                hash_value = getattr(e, "error_hash", None) or _sha12(
+                    f"{e.review.review_id}|{e.error.error_summary}"
+                )
                 print(f"[dry-run] Would upsert {e.review.review_id} | {e.error.error_summary} | {hash_value}")
-            else:
-                upsert_enriched_error(e)
-
-            # Collect review IDs for batch processing
-            processed_review_ids.append(e.review.review_id)
-
-            if i % 20 == 0:
-                print(f"… processed {i} rows")
+            processed_review_ids = [e.review.review_id for e in items]
+        elif NOTION_OUTBOX_ENABLED:
+            # queue for the background syncer; Notion latency/outages no longer
+            # hold up marking the batch processed
+            queued = enqueue_notion_sync(items)
+            print(f"Queued {queued} errors for Notion sync")
+            processed_review_ids = [e.review.review_id for e in items]
+        else:
+            # rate-limited concurrent upserts; a review only counts as processed
+            # once every one of its errors reached Notion
+            page_ids = sync_enriched_errors(items)
+            failed = {e.review.review_id for e, page_id in zip(items, page_ids) if page_id is None}
+            processed_review_ids = [e.review.review_id for e in items if e.review.review_id not in failed]
 
         # Mark all reviews as processed in batch
         if processed_review_ids:
-            mark_reviews_processed(processed_review_ids)
+            mark_reviews_processed(list(dict.fromkeys(processed_review_ids)))
 
 
         return items
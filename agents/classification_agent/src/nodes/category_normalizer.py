@@ -9,11 +9,17 @@ from typing import List, Dict, Optional
 from sentence_transformers import SentenceTransformer
 import numpy as np
 
+from agents.classification_agent.src.nodes.category_store import CategoryStore
+
 
 class CategoryNormalizer:
     """
     Normalizes categories using semantic similarity.
     Maps similar categories (e.g., "Claim Delay", "Lengthy claim process") to a canonical name.
+
+    Mappings persist in an append-only CategoryStore next to cache_file, shared safely
+    by every worker pointed at the same path. An existing category_mappings.json is
+    imported on first use.
     """
 
     def __init__(
@@ -31,93 +37,195 @@ class CategoryNormalizer:
             cache_file = os.path.join(cache_dir, "category_mappings.json")
 
         self.cache_file = cache_file
-        self.categories: Dict[str, Dict] = {}
+        self.store = CategoryStore(os.path.splitext(cache_file)[0])
+        self.store.on_refresh = self._refresh
+        self._clear()
         self._load_cache()
 
+    def _clear(self):
+        """
+        Empty in-memory state:
+        - categories: canonical name -> {"variants": [...]}
+        - _names / _matrix: canonical names and their L2-normalized float32 embeddings
+          (one row each), so similarity against every category is a single matmul
+        - _lookup: lowercase canonical name or variant -> canonical name
+        """
+        self.categories: Dict[str, Dict] = {}
+        self._names: List[str] = []
+        self._matrix = np.zeros((0, self.store.dim or 0), dtype=np.float32)
+        self._lookup: Dict[str, str] = {}
+
     def _load_cache(self):
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'r') as f:
-                    self.categories = json.load(f)
-                    print(f"[CategoryNormalizer] Loaded {len(self.categories)} category mappings")
-            except Exception as e:
-                print(f"[CategoryNormalizer] Failed to load cache: {e}")
-
-    def _save_cache(self):
+        with self.store.lock():
+            if not self.store.exists() and os.path.exists(self.cache_file):
+                self._import_json()
+            else:
+                self._refresh()
+        if self.categories:
+            print(f"[CategoryNormalizer] Loaded {len(self.categories)} category mappings")
+
+    def _import_json(self):
+        """One-time migration of a category_mappings.json file into the store"""
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.categories, f, indent=2)
+            with open(self.cache_file, 'r') as f:
+                legacy = json.load(f)
         except Exception as e:
-            print(f"[CategoryNormalizer] Failed to save cache: {e}")
+            print(f"[CategoryNormalizer] Failed to load cache: {e}")
+            return
+
+        for name, data in legacy.items():
+            self._add_local(name, self._unit(np.asarray(data["embedding"], dtype=np.float32)))
+        for name, data in legacy.items():
+            for variant in data.get("variants", []):
+                self._add_variant_local(name, variant)
+        self._compact()
+        print(f"[CategoryNormalizer] Migrated {len(self.categories)} categories from {self.cache_file}")
+
+    def _refresh(self):
+        """Apply records other workers appended to the store (caller holds the store lock)"""
+        reloaded, records = self.store.read_new()
+        if reloaded:
+            self._clear()
+        for record in records:
+            op = record.get("op")
+            if op == "add":
+                self._add_local(record["name"], record["embedding"])
+            elif op == "variant":
+                self._add_variant_local(record["name"], record["variant"])
+            elif op == "merge":
+                self._merge_local(record["keep"], record["discard"])
+
+    def _compact(self):
+        variants = {name: data.get("variants", []) for name, data in self.categories.items()}
+        self.store.compact(self._names, self._matrix, variants)
+
+    def _maybe_compact(self):
+        live = len(self._names) + sum(len(data.get("variants", [])) for data in self.categories.values())
+        if self.store.needs_compaction(live):
+            self._compact()
+
+    def flush(self):
+        """Write buffered variant mappings now instead of after the debounce interval"""
+        self.store.flush()
+
+    def _add_local(self, name: str, embedding: np.ndarray):
+        if name in self.categories:
+            return
+        self.categories[name] = {"variants": []}
+        self._names.append(name)
+        self._matrix = np.vstack([self._matrix.reshape(-1, embedding.shape[0]), embedding[None, :]])
+        self._lookup.setdefault(name.lower(), name)
+
+    def _add_variant_local(self, name: str, variant: str):
+        variants = self.categories.get(name, {}).get("variants")
+        if variants is None or variant in variants:
+            return
+        variants.append(variant)
+        self._lookup.setdefault(variant.lower(), name)
+
+    def _merge_local(self, keep: str, discard: str):
+        if keep not in self.categories or discard not in self.categories or keep == discard:
+            return
 
-    def _compute_embedding(self, text: str) -> List[float]:
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
-
-    def _cosine_similarity(self, emb1: List[float], emb2: List[float]) -> float:
-        a = np.array(emb1)
-        b = np.array(emb2)
-        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+        keep_data = self.categories[keep]
+        discard_data = self.categories[discard]
 
-    def _find_similar_category(self, category: str, embedding: List[float]) -> Optional[str]:
-        best_match = None
-        best_similarity = 0.0
+        keep_data.setdefault("variants", []).append(discard)
 
-        for canonical_name, data in self.categories.items():
-            canonical_embedding = data["embedding"]
-            similarity = self._cosine_similarity(embedding, canonical_embedding)
+        for variant in discard_data.get("variants", []):
+            if variant not in keep_data["variants"]:
+                keep_data["variants"].append(variant)
 
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = canonical_name
+        del self.categories[discard]
 
-        if best_similarity >= self.similarity_threshold:
-            return best_match
+        row = self._names.index(discard)
+        del self._names[row]
+        self._matrix = np.delete(self._matrix, row, axis=0)
+        self._lookup = {}
+        for name in self._names:
+            self._lookup.setdefault(name.lower(), name)
+        for name in self._names:
+            for variant in self.categories[name].get("variants", []):
+                self._lookup.setdefault(variant.lower(), name)
+
+    @staticmethod
+    def _unit(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def _compute_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Unit-length float32 embeddings for texts, one encode call"""
+        embeddings = self.model.encode(texts, convert_to_numpy=True)
+        return self._unit(np.asarray(embeddings, dtype=np.float32).reshape(len(texts), -1))
+
+    def _compute_embedding(self, text: str) -> np.ndarray:
+        return self._compute_embeddings([text])[0]
+
+    def _find_similar_category(self, category: str, embedding: np.ndarray) -> Optional[str]:
+        if not self._names:
+            return None
+
+        similarities = self._matrix @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.similarity_threshold:
+            return self._names[best]
 
         return None
 
-    def normalize_category(self, category: str) -> str:
-        category = category.strip()
-        if not category:
-            return "Other"
-
-        # Check exact match first
-        category_lower = category.lower()
-        for canonical_name, data in self.categories.items():
-            if canonical_name.lower() == category_lower:
-                return canonical_name
-
-            if category_lower in [v.lower() for v in data.get("variants", [])]:
-                return canonical_name
-
-        # Semantic matching
-        embedding = self._compute_embedding(category)
+    def _resolve(self, category: str, embedding: np.ndarray) -> str:
+        """Map a category with no exact match to its canonical name (caller holds the store lock)"""
         similar_category = self._find_similar_category(category, embedding)
 
         if similar_category:
             if category not in self.categories[similar_category].get("variants", []):
-                self.categories[similar_category].setdefault("variants", []).append(category)
-                self._save_cache()
+                self._add_variant_local(similar_category, category)
+                self.store.add_variant(similar_category, category)
             return similar_category
 
         # Create new canonical category
-        self.categories[category] = {
-            "embedding": embedding,
-            "variants": []
-        }
-        self._save_cache()
-
+        self.store.append_category(category, embedding)
+        self._add_local(category, embedding)
         return category
 
+    def normalize_category(self, category: str) -> str:
+        return self.normalize_categories([category])[0]
+
     def normalize_categories(self, categories: List[str]) -> List[str]:
-        normalized = []
-        seen = set()
+        """
+        Normalize several categories, encoding every unknown one in a single call
+
+        Returns canonical names in first-seen order without duplicates, or ["Other"].
+        """
+        categories = [c.strip() for c in categories]
 
+        # fast path: every category is a known name or variant, no lock or encode needed
+        normalized = []
+        unknown = []
         for category in categories:
-            canonical = self.normalize_category(category)
-            if canonical not in seen:
+            canonical = self._lookup.get(category.lower()) if category else "Other"
+            if canonical is None:
+                if category not in unknown:
+                    unknown.append(category)
+            elif canonical not in normalized:
                 normalized.append(canonical)
-                seen.add(canonical)
+
+        if not unknown:
+            return normalized or ["Other"]
+
+        embeddings = dict(zip(unknown, self._compute_embeddings(unknown)))
+
+        normalized = []
+        with self.store.lock():
+            # another worker may have added some of these since our last look
+            self._refresh()
+            for category in categories:
+                if not category:
+                    canonical = "Other"
+                else:
+                    canonical = self._lookup.get(category.lower()) or self._resolve(category, embeddings[category])
+                if canonical not in normalized:
+                    normalized.append(canonical)
+            self._maybe_compact()
 
         return normalized or ["Other"]
 
@@ -128,31 +236,27 @@ class CategoryNormalizer:
         return self.categories.get(canonical_name, {}).get("variants", [])
 
     def merge_categories(self, category1: str, category2: str, keep: str = None) -> bool:
-        if category1 not in self.categories or category2 not in self.categories:
-            return False
+        with self.store.lock():
+            self._refresh()
+            if category1 not in self.categories or category2 not in self.categories:
+                return False
 
-        if keep is None:
-            keep = category1
+            if keep is None:
+                keep = category1
 
-        discard = category2 if keep == category1 else category1
-
-        keep_data = self.categories[keep]
-        discard_data = self.categories[discard]
-
-        keep_data.setdefault("variants", []).append(discard)
-
-        for variant in discard_data.get("variants", []):
-            if variant not in keep_data["variants"]:
-                keep_data["variants"].append(variant)
-
-        del self.categories[discard]
+            discard = category2 if keep == category1 else category1
 
-        self._save_cache()
+            # buffered variants of the discarded category must land before the merge record
+            self.store.flush()
+            self._merge_local(keep, discard)
+            self.store.append_merge(keep, discard)
+            self._maybe_compact()
         return True
 
     def reset(self):
-        self.categories = {}
-        self._save_cache()
+        with self.store.lock():
+            self._clear()
+            self._compact()
 
     def set_similarity_threshold(self, threshold: float):
         if 0.0 <= threshold <= 1.0:
@@ -0,0 +1,248 @@
+"""
+Append-only on-disk store for CategoryNormalizer mappings
+
+Replaces rewriting category_mappings.json on every new category/variant with:
+- <base>.<generation>.f32: raw float32 embedding rows, append-only, read via np.memmap
+- <base>.log: JSONL metadata log; the first line is a header naming the generation
+  of the vectors file, later lines are "add" (name -> row), "variant" and "merge"
+  records
+
+New canonical categories are appended straight away (one row + one line); variant
+records are buffered and flushed in one append after CATEGORY_FLUSH_INTERVAL
+seconds or CATEGORY_FLUSH_MAX records. Once the log holds mostly dead records it
+is compacted: live rows are written to the next generation's vectors file, then
+the rewritten log is swapped in with os.replace, which is the single atomic
+commit point.
+
+Several classification workers can share one store: every write happens under an
+exclusive flock on <base>.lock after replaying what other processes appended.
+"""
+
+import atexit
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, single worker only
+    fcntl = None
+
+from agents.classification_agent.src.config import (
+    CATEGORY_FLUSH_INTERVAL,
+    CATEGORY_FLUSH_MAX,
+    CATEGORY_COMPACT_RATIO,
+)
+
+FORMAT_VERSION = 1
+
+
+class CategoryStore:
+    """Files and locking behind one CategoryNormalizer; state itself lives in the normalizer"""
+
+    def __init__(self, base_path: str, flush_interval: float = CATEGORY_FLUSH_INTERVAL,
+                 flush_max: int = CATEGORY_FLUSH_MAX, compact_ratio: float = CATEGORY_COMPACT_RATIO):
+        self.base_path = base_path
+        self.log_path = base_path + ".log"
+        self.lock_path = base_path + ".lock"
+        self.flush_interval = flush_interval
+        self.flush_max = max(1, flush_max)
+        self.compact_ratio = compact_ratio
+
+        self.generation: Optional[int] = None
+        self.dim: Optional[int] = None
+        self.offset = 0          # bytes of the log already applied
+        self.records = 0         # records in the current log (live + dead)
+
+        self.pending: List[dict] = []
+        self.on_refresh = None   # owner's "replay new records" hook, run before every flush
+        self._timer: Optional[threading.Timer] = None
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+
+        if os.path.dirname(base_path):
+            os.makedirs(os.path.dirname(base_path), exist_ok=True)
+        atexit.register(self.flush)
+
+    def vectors_path(self, generation: int) -> str:
+        return f"{self.base_path}.{generation}.f32"
+
+    def exists(self) -> bool:
+        return os.path.exists(self.log_path)
+
+    @contextmanager
+    def lock(self):
+        """Exclusive lock across threads and processes (re-entrant within a thread)"""
+        with self._thread_lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                self._lock_file = open(self.lock_path, "a")
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def _read_vectors(self, rows: List[int]) -> Dict[int, np.ndarray]:
+        path = self.vectors_path(self.generation)
+        if not rows or not self.dim or not os.path.exists(path) or not os.path.getsize(path):
+            return {}
+        matrix = np.memmap(path, dtype=np.float32, mode="r").reshape(-1, self.dim)
+        return {row: np.array(matrix[row]) for row in rows if row < len(matrix)}
+
+    def read_new(self) -> Tuple[bool, List[dict]]:
+        """
+        Records appended since the last call (caller holds the lock)
+
+        Returns:
+            (reloaded, records): reloaded is True when the log was compacted or
+            replaced since the last read, in which case records is the full log and
+            the caller must rebuild its state from scratch. "add" records carry their
+            embedding under "embedding".
+        """
+        if not self.exists():
+            return False, []
+
+        with open(self.log_path, "rb") as f:
+            header = json.loads(f.readline() or b"{}")
+            reloaded = header.get("generation") != self.generation
+            if reloaded:
+                self.generation = header.get("generation", 0)
+                self.dim = header.get("dim")
+                self.offset = f.tell()
+                self.records = 0
+            f.seek(self.offset)
+            data = f.read()
+
+        # a line without its newline is still being written (or a crashed write)
+        complete = data[:data.rfind(b"\n") + 1]
+        self.offset += len(complete)
+
+        records = []
+        for line in complete.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        self.records += len(records)
+
+        vectors = self._read_vectors([r["row"] for r in records if r.get("op") == "add"])
+        records = [r for r in records if r.get("op") != "add" or r["row"] in vectors]
+        for record in records:
+            if record.get("op") == "add":
+                record["embedding"] = vectors[record["row"]]
+        return reloaded, records
+
+    def _append_log(self, records: List[dict]):
+        data = "".join(json.dumps(r) + "\n" for r in records).encode("utf-8")
+        with open(self.log_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.offset += len(data)
+        self.records += len(records)
+
+    def append_category(self, name: str, embedding: np.ndarray):
+        """Persist a new canonical category now (caller holds the lock and has called read_new)"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        if self.dim is None:
+            self.dim = int(embedding.shape[0])
+            self.compact([], np.zeros((0, self.dim), dtype=np.float32), {})
+
+        path = self.vectors_path(self.generation)
+        with open(path, "ab") as f:
+            row, partial = divmod(f.tell(), 4 * self.dim)
+            if partial:  # drop the tail of a write that crashed mid-row
+                f.truncate(row * 4 * self.dim)
+            f.write(embedding.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        self._append_log([{"op": "add", "name": name, "row": row}])
+
+    def append_merge(self, keep: str, discard: str):
+        self._append_log([{"op": "merge", "keep": keep, "discard": discard}])
+
+    def add_variant(self, name: str, variant: str):
+        """Buffer a variant record; written by flush() after the debounce interval"""
+        with self._thread_lock:
+            self.pending.append({"op": "variant", "name": name, "variant": variant})
+            if len(self.pending) >= self.flush_max:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """Write buffered variant records in one append"""
+        with self._thread_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending:
+                return
+            try:
+                with self.lock():
+                    # apply other workers' records first so our offset stays in step
+                    if self.on_refresh:
+                        self.on_refresh()
+                    else:
+                        self.read_new()
+                    self._append_log(self.pending)
+                self.pending = []
+            except Exception as e:
+                print(f"[CategoryStore] Failed to flush {len(self.pending)} records: {e}")
+
+    def needs_compaction(self, live_records: int) -> bool:
+        return self.records > self.compact_ratio * live_records + 64
+
+    def compact(self, names: List[str], matrix: np.ndarray, variants: Dict[str, List[str]]):
+        """
+        Rewrite the store as the given live state under a new generation (caller holds the lock)
+
+        The live state already contains any buffered variants, so the buffer is dropped.
+
+        Args:
+            names: Canonical names, one per matrix row
+            matrix: float32 embeddings, shape (len(names), dim)
+            variants: Canonical name -> variants
+        """
+        generation = (self.generation or 0) + 1
+        dim = int(matrix.shape[1]) if matrix.ndim == 2 and matrix.shape[1] else self.dim
+
+        vectors_tmp = self.vectors_path(generation) + ".tmp"
+        with open(vectors_tmp, "wb") as f:
+            f.write(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(vectors_tmp, self.vectors_path(generation))
+
+        records = [{"op": "add", "name": name, "row": row} for row, name in enumerate(names)]
+        records += [{"op": "variant", "name": name, "variant": v} for name in names for v in variants.get(name, [])]
+        header = {"format": FORMAT_VERSION, "generation": generation, "dim": dim}
+
+        log_tmp = self.log_path + ".tmp"
+        with open(log_tmp, "wb") as f:
+            f.write((json.dumps(header) + "\n").encode("utf-8"))
+            f.write("".join(json.dumps(r) + "\n" for r in records).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+        os.replace(log_tmp, self.log_path)  # commit point
+
+        self.pending = []
+        previous = self.generation
+        self.generation, self.dim, self.offset, self.records = generation, dim, offset, len(records)
+        if previous is not None and os.path.exists(self.vectors_path(previous)):
+            os.remove(self.vectors_path(previous))
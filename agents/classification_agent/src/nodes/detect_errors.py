@@ -1,9 +1,12 @@
 import os
 import json
-from typing import List
+import hashlib
+from typing import Dict, List, Optional
 from langchain_core.prompts import ChatPromptTemplate
+from agents.classification_agent.src.config import DETECT_BATCH_SIZE, DETECT_MAX_CONCURRENCY
 from agents.classification_agent.src.utils import RawReview, DetectedError, get_llm_from_config
 from agents.classification_agent.src.nodes.category_normalizer import get_normalizer
+from agents.classification_agent.src.result_cache import ResultCache, cache_key, get_result_cache
 
 SYSTEM = """You are an expert at analyzing customer reviews and identifying REAL issues.
 
@@ -97,10 +100,42 @@ FEWSHOT_ASSISTANT_2 = """{
 }"""
 
 
+# appended to SYSTEM when several reviews are packed into one request
+BATCH_INSTRUCTIONS = """
+
+You will receive SEVERAL reviews, each tagged with its review_id. Analyze each review independently using the rules above.
+
+Return ONLY valid JSON with this exact shape:
+{
+  "results": [
+    {
+      "review_id": "<review_id exactly as given>",
+      "business_type": "restaurant|software|hotel|retail|service|other",
+      "errors": [ ...error objects as described above, or empty... ]
+    }
+  ]
+}
+
+Include exactly one entry per review_id. Output must be ONLY the JSON object (no prose).
+"""
+
+
+# cached detections are invalidated whenever the batch prompt changes
+PROMPT_VERSION = hashlib.sha256((SYSTEM + BATCH_INSTRUCTIONS).encode("utf-8")).hexdigest()[:12]
+
+
 def make_llm():
     """Create LLM from config.yaml"""
     return get_llm_from_config(temperature=0)
 
+
+def _model_id() -> str:
+    """provider:model of the config.yaml choice, part of the result cache key"""
+    from config.config_helper import get_model_config
+
+    model_config = get_model_config() or {}
+    return f"{model_config.get('provider', 'unknown')}:{model_config.get('model', 'unknown')}"
+
 def _json_load(s: str) -> dict:
     if not s:
         return {"errors": []}
@@ -190,41 +225,17 @@ def _fallback_suggestion(text: str) -> List[DetectedError]:
             )]
     return []
 
-def detect_errors_with_ollama(
-    review: RawReview,
-    ollama_model: str = None,  # deprecated parameter, uses config.yaml now
-) -> List[DetectedError]:
-    force_fallback = os.getenv("USE_FALLBACK_DETECT", "false").lower() in {"1", "true", "yes"}
-
-    # simpler prompt for claude - no few shots to prevent contamination
-    full_prompt = f"""{SYSTEM}
+def _heuristic_detect(text: str) -> List[DetectedError]:
+    return _fallback_detect(text) or _fallback_suggestion(text)
 
-Review to analyze:
-```
-{review.review[:4000]}
-```
 
-Return ONLY the JSON object with business_type and errors array. If no issues found, return {{"business_type": "...", "errors": []}}"""
-
-    raw = ""
-
-    if not force_fallback:
-        try:
-            llm = make_llm()
-            resp = llm.invoke(full_prompt)
-            raw = (getattr(resp, "content", "") or "").strip()
-        except Exception as exc:
-            print(f" LLM call failed ({exc}); using heuristic detection instead.")
-            force_fallback = True
+def _to_detected_errors(items, review_text: str) -> List[DetectedError]:
+    """turn the LLM's error objects into DetectedErrors, falling back to heuristics if none survive"""
+    return _llm_errors(items) or _heuristic_detect(review_text)
 
-    if force_fallback:
-        out = _fallback_detect(review.review)
-        if not out:
-            out = _fallback_suggestion(review.review)
-        return out
 
-    data = _json_load(raw)
-    items = data.get("errors", [])
+def _llm_errors(items) -> List[DetectedError]:
+    """the LLM's well-formed error objects as DetectedErrors, without any fallback"""
     out: List[DetectedError] = []
 
     # Get category normalizer
@@ -256,9 +267,146 @@ Return ONLY the JSON object with business_type and errors array. If no issues fo
                     rationale=rationale
                 ))
 
-    if not out:
-        out = _fallback_detect(review.review)
-    if not out:
-        out = _fallback_suggestion(review.review)
-
     return out
+
+
+def detect_errors_with_ollama(
+    review: RawReview,
+    ollama_model: str = None,  # deprecated parameter, uses config.yaml now
+) -> List[DetectedError]:
+    force_fallback = os.getenv("USE_FALLBACK_DETECT", "false").lower() in {"1", "true", "yes"}
+
+    # simpler prompt for claude - no few shots to prevent contamination
+    full_prompt = f"""{SYSTEM}
+
+Review to analyze:
+```
+{review.review[:4000]}
+```
+
+Return ONLY the JSON object with business_type and errors array. If no issues found, return {{"business_type": "...", "errors": []}}"""
+
+    raw = ""
+
+    if not force_fallback:
+        try:
+            llm = make_llm()
+            resp = llm.invoke(full_prompt)
+            raw = (getattr(resp, "content", "") or "").strip()
+        except Exception as exc:
+            print(f" LLM call failed ({exc}); using heuristic detection instead.")
+            force_fallback = True
+
+    if force_fallback:
+        return _heuristic_detect(review.review)
+
+    data = _json_load(raw)
+    return _to_detected_errors(data.get("errors", []), review.review)
+
+
+def _pack_reviews(reviews: List[RawReview]) -> str:
+    parts = [f"review_id: {r.review_id}\n```\n{r.review[:4000]}\n```" for r in reviews]
+    return "Reviews to analyze:\n\n" + "\n\n".join(parts) + "\n\nReturn ONLY the JSON object with the results array."
+
+
+def _parse_batch(raw: str) -> Dict[str, list]:
+    """error lists by review_id, entries that are missing or malformed are left out"""
+    parsed_json = _json_load(raw)
+    # a bare list is taken as the results array; any other non-object parses to nothing
+    results = parsed_json if isinstance(parsed_json, list) else (
+        parsed_json.get("results") if isinstance(parsed_json, dict) else None)
+    parsed: Dict[str, list] = {}
+    if isinstance(results, list):
+        for item in results:
+            if isinstance(item, dict) and item.get("review_id") is not None and isinstance(item.get("errors"), list):
+                parsed[str(item["review_id"]).strip()] = item["errors"]
+    return parsed
+
+
+def detect_errors_batch(
+    reviews: List[RawReview],
+    batch_size: int = DETECT_BATCH_SIZE,
+    max_concurrency: int = DETECT_MAX_CONCURRENCY,
+    cache: Optional[ResultCache] = None,
+) -> Dict[str, List[DetectedError]]:
+    """
+    Detect errors for many reviews with few LLM requests
+
+    Reviews are packed batch_size at a time into one request that carries the SYSTEM
+    prompt once, and up to max_concurrency requests run at the same time. Results are
+    mapped back by review_id; only reviews whose entry is missing or unparseable are
+    retried with a single-review call.
+
+    Reviews whose text was already analyzed with the same prompt and model are served
+    from the result cache without an LLM request.
+
+    Args:
+        reviews: Reviews to analyze
+        batch_size: Reviews packed into one request
+        max_concurrency: Requests in flight at once
+        cache: Result cache to use (default: the shared "detect" cache)
+
+    Returns:
+        Dict of review_id -> detected errors, with an entry for every review
+    """
+    if not reviews:
+        return {}
+
+    if os.getenv("USE_FALLBACK_DETECT", "false").lower() in {"1", "true", "yes"}:
+        return {r.review_id: _heuristic_detect(r.review) for r in reviews}
+
+    detected: Dict[str, List[DetectedError]] = {}
+
+    cache = cache or get_result_cache("detect")
+    keys: Dict[str, str] = {}
+    if cache:
+        model_id = _model_id()
+        keys = {r.review_id: cache_key(r.review, PROMPT_VERSION, model_id) for r in reviews}
+        cached = cache.get_many(keys.values())
+        for review in reviews:
+            if keys[review.review_id] in cached:
+                errors = [DetectedError.model_validate(e) for e in cached[keys[review.review_id]]]
+                detected[review.review_id] = errors or _heuristic_detect(review.review)
+        if detected:
+            print(f" {len(detected)}/{len(reviews)} reviews served from the result cache")
+
+    pending = [r for r in reviews if r.review_id not in detected]
+    if not pending:
+        return detected
+
+    chunks = [pending[i:i + max(1, batch_size)] for i in range(0, len(pending), max(1, batch_size))]
+    fresh: Dict[str, list] = {}
+
+    try:
+        llm = make_llm()
+        prompts = [[("system", SYSTEM + BATCH_INSTRUCTIONS), ("user", _pack_reviews(chunk))] for chunk in chunks]
+        responses = llm.batch(prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+    except Exception as exc:
+        print(f" Batch LLM call failed ({exc}); falling back to per-review detection.")
+        responses = [exc] * len(chunks)
+
+    for chunk, resp in zip(chunks, responses):
+        if isinstance(resp, Exception):
+            print(f" Batch of {len(chunk)} reviews failed ({resp})")
+            continue
+        errors_by_id = _parse_batch((getattr(resp, "content", "") or "").strip())
+        for review in chunk:
+            items = errors_by_id.get(review.review_id)
+            if items is not None:
+                errors = _llm_errors(items)
+                detected[review.review_id] = errors or _heuristic_detect(review.review)
+                if cache:
+                    fresh[keys[review.review_id]] = [e.model_dump() for e in errors]
+
+    # the LLM's own answer is cached, including "no errors"; the heuristic fallback is
+    # applied again on every hit rather than stored
+    if cache and fresh:
+        cache.set_many(fresh)
+
+    failed = [r for r in reviews if r.review_id not in detected]
+    if failed:
+        print(f" {len(failed)}/{len(reviews)} reviews missing from batch results, retrying individually")
+    for review in failed:
+        detected[review.review_id] = detect_errors_with_ollama(review)
+
+    return detected
@@ -1,29 +1,38 @@
 import pandas as pd
-from typing import List
+from typing import Iterator, List, Optional
 from agents.classification_agent.src.utils import RawReview
 
 #check schema for required columns
 REQUIRED = {"review_id","review","username","email","date","reviewer_name","rating"}
+COLUMNS = ["review_id", "review", "username", "email", "date", "reviewer_name", "rating"]
 
 
-def load_reviews(path: str) -> List[RawReview]:
-    df = pd.read_csv(path)
-    missing = REQUIRED - set(df.columns)
+def iter_review_chunks(path: str, chunk_size: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Stream the CSV in fixed-size chunks (constant memory), columns in COLUMNS order"""
+    from agents.classification_agent.src.config import CSV_CHUNK_SIZE
+
+    # validate the header once instead of per chunk
+    header = pd.read_csv(path, nrows=0)
+    missing = REQUIRED - set(header.columns)
     if missing:
         raise ValueError(f"Missing columns: {missing}")
 
+    for chunk in pd.read_csv(path, usecols=COLUMNS, dtype=str, keep_default_na=False,
+                             chunksize=chunk_size or CSV_CHUNK_SIZE):
+        chunk = chunk[COLUMNS]
+        chunk["rating"] = chunk["rating"].astype(float).astype(int)
+        yield chunk
+
+
+def iter_review_rows(chunk: pd.DataFrame) -> Iterator[tuple]:
+    """(review_id, review, username, email, date, reviewer_name, rating) tuples of a chunk"""
+    return chunk.itertuples(index=False, name=None)
+
+
+def load_reviews(path: str) -> List[RawReview]:
 # convert row from csv to model
     records: List[RawReview] = []
-    for _, row in df.iterrows():
-        records.append(
-            RawReview(
-                review_id=str(row["review_id"]),
-                review=str(row["review"]),
-                username=str(row["username"]),
-                email=str(row["email"]),
-                date=str(row["date"]),
-                reviewer_name=str(row["reviewer_name"]),
-                rating=int(row["rating"]),
-            )
-        )
+    for chunk in iter_review_chunks(path):
+        for row in iter_review_rows(chunk):
+            records.append(RawReview(**dict(zip(COLUMNS, row))))
     return records
@@ -95,17 +95,10 @@ def _find_page_by_hash(hash_value: str) -> Optional[str]:
     return results[0]["id"] if results else None
 
 def upsert_enriched_error(e: EnrichedError) -> str:
-    #use existing errorhash or compute one 
-    hash_value = getattr(e, "error_hash", None) or _sha12(
-        f"{e.review.review_id}|{e.error.error_summary}"
-    )
-
-    props = _props_from_enriched(e, hash_value)
-    page_id = _find_page_by_hash(hash_value)
+    """Upsert a single item through the rate-limited sync engine (see notion_sync)"""
+    from agents.classification_agent.src.nodes.notion_sync import sync_enriched_errors
 
-    # Create or update
-    if page_id:
-        page = notion.pages.update(page_id=page_id, properties=props)
-    else:
-        page = notion.pages.create(parent={"database_id": NOTION_DATABASE_ID}, properties=props)
-    return page["id"]
+    [page_id] = sync_enriched_errors([e])
+    if page_id is None:
+        raise RuntimeError(f"Failed to sync {e.review.review_id} to Notion")
+    return page_id
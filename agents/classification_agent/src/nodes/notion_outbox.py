@@ -0,0 +1,123 @@
+"""
+Background Notion syncer for the detected_errors outbox
+
+Classification only queues enriched errors (database.enqueue_notion_sync) and
+moves on; this syncer drains pending rows to Notion in batches through the
+rate-limited sync engine and flips notion_synced. Failed rows are retried with
+backoff until NOTION_OUTBOX_MAX_ATTEMPTS.
+
+Runs inside the classification agent process, or standalone:
+    python -m agents.classification_agent.src.nodes.notion_outbox
+"""
+
+import asyncio
+from typing import Optional
+
+from common.concurrency import run_blocking
+from agents.classification_agent.src.config import (
+    NOTION_OUTBOX_BATCH_SIZE,
+    NOTION_OUTBOX_INTERVAL,
+    NOTION_OUTBOX_LEASE_SECONDS,
+    NOTION_OUTBOX_MAX_ATTEMPTS,
+)
+from agents.classification_agent.src.database import (
+    claim_notion_outbox,
+    mark_notion_synced,
+    mark_notion_failed,
+    get_notion_outbox_stats,
+)
+from agents.classification_agent.src.nodes.notion_sync import get_sync_engine
+from agents.classification_agent.src.utils import EnrichedError
+
+
+class NotionOutboxSyncer:
+    """Drains the detected_errors outbox to Notion"""
+
+    def __init__(self, batch_size: int = NOTION_OUTBOX_BATCH_SIZE, interval: float = NOTION_OUTBOX_INTERVAL,
+                 lease_seconds: int = NOTION_OUTBOX_LEASE_SECONDS, max_attempts: int = NOTION_OUTBOX_MAX_ATTEMPTS):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.task: Optional[asyncio.Task] = None
+        self.synced = 0
+        self.failed = 0
+
+    async def sync_batch(self) -> int:
+        """Claim and sync one batch; returns how many rows were claimed"""
+        rows = await run_blocking(claim_notion_outbox, self.batch_size, self.lease_seconds, self.max_attempts)
+        if not rows:
+            return 0
+
+        hashes, items, invalid = [], [], []
+        for error_hash, payload in rows:
+            try:
+                items.append(EnrichedError.model_validate(payload))
+                hashes.append(error_hash)
+            except Exception as e:
+                invalid.append(error_hash)
+                print(f"[NotionOutbox] ERROR invalid payload for {error_hash}: {e}")
+        if invalid:
+            await run_blocking(mark_notion_failed, invalid, "invalid payload")
+
+        page_ids = await get_sync_engine().sync(items) if items else []
+        synced = {h: page_id for h, page_id in zip(hashes, page_ids) if page_id}
+        failed = [h for h, page_id in zip(hashes, page_ids) if not page_id]
+
+        await run_blocking(mark_notion_synced, synced)
+        await run_blocking(mark_notion_failed, failed, "Notion upsert failed")
+
+        self.synced += len(synced)
+        self.failed += len(failed) + len(invalid)
+        return len(rows)
+
+    async def drain(self) -> int:
+        """Sync batches until nothing is claimable; returns rows processed"""
+        total = 0
+        while True:
+            claimed = await self.sync_batch()
+            if not claimed:
+                return total
+            total += claimed
+
+    async def run(self):
+        print(f"[NotionOutbox] Syncer started (batch={self.batch_size}, interval={self.interval}s)")
+        while True:
+            try:
+                await self.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[NotionOutbox] ERROR sync pass failed: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def stats(self) -> dict:
+        return {
+            "synced": self.synced,
+            "failed": self.failed,
+            "outbox": get_notion_outbox_stats(self.max_attempts),
+            "engine": get_sync_engine().stats(),
+        }
+
+
+def drain_outbox() -> int:
+    """Blocking one-shot drain for batch scripts (run.py)"""
+    return asyncio.run(NotionOutboxSyncer().drain())
+
+
+async def main():
+    syncer = NotionOutboxSyncer()
+    await syncer.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,283 @@
+"""
+Async Notion sync engine
+
+Writes EnrichedErrors to the Notion database with:
+- a token bucket shared by every sync in the process (Notion allows ~3 requests/s)
+- retry with exponential backoff on 429 (honouring Retry-After), 5xx and timeouts
+- bounded concurrency
+- a local Hash -> page_id index built from one paginated scan of the database,
+  so an upsert is a single create/update request instead of query + write
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+from agents.classification_agent.src.config import (
+    NOTION_RATE_LIMIT,
+    NOTION_BURST,
+    NOTION_MAX_CONCURRENCY,
+    NOTION_MAX_RETRIES,
+    NOTION_INDEX_TTL,
+)
+from agents.classification_agent.src.nodes.notion_logger import (
+    NOTION_API_KEY,
+    NOTION_DATABASE_ID,
+    _props_from_enriched,
+    _sha12,
+)
+from agents.classification_agent.src.utils import EnrichedError
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter usable from any event loop or thread.
+
+    Tokens refill at `rate` per second up to `capacity`; acquire() waits until one
+    is available.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = max(rate, 0.001)
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token if one is available, otherwise return seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    async def acquire(self):
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+
+def _retry_after(error: HTTPResponseError) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _hash_value(e: EnrichedError) -> str:
+    return getattr(e, "error_hash", None) or _sha12(f"{e.review.review_id}|{e.error.error_summary}")
+
+
+def _hash_of(page: dict) -> Optional[str]:
+    rich_text = page.get("properties", {}).get("Hash", {}).get("rich_text", [])
+    if not rich_text:
+        return None
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in rich_text) or None
+
+
+class NotionSyncEngine:
+    """Upserts EnrichedErrors to Notion under the shared rate limit"""
+
+    def __init__(self, api_key: str = NOTION_API_KEY, database_id: str = NOTION_DATABASE_ID,
+                 rate: float = NOTION_RATE_LIMIT, burst: int = NOTION_BURST,
+                 max_concurrency: int = NOTION_MAX_CONCURRENCY, max_retries: int = NOTION_MAX_RETRIES,
+                 index_ttl: float = NOTION_INDEX_TTL):
+        self.api_key = api_key
+        self.database_id = database_id
+        self.bucket = TokenBucket(rate, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.index_ttl = index_ttl
+
+        self.page_index: Dict[str, str] = {}
+        self.index_built_at: Optional[float] = None
+        self._index_lock = threading.Lock()
+
+        self.metrics = {
+            "items": 0,
+            "created": 0,
+            "updated": 0,
+            "failed": 0,
+            "requests": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "sync_seconds": 0.0,
+        }
+        self.last_batch: dict = {}
+        self._metrics_lock = threading.Lock()
+
+    def _count(self, key: str, amount=1):
+        with self._metrics_lock:
+            self.metrics[key] += amount
+
+    async def _request(self, call, **kwargs):
+        """Rate-limited Notion call with retry/backoff on 429, 5xx and timeouts"""
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self._count("requests")
+            try:
+                return await call(**kwargs)
+            except HTTPResponseError as error:
+                retryable = error.status == 429 or error.status >= 500
+                if not retryable or attempt == self.max_retries:
+                    raise
+                if error.status == 429:
+                    self._count("rate_limited")
+                delay = _retry_after(error) or min(30.0, 0.5 * 2 ** attempt)
+            except (RequestTimeoutError, httpx.TransportError):
+                if attempt == self.max_retries:
+                    raise
+                delay = min(30.0, 0.5 * 2 ** attempt)
+
+            self._count("retries")
+            await asyncio.sleep(delay + random.uniform(0, delay / 4))
+
+    async def refresh_index(self, client: AsyncClient):
+        """Rebuild the Hash -> page_id index with one paginated scan of the database"""
+        index: Dict[str, str] = {}
+        cursor = None
+        while True:
+            kwargs = {"database_id": self.database_id, "page_size": 100}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+            res = await self._request(client.databases.query, **kwargs)
+            for page in res.get("results", []):
+                hash_value = _hash_of(page)
+                if hash_value:
+                    index[hash_value] = page["id"]
+            if not res.get("has_more"):
+                break
+            cursor = res.get("next_cursor")
+
+        with self._index_lock:
+            self.page_index = index
+            self.index_built_at = time.monotonic()
+        print(f"Notion index built: {len(index)} pages")
+
+    def _index_stale(self) -> bool:
+        return self.index_built_at is None or time.monotonic() - self.index_built_at > self.index_ttl
+
+    async def _upsert(self, client: AsyncClient, e: EnrichedError) -> str:
+        hash_value = _hash_value(e)
+        props = _props_from_enriched(e, hash_value)
+
+        with self._index_lock:
+            page_id = self.page_index.get(hash_value)
+
+        if page_id:
+            try:
+                page = await self._request(client.pages.update, page_id=page_id, properties=props)
+                self._count("updated")
+                return page["id"]
+            except HTTPResponseError as error:
+                # page was deleted/archived since the index was built, create it again
+                if not (error.status == 404 or (error.status == 400 and "archived" in str(error).lower())):
+                    raise
+                with self._index_lock:
+                    self.page_index.pop(hash_value, None)
+
+        page = await self._request(
+            client.pages.create, parent={"database_id": self.database_id}, properties=props
+        )
+        with self._index_lock:
+            self.page_index[hash_value] = page["id"]
+        self._count("created")
+        return page["id"]
+
+    async def sync(self, items: List[EnrichedError]) -> List[Optional[str]]:
+        """
+        Upsert items to Notion.
+
+        Args:
+            items: Enriched errors to write
+
+        Returns:
+            Page id per item in input order, None where the write failed
+        """
+        if not items:
+            return []
+
+        start = time.perf_counter()
+        before = dict(self.metrics)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        page_ids: List[Optional[str]] = [None] * len(items)
+        done = 0
+
+        async with AsyncClient(auth=self.api_key) as client:
+            if self._index_stale():
+                await self.refresh_index(client)
+
+            async def run(index: int, e: EnrichedError):
+                nonlocal done
+                async with semaphore:
+                    try:
+                        page_ids[index] = await self._upsert(client, e)
+                    except Exception as error:
+                        self._count("failed")
+                        print(f"  ERROR syncing {e.review.review_id} to Notion: {type(error).__name__}: {error}")
+                done += 1
+                if done % 20 == 0:
+                    print(f"… synced {done}/{len(latest)} to Notion "
+                          f"({done / (time.perf_counter() - start):.1f} items/sec)")
+
+            # one write per Hash: duplicates in a batch would race to create the same page
+            latest = {_hash_value(e): i for i, e in enumerate(items)}
+            await asyncio.gather(*(run(i, items[i]) for i in latest.values()))
+
+        for i, e in enumerate(items):
+            page_ids[i] = page_ids[latest[_hash_value(e)]]
+
+        elapsed = time.perf_counter() - start
+        self._count("items", len(items))
+        self._count("sync_seconds", elapsed)
+        self.last_batch = {key: self.metrics[key] - before[key] for key in ("created", "updated", "failed", "requests", "retries", "rate_limited")}
+        self.last_batch.update(items=len(items), seconds=round(elapsed, 2),
+                               items_per_sec=round(len(items) / elapsed, 2) if elapsed else 0.0)
+        print(f"Notion sync: {self.last_batch['created']} created, {self.last_batch['updated']} updated, "
+              f"{self.last_batch['failed']} failed in {elapsed:.1f}s ({self.last_batch['items_per_sec']} items/sec)")
+        return page_ids
+
+    def stats(self) -> dict:
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        seconds = metrics["sync_seconds"]
+        metrics["items_per_sec"] = round(metrics["items"] / seconds, 2) if seconds else 0.0
+        metrics["sync_seconds"] = round(seconds, 2)
+        metrics["indexed_pages"] = len(self.page_index)
+        metrics["last_batch"] = dict(self.last_batch)
+        return metrics
+
+
+_engine: Optional[NotionSyncEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_sync_engine() -> NotionSyncEngine:
+    """Process-wide engine so every caller shares the rate limit and the index"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = NotionSyncEngine()
+    return _engine
+
+
+def sync_enriched_errors(items: List[EnrichedError]) -> List[Optional[str]]:
+    """Blocking entry point for sync callers (graph nodes, tools running in an executor)"""
+    return asyncio.run(get_sync_engine().sync(items))
+
+
+def get_sync_metrics() -> dict:
+    return get_sync_engine().stats()
@@ -6,10 +6,31 @@ Uses DeBERTa model for aspect-based sentiment analysis.
 """
 
 import os
-from typing import List
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
-
+from typing import List, Optional
+
+import numpy as np
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from agents.classification_agent.src.config import (
+    SENTIMENT_MODEL,
+    SENTIMENT_BATCH_SIZE,
+    SENTIMENT_THREADS,
+    SENTIMENT_BACKEND,
+    SENTIMENT_QUANTIZE,
+    SENTIMENT_ONNX_DIR,
+)
 from agents.classification_agent.src.utils import RawReview, SentimentData
+from agents.classification_agent.src.result_cache import ResultCache, cache_key, get_result_cache
+
+# Long reviews keep their first HEAD_TOKENS and last TAIL_TOKENS tokens (450 total,
+# leaving room for the special tokens under the 512 limit)
+HEAD_TOKENS = 200
+TAIL_TOKENS = 250
+TRUNCATION_MARKER = " [...] "
+
+# Cache key parts: results change with the model/backend and with the truncation scheme
+CACHE_MODEL_ID = f"{SENTIMENT_MODEL}:{SENTIMENT_BACKEND}{':int8' if SENTIMENT_QUANTIZE else ''}"
+CACHE_VERSION = f"head{HEAD_TOKENS}-tail{TAIL_TOKENS}"
 
 
 class SentimentAnalyzer:
@@ -27,13 +48,19 @@ class SentimentAnalyzer:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, confidence_threshold=0.8, model_name="yangheng/deberta-v3-base-absa-v1.1"):
+    def __init__(self, confidence_threshold=0.8, model_name=SENTIMENT_MODEL,
+                 batch_size=SENTIMENT_BATCH_SIZE, num_threads=SENTIMENT_THREADS, backend=SENTIMENT_BACKEND,
+                 quantize=SENTIMENT_QUANTIZE):
         """
         Initialize the sentiment analyzer (only runs once due to singleton pattern).
 
         Args:
             confidence_threshold (float): Minimum confidence for results (default: 0.8)
             model_name (str): HuggingFace model name for sentiment analysis
+            batch_size (int): Reviews per forward pass in analyze_batch
+            num_threads (int): Intra-op threads for inference (0 keeps the library default)
+            backend (str): "torch" or "onnx" (ONNX Runtime, exported on first use)
+            quantize (bool): Apply int8 dynamic quantization to the model
         """
         # Only initialize once
         if SentimentAnalyzer._initialized:
@@ -45,46 +72,157 @@ class SentimentAnalyzer:
 
         self.confidence_threshold = confidence_threshold
         self.model_name = model_name
+        self.batch_size = max(1, batch_size)
+        self.num_threads = num_threads
+        self.backend = backend
+
+        # Fast (Rust) tokenizer batches in parallel; fall back to the slow one if
+        # the sentencepiece conversion is unavailable
+        try:
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        except Exception as e:
+            print(f"   Fast tokenizer unavailable ({type(e).__name__}), using slow tokenizer")
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=False)
 
-        # Load tokenizer and model (use slow tokenizer to avoid conversion issues)
-        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=False)
         self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        self.model.eval()
+        self.id2label = self.model.config.id2label
+        self.marker_ids = self.tokenizer.encode(TRUNCATION_MARKER, add_special_tokens=False)
+        self.session = None
+
+        if backend == "onnx":
+            self.session = self._load_onnx_session(quantize)
+        else:
+            import torch
+            if num_threads > 0:
+                torch.set_num_threads(num_threads)
+            if quantize:
+                self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+        print(f"Sentiment model loaded successfully (backend={backend}, batch_size={self.batch_size})")
+        SentimentAnalyzer._initialized = True
 
-        # Create sentiment pipeline
-        self.sentiment_pipeline = pipeline(
-            "sentiment-analysis",
-            model=self.model,
-            tokenizer=self.tokenizer
-        )
+    def _load_onnx_session(self, quantize: bool):
+        """
+        Export the model to ONNX once (cached in SENTIMENT_ONNX_DIR) and open an
+        ONNX Runtime session on it.
 
-        print("Sentiment model loaded successfully")
-        SentimentAnalyzer._initialized = True
+        Args:
+            quantize (bool): Use an int8 dynamically quantized copy of the export
 
-    def truncate_text(self, text: str, max_tokens: int = 450) -> str:
+        Returns:
+            onnxruntime.InferenceSession
+        """
+        import torch
+        import onnxruntime as ort
+
+        export_dir = os.path.join(SENTIMENT_ONNX_DIR, self.model_name.replace("/", "__"))
+        os.makedirs(export_dir, exist_ok=True)
+        model_path = os.path.join(export_dir, "model.onnx")
+
+        if not os.path.exists(model_path):
+            print(f"   Exporting sentiment model to ONNX: {model_path}")
+            dummy = self.tokenizer("export", return_tensors="pt")
+            torch.onnx.export(
+                self.model,
+                (dummy["input_ids"], dummy["attention_mask"]),
+                model_path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=14,
+            )
+
+        if quantize:
+            quantized_path = os.path.join(export_dir, "model.int8.onnx")
+            if not os.path.exists(quantized_path):
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                print(f"   Quantizing ONNX model to int8: {quantized_path}")
+                quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+            model_path = quantized_path
+
+        options = ort.SessionOptions()
+        if self.num_threads > 0:
+            options.intra_op_num_threads = self.num_threads
+        return ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+
+    def _encode(self, token_ids: List[int]) -> List[int]:
         """
-        Intelligently truncate text to fit within token limits.
-        Keeps first 200 + last 250 tokens to preserve context.
+        Apply the head + tail truncation at the token level and add special tokens,
+        so each review is tokenized exactly once.
 
         Args:
-            text (str): Text to truncate
-            max_tokens (int): Maximum tokens to keep (default: 450 to stay under 512 limit)
+            token_ids (List[int]): Token ids of the review without special tokens
 
         Returns:
-            str: Truncated text
+            List[int]: Model input ids
+        """
+        if len(token_ids) > HEAD_TOKENS + TAIL_TOKENS:
+            token_ids = token_ids[:HEAD_TOKENS] + self.marker_ids + token_ids[-TAIL_TOKENS:]
+        return self.tokenizer.build_inputs_with_special_tokens(token_ids)
+
+    def _forward(self, batch_ids: List[List[int]]) -> np.ndarray:
         """
-        tokens = self.tokenizer.encode(text, add_special_tokens=False)
+        Run one padded batch through the model.
 
-        if len(tokens) <= max_tokens:
-            return text
+        Args:
+            batch_ids (List[List[int]]): Encoded reviews of similar length
+
+        Returns:
+            np.ndarray: Class probabilities, shape (batch, num_labels)
+        """
+        if self.session is not None:
+            inputs = self.tokenizer.pad({"input_ids": batch_ids}, padding=True, return_tensors="np")
+            logits = self.session.run(["logits"], {
+                "input_ids": inputs["input_ids"].astype(np.int64),
+                "attention_mask": inputs["attention_mask"].astype(np.int64),
+            })[0]
+        else:
+            import torch
+            inputs = self.tokenizer.pad({"input_ids": batch_ids}, padding=True, return_tensors="pt")
+            with torch.inference_mode():
+                logits = self.model(
+                    input_ids=inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                ).logits.float().numpy()
+
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def analyze_batch(self, texts: List[str]) -> List[dict]:
+        """
+        Analyze sentiment of many texts with batched inference.
+
+        Texts are tokenized in one call, sorted by length and split into buckets of
+        batch_size, so each bucket is padded only to its own longest review.
+
+        Args:
+            texts (List[str]): The texts to analyze
+
+        Returns:
+            List[dict]: One {"label", "score"} result per text, in input order
+        """
+        if not texts:
+            return []
 
-        # Keep first 200 and last 250 tokens
-        start_tokens = tokens[:200]
-        end_tokens = tokens[-250:]
+        token_ids = self.tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+        encoded = [self._encode(ids) for ids in token_ids]
+        order = sorted(range(len(encoded)), key=lambda i: len(encoded[i]))
 
-        start_text = self.tokenizer.decode(start_tokens, skip_special_tokens=True)
-        end_text = self.tokenizer.decode(end_tokens, skip_special_tokens=True)
+        results = [None] * len(encoded)
+        for start in range(0, len(order), self.batch_size):
+            bucket = order[start:start + self.batch_size]
+            probs = self._forward([encoded[i] for i in bucket])
+            for i, row in zip(bucket, probs):
+                best = int(row.argmax())
+                results[i] = {"label": self.id2label[best], "score": float(row[best])}
 
-        return f"{start_text} [...] {end_text}"
+        return results
 
     def analyze(self, text: str) -> dict:
         """
@@ -97,27 +235,19 @@ class SentimentAnalyzer:
             dict: Sentiment result with 'label' and 'score'
                   Example: {"label": "Positive", "score": 0.95}
         """
-        # Truncate if necessary
-        truncated_text = self.truncate_text(text)
-
-        # Analyze sentiment
-        result = self.sentiment_pipeline(truncated_text)[0]
-        return result
-
+        return self.analyze_batch([text])[0]
 
-def analyze_review_sentiment(review: RawReview) -> SentimentData:
+def _to_sentiment_data(review: RawReview, result: dict) -> SentimentData:
     """
-    Analyze sentiment for a single review.
+    Convert a raw {"label", "score"} result into SentimentData.
 
     Args:
-        review (RawReview): The review to analyze
+        review (RawReview): The analyzed review
+        result (dict): Output of SentimentAnalyzer.analyze / analyze_batch
 
     Returns:
         SentimentData: Sentiment analysis results
     """
-    analyzer = SentimentAnalyzer()
-    result = analyzer.analyze(review.review)
-
     label = result['label']
     score = result['score']
 
@@ -140,25 +270,50 @@ def analyze_review_sentiment(review: RawReview) -> SentimentData:
     )
 
 
-def analyze_batch_sentiments(reviews: List[RawReview]) -> List[SentimentData]:
+def analyze_review_sentiment(review: RawReview) -> SentimentData:
+    """
+    Analyze sentiment for a single review.
+
+    Args:
+        review (RawReview): The review to analyze
+
+    Returns:
+        SentimentData: Sentiment analysis results
+    """
+    return analyze_batch_sentiments([review])[0]
+
+
+def analyze_batch_sentiments(reviews: List[RawReview], cache: Optional[ResultCache] = None) -> List[SentimentData]:
     """
     Analyze sentiment for a batch of reviews.
 
+    Results are looked up in the result cache first; only reviews without a cached
+    result go through the model (which is not even loaded when everything hits).
+
     Args:
         reviews (List[RawReview]): List of reviews to analyze
+        cache (ResultCache): Cache to use (default: the shared "sentiment" cache)
 
     Returns:
-        List[SentimentData]: List of sentiment analysis results
+        List[SentimentData]: List of sentiment analysis results, in input order
     """
-    print(f" Analyzing sentiment for {len(reviews)} reviews...")
+    if not reviews:
+        return []
+
+    cache = cache or get_result_cache("sentiment")
+    keys = [cache_key(review.review, CACHE_VERSION, CACHE_MODEL_ID) for review in reviews]
+    cached = cache.get_many(keys) if cache else {}
+    missing = [i for i, key in enumerate(keys) if key not in cached]
 
-    results = []
-    for idx, review in enumerate(reviews, 1):
-        sentiment = analyze_review_sentiment(review)
-        results.append(sentiment)
+    print(f" Analyzing sentiment for {len(reviews)} reviews ({len(reviews) - len(missing)} cached)...")
 
-        if idx % 10 == 0:
-            print(f"  ... {idx}/{len(reviews)} analyzed")
+    if missing:
+        analyzer = SentimentAnalyzer()
+        results = analyzer.analyze_batch([reviews[i].review for i in missing])
+        computed = {keys[i]: result for i, result in zip(missing, results)}
+        if cache:
+            cache.set_many(computed)
+        cached.update(computed)
 
     print("Sentiment analysis complete")
-    return results
+    return [_to_sentiment_data(review, cached[key]) for review, key in zip(reviews, keys)]
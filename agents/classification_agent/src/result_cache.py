@@ -0,0 +1,188 @@
+"""
+Persistent content-hash cache for model results
+
+Error detection and sentiment results are cached by hash(normalized review text,
+prompt version, model id), so re-scraped reviews, re-runs of unprocessed reviews
+and agent retries skip the LLM / DeBERTa call. Entries live in SQLite with a TTL
+and LRU eviction once a namespace grows past RESULT_CACHE_MAX_ENTRIES.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, Optional
+
+from agents.classification_agent.src.config import (
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_PATH,
+    RESULT_CACHE_TTL,
+    RESULT_CACHE_MAX_ENTRIES,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case, unicode form and whitespace differences do not change the key"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip().casefold()
+
+
+def cache_key(text: str, prompt_version: str, model_id: str) -> str:
+    return hashlib.sha256(f"{model_id}\x1f{prompt_version}\x1f{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed cache for one namespace ("detect", "sentiment", ...)
+
+    Values are JSON. Reads refresh the entry's last access time, which drives LRU
+    eviction; expired entries count as misses and are deleted.
+    """
+
+    def __init__(self, namespace: str, path: str = RESULT_CACHE_PATH, ttl: float = RESULT_CACHE_TTL,
+                 max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.namespace = namespace
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_result_cache_lru ON result_cache (namespace, accessed_at)")
+        self._conn.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present and not expired; hits and misses
+        count every requested key, repeats included"""
+        requested = list(keys)
+        keys = list(dict.fromkeys(requested))
+        if not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, Any] = {}
+        expired = []
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM result_cache "
+                    f"WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [self.namespace, *chunk],
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl and now - created_at > self.ttl:
+                        expired.append(key)
+                    else:
+                        found[key] = json.loads(value)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE result_cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    [(now, self.namespace, key) for key in found],
+                )
+            if expired:
+                self._conn.executemany(
+                    "DELETE FROM result_cache WHERE namespace = ? AND key = ?",
+                    [(self.namespace, key) for key in expired],
+                )
+            self._conn.commit()
+
+            hits = sum(1 for key in requested if key in found)
+            self.hits += hits
+            self.misses += len(requested) - hits
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key]).get(key)
+
+    def set_many(self, values: Dict[str, Any]):
+        if not values:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO result_cache (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(self.namespace, key, json.dumps(value), now, now) for key, value in values.items()],
+            )
+            self.writes += len(values)
+            self._evict()
+            self._conn.commit()
+
+    def set(self, key: str, value: Any):
+        self.set_many({key: value})
+
+    def _evict(self):
+        """Drop least recently used entries above max_entries (caller holds the lock)"""
+        if not self.max_entries:
+            return
+        [count] = self._conn.execute(
+            "SELECT COUNT(*) FROM result_cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute("""
+                DELETE FROM result_cache WHERE namespace = ? AND key IN (
+                    SELECT key FROM result_cache WHERE namespace = ? ORDER BY accessed_at ASC LIMIT ?
+                )
+            """, (self.namespace, self.namespace, excess))
+            self.evictions += excess
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM result_cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+_caches: Dict[str, ResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_result_cache(namespace: str) -> Optional[ResultCache]:
+    """Shared cache for a namespace, or None when RESULT_CACHE_ENABLED is off"""
+    if not RESULT_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = ResultCache(namespace)
+        return _caches[namespace]
+
+
+def get_cache_metrics() -> Dict[str, dict]:
+    return {namespace: cache.stats() for namespace, cache in _caches.items()}
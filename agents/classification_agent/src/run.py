@@ -1,7 +1,12 @@
+from agents.classification_agent.src.config import NOTION_OUTBOX_ENABLED
 from agents.classification_agent.src.graph import wf
 
 if __name__ == "__main__":
     enriched = wf.invoke({})  
+    if NOTION_OUTBOX_ENABLED:
+        # no background syncer in a one-shot run, flush the outbox before exiting
+        from agents.classification_agent.src.nodes.notion_outbox import drain_outbox
+        print(f"Synced {drain_outbox()} outbox rows to Notion")
     print(f"\n Done. Processed {len(enriched)} enriched errors.\n")
     print("────────────────────────────────────────────────────────────")
 
@@ -48,9 +48,7 @@ def hash_error(review_id: str, summary: str) -> str:
 
 
 def get_llm_from_config(temperature: float = 0.0):
-    """Create LLM instance from config.yaml"""
-    from config.config_helper import get_model_config
-    from langchain.chat_models import init_chat_model  # type: ignore
+    """Shared LLM instance for the config.yaml choice (built once per process and temperature)"""
+    from config.config_helper import get_llm
 
-    config = get_model_config()
-    return init_chat_model(f"{config['provider']}:{config['model']}", temperature=temperature)
+    return get_llm(temperature=temperature)
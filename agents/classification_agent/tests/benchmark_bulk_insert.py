@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark CSV migration throughput: row-by-row INSERT vs batched COPY.
+
+Generates a synthetic CSV (100k rows by default), times the old one-INSERT-per-row
+loop on a sample of it, then times migrate_csv_to_db on the whole file and runs it
+a second time to measure the all-conflicts path. Benchmark rows use BENCH- review
+IDs and are deleted afterwards.
+
+Usage:
+    python tests/benchmark_bulk_insert.py [rows] [baseline_rows]
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database import get_connection, init_database, migrate_csv_to_db
+from src.nodes.load_reviews import load_reviews
+
+
+def write_csv(path: str, rows: int):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["review_id", "review", "username", "email", "date", "reviewer_name", "rating"])
+        for i in range(rows):
+            writer.writerow([
+                f"BENCH-{i:06d}",
+                f"Benchmark review {i}: the app crashes when exporting reports on page {i % 50}.",
+                f"user{i}",
+                f"user{i}@example.com",
+                "2024-10-10 12:00:00",
+                f"Bench User {i}",
+                i % 5 + 1,
+            ])
+
+
+def cleanup():
+    with get_connection() as conn:
+        conn.execute("DELETE FROM raw_reviews WHERE review_id LIKE 'BENCH-%'")
+
+
+def bench_row_by_row(csv_path: str, rows: int) -> float:
+    """Baseline: the previous migrate_csv_to_db loop, one execute per row"""
+    reviews = load_reviews(csv_path)[:rows]
+    start = time.perf_counter()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        for review in reviews:
+            cursor.execute("""
+                INSERT INTO raw_reviews (review_id, review, username, email, date, reviewer_name, rating)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (review_id) DO NOTHING
+            """, (review.review_id, review.review, review.username, review.email,
+                  review.date, review.reviewer_name, review.rating))
+        conn.commit()
+        cursor.close()
+    return len(reviews) / (time.perf_counter() - start)
+
+
+def bench_bulk(csv_path: str, rows: int) -> float:
+    start = time.perf_counter()
+    migrate_csv_to_db(csv_path)
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    baseline_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+
+    init_database()
+    cleanup()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench_reviews.csv")
+        write_csv(csv_path, rows)
+
+        print("=" * 60)
+        print(f"Migration benchmark: {rows} rows (baseline sample {baseline_rows})")
+        print("=" * 60)
+
+        try:
+            baseline = bench_row_by_row(csv_path, baseline_rows)
+            print(f"Row-by-row:          {baseline:10.0f} rows/sec")
+            cleanup()
+
+            bulk = bench_bulk(csv_path, rows)
+            print(f"Bulk COPY:           {bulk:10.0f} rows/sec")
+
+            conflicts = bench_bulk(csv_path, rows)
+            print(f"Bulk COPY (all dup): {conflicts:10.0f} rows/sec")
+            print(f"Speedup:             {bulk / baseline:10.1f}x")
+        finally:
+            cleanup()
+
+
+if __name__ == "__main__":
+    main()
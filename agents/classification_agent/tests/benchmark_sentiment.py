@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark sentiment throughput: per-review pipeline calls vs batched inference.
+
+Usage:
+    python tests/benchmark_sentiment.py [num_reviews]
+
+Set SENTIMENT_BACKEND, SENTIMENT_QUANTIZE, SENTIMENT_BATCH_SIZE and SENTIMENT_THREADS
+to compare configurations.
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path to import src modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transformers import pipeline
+
+from src.nodes.sentiment_analysis import SentimentAnalyzer
+
+
+SAMPLES = [
+    "The app keeps crashing when I switch workspaces. I've lost my work twice!",
+    "Love the new dashboard, everything loads quickly and looks great.",
+    "Login works but the sync button does nothing on Android.",
+    "It's okay. Does what it says, nothing special.",
+    "Support never replied to my ticket about the billing error and I was charged twice this month.",
+]
+
+
+def make_reviews(count: int) -> list:
+    random.seed(0)
+    # Mix short and long reviews so padding/bucketing matters
+    return [" ".join(random.choice(SAMPLES) for _ in range(random.randint(1, 12))) for _ in range(count)]
+
+
+def truncate_text(analyzer: SentimentAnalyzer, text: str) -> str:
+    """Pre-batching truncation: re-tokenize, keep head + tail tokens, decode back to text"""
+    tokens = analyzer.tokenizer.encode(text, add_special_tokens=False)
+    if len(tokens) <= 450:
+        return text
+    start_text = analyzer.tokenizer.decode(tokens[:200], skip_special_tokens=True)
+    end_text = analyzer.tokenizer.decode(tokens[-250:], skip_special_tokens=True)
+    return f"{start_text} [...] {end_text}"
+
+
+def bench_pipeline(analyzer: SentimentAnalyzer, texts: list) -> float:
+    """Baseline: one pipeline call per review, as before batching"""
+    sentiment_pipeline = pipeline("sentiment-analysis", model=analyzer.model, tokenizer=analyzer.tokenizer)
+    start = time.perf_counter()
+    for text in texts:
+        sentiment_pipeline(truncate_text(analyzer, text))
+    return len(texts) / (time.perf_counter() - start)
+
+
+def bench_batch(analyzer: SentimentAnalyzer, texts: list) -> float:
+    start = time.perf_counter()
+    analyzer.analyze_batch(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    texts = make_reviews(count)
+    analyzer = SentimentAnalyzer()
+
+    # Warm up both paths so model loading is not measured
+    analyzer.analyze_batch(texts[:4])
+
+    print("=" * 60)
+    print(f"Sentiment benchmark: {count} reviews, backend={analyzer.backend}, batch_size={analyzer.batch_size}")
+    print("=" * 60)
+
+    batched = bench_batch(analyzer, texts)
+    print(f"Batched:    {batched:8.1f} reviews/sec")
+
+    if analyzer.session is None:
+        baseline = bench_pipeline(analyzer, texts)
+        print(f"Per-review: {baseline:8.1f} reviews/sec")
+        print(f"Speedup:    {batched / baseline:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -105,6 +105,25 @@ def test_normalize_categories_list():
         os.unlink(f.name)
 
 
+def test_normalize_categories_single_encode():
+    """Test a batch encodes all unknown categories in one call and matches per-item results"""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        normalizer = CategoryNormalizer(cache_file=f.name, similarity_threshold=0.75)
+        normalizer.normalize_category("Billing Issue")
+
+        calls = []
+        encode = normalizer.model.encode
+        normalizer.model.encode = lambda texts, **kwargs: calls.append(list(texts)) or encode(texts, **kwargs)
+
+        normalized = normalizer.normalize_categories(["billing issue", "Claim Delay", "Lengthy claim process", "Claim Delay"])
+
+        assert calls == [["Claim Delay", "Lengthy claim process"]]
+        assert normalized == ["Billing Issue", "Claim Delay"]
+        assert normalizer.normalize_category("lengthy claim process") == "Claim Delay"
+
+        os.unlink(f.name)
+
+
 def test_persistence():
     """Test that category mappings persist across instances"""
     with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
@@ -127,6 +146,32 @@ def test_persistence():
         os.unlink(cache_file)
 
 
+def test_shared_store_and_json_migration():
+    """Test an existing JSON mapping is imported and workers sharing a store see each other's writes"""
+    import json
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_file = os.path.join(tmp, "category_mappings.json")
+        seed = CategoryNormalizer(cache_file=os.path.join(tmp, "seed.json"), similarity_threshold=0.75)
+        embedding = seed._compute_embedding("Claim Delay").tolist()
+        with open(cache_file, "w") as f:
+            json.dump({"Claim Delay": {"embedding": embedding, "variants": ["Slow claims"]}}, f)
+
+        worker1 = CategoryNormalizer(cache_file=cache_file, similarity_threshold=0.75)
+        worker2 = CategoryNormalizer(cache_file=cache_file, similarity_threshold=0.75)
+        assert worker1.normalize_category("slow claims") == "Claim Delay"
+
+        worker1.normalize_category("Billing Issue")
+        worker1.normalize_category("Lengthy claim process")
+        worker1.flush()
+
+        assert worker2.normalize_categories(["Invoice Problem", "Billing Issue"])[-1] == "Billing Issue"
+        assert "Lengthy claim process" in worker2.get_category_variants("Claim Delay")
+
+        worker2.reset()
+        assert CategoryNormalizer(cache_file=cache_file).get_all_categories() == []
+
+
 def test_threshold_sensitivity():
     """Test that lower threshold is more aggressive in grouping"""
     with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
@@ -196,9 +241,15 @@ if __name__ == "__main__":
     test_normalize_categories_list()
     print("✓ List normalization test passed")
 
+    test_normalize_categories_single_encode()
+    print("✓ Single encode batch test passed")
+
     test_persistence()
     print("✓ Persistence test passed")
 
+    test_shared_store_and_json_migration()
+    print("✓ Shared store test passed")
+
     test_threshold_sensitivity()
     print("✓ Threshold sensitivity test passed")
 
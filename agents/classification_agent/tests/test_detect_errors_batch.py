@@ -0,0 +1,159 @@
+"""
+Tests for batched LLM error detection
+"""
+
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ["USE_CATEGORY_NORMALIZATION"] = "false"
+
+import pytest
+
+from src.utils import RawReview
+from src.nodes import detect_errors
+from src.result_cache import ResultCache, cache_key
+
+
+def _review(review_id: str, text: str) -> RawReview:
+    return RawReview(review_id=review_id, review=text, username="user", email="user@example.com",
+                     date="2025-01-01", reviewer_name="User", rating=2)
+
+
+class FakeLLM:
+    """Answers packed requests for every review except the ones listed in `drop`;
+    reviews listed in `clean` get an empty error list"""
+    def __init__(self, drop=(), clean=()):
+        self.drop = set(drop)
+        self.clean = set(clean)
+        self.batch_calls = []
+        self.single_calls = 0
+
+    def batch(self, prompts, config=None, return_exceptions=False):
+        self.batch_calls.append(len(prompts))
+        responses = []
+        for _, (_, user) in prompts:
+            ids = [line.split(": ", 1)[1] for line in user.splitlines() if line.startswith("review_id: ")]
+            results = [{"review_id": i, "business_type": "software", "errors": [
+                {"error_summary": f"Issue in {i}", "error_type": ["Stability"], "severity": "Major", "rationale": "test"}
+            ] if i not in self.clean else []} for i in ids if i not in self.drop]
+            responses.append(SimpleNamespace(content=json.dumps({"results": results})))
+        return responses
+
+    def invoke(self, prompt):
+        self.single_calls += 1
+        return SimpleNamespace(content=json.dumps({"errors": [
+            {"error_summary": "Single call issue", "error_type": ["Other"], "severity": "Minor", "rationale": "retry"}
+        ]}))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    """Keep the on-disk result cache out of tests that count LLM calls"""
+    monkeypatch.setattr(detect_errors, "get_result_cache", lambda namespace: None)
+
+
+def test_batch_maps_results_by_review_id(monkeypatch):
+    """Test reviews are packed and every result lands on its own review"""
+    llm = FakeLLM()
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+    reviews = [_review(f"REV-{i:04d}", f"review {i}") for i in range(5)]
+
+    detected = detect_errors.detect_errors_batch(reviews, batch_size=2, max_concurrency=2)
+
+    assert llm.batch_calls == [3]
+    assert llm.single_calls == 0
+    assert [detected[r.review_id][0].error_summary for r in reviews] == [f"Issue in {r.review_id}" for r in reviews]
+
+
+def test_only_missing_reviews_fall_back_to_single_calls(monkeypatch):
+    """Test per-review calls are made only for entries the batch did not return"""
+    llm = FakeLLM(drop={"REV-0001"})
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+    reviews = [_review(f"REV-{i:04d}", f"review {i}") for i in range(3)]
+
+    detected = detect_errors.detect_errors_batch(reviews, batch_size=8)
+
+    assert llm.single_calls == 1
+    assert detected["REV-0001"][0].error_summary == "Single call issue"
+    assert detected["REV-0002"][0].error_summary == "Issue in REV-0002"
+
+
+class ScriptedLLM(FakeLLM):
+    """Returns the same raw batch response for every request"""
+    def __init__(self, content):
+        super().__init__()
+        self.content = content
+
+    def batch(self, prompts, config=None, return_exceptions=False):
+        self.batch_calls.append(len(prompts))
+        return [SimpleNamespace(content=self.content) for _ in prompts]
+
+
+@pytest.mark.parametrize("content", ['"no issues"', "42", "null", '[{"unexpected": true}]'])
+def test_non_object_batch_response_falls_back_per_review(monkeypatch, content):
+    """Test a batch answer that is not a JSON object does not abort the batch"""
+    llm = ScriptedLLM(content)
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+    reviews = [_review(f"REV-{i:04d}", f"review {i}") for i in range(2)]
+
+    detected = detect_errors.detect_errors_batch(reviews, batch_size=8)
+
+    assert llm.single_calls == 2
+    assert [detected[r.review_id][0].error_summary for r in reviews] == ["Single call issue"] * 2
+
+
+def test_bare_list_batch_response_is_read_as_results(monkeypatch):
+    """Test a top-level JSON list is accepted as the results array"""
+    llm = ScriptedLLM(json.dumps([{"review_id": "REV-0000", "errors": [
+        {"error_summary": "Listed issue", "error_type": ["Other"], "severity": "Minor", "rationale": "list"}
+    ]}]))
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+
+    detected = detect_errors.detect_errors_batch([_review("REV-0000", "review 0")], batch_size=8)
+
+    assert llm.single_calls == 0
+    assert detected["REV-0000"][0].error_summary == "Listed issue"
+
+
+def test_cached_reviews_skip_the_llm(monkeypatch, tmp_path):
+    """Test a second run over the same texts is answered from the result cache"""
+    llm = FakeLLM()
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+    monkeypatch.setattr(detect_errors, "_model_id", lambda: "fake:model")
+    cache = ResultCache("detect", path=str(tmp_path / "cache.db"))
+    reviews = [_review(f"REV-{i:04d}", f"review {i}") for i in range(3)]
+
+    first = detect_errors.detect_errors_batch(reviews, batch_size=8, cache=cache)
+    again = detect_errors.detect_errors_batch([_review("REV-0100", "  REVIEW 1 ")] + reviews, batch_size=8, cache=cache)
+
+    assert llm.batch_calls == [1]
+    assert again["REV-0100"][0].error_summary == "Issue in REV-0001"
+    assert [again[r.review_id] for r in reviews] == [first[r.review_id] for r in reviews]
+    assert cache.stats()["hits"] == 4
+
+
+def test_no_error_answers_are_cached_without_the_heuristic(monkeypatch, tmp_path):
+    """Test an empty LLM answer is cached as such and the heuristic is applied on each hit"""
+    llm = FakeLLM(clean={"REV-0001"})
+    monkeypatch.setattr(detect_errors, "make_llm", lambda: llm)
+    monkeypatch.setattr(detect_errors, "_model_id", lambda: "fake:model")
+    heuristic = [detect_errors.DetectedError(error_summary="Heuristic issue", error_type=["Other"],
+                                             severity="Minor", rationale="heuristic")]
+    monkeypatch.setattr(detect_errors, "_heuristic_detect", lambda text: heuristic)
+    cache = ResultCache("detect", path=str(tmp_path / "cache.db"))
+    reviews = [_review(f"REV-{i:04d}", f"review {i}") for i in range(3)]
+
+    detected = detect_errors.detect_errors_batch(reviews, batch_size=8, cache=cache)
+    again = detect_errors.detect_errors_batch(reviews, batch_size=8, cache=cache)
+
+    assert detected["REV-0001"] == again["REV-0001"] == heuristic
+    assert cache.stats()["writes"] == 3
+    key = cache_key("review 1", detect_errors.PROMPT_VERSION, "fake:model")
+    assert cache.get_many([key]) == {key: []}
+    # the second call makes no LLM request
+    assert llm.batch_calls == [1]
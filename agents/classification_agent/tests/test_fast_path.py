@@ -0,0 +1,75 @@
+"""
+Tests for recognising classification requests that can skip the planner
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+# importing src.agent builds the agent graph module, which needs the sqlite checkpointer
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+from src.agent.fast_path import parse_classification_request
+
+
+def test_agent_message_with_review_text():
+    """Test a forwarded request keeps the sender and extracts the review"""
+    request = parse_classification_request(
+        "You have a new message from: DirectoryAgent\n+ Message:"
+        "Please classify the sentiment of the review: 'product is broken'"
+    )
+
+    assert request.sender_id == "DirectoryAgent"
+    assert request.review_text == "product is broken"
+    assert request.review_ids == []
+
+
+def test_existing_review_ids():
+    """Test review IDs are used directly without ingesting"""
+    request = parse_classification_request("Classify reviews REV-0012, REV-0013 and REV-0012")
+
+    assert request.sender_id is None
+    assert request.review_text is None
+    assert request.review_ids == ["REV-0012", "REV-0013"]
+
+
+def test_quoted_review_text():
+    """Test apostrophes inside a quoted review are kept"""
+    request = parse_classification_request('Analyze this review: "The staff didn\'t care"')
+
+    assert request.review_text == "The staff didn't care"
+
+
+def test_other_requests_fall_back_to_planner():
+    """Test requests without a concrete review go through the normal agent loop"""
+    assert parse_classification_request("Classify 2 reviews") is None
+    assert parse_classification_request("Thank you!") is None
+    assert parse_classification_request("What can you help me with?") is None
+    assert parse_classification_request("") is None
+
+
+def test_questions_about_a_review_are_not_taken_as_review_text():
+    """Test loose phrasing without an explicit review payload goes to the planner"""
+    assert parse_classification_request("analyze the review - why is it slow?") is None
+    assert parse_classification_request("Can you analyze the review sentiment trends for last week?") is None
+    assert parse_classification_request("classify the reviews -- only the negative ones") is None
+
+
+def test_explicit_review_prefix():
+    """Test a review: prefixed payload is still taken as review text"""
+    request = parse_classification_request("Classify this review: the app crashes on login")
+
+    assert request.review_text == "the app crashes on login"
+
+
+def test_questions_quoting_text_or_naming_ids_fall_back_to_planner():
+    """Test quoted phrases and review IDs in ordinary questions never trigger the workflow"""
+    assert parse_classification_request('What is the sentiment of reviews mentioning "slow checkout"?') is None
+    assert parse_classification_request('Summarize the classification of reviews tagged "Payment Failure"') is None
+    assert parse_classification_request("Do not classify REV-0001 yet, just show me its review") is None
+    assert parse_classification_request('Analyze this review "The staff didn\'t care" please') is None
+    assert parse_classification_request("Classify review REV-0012 and REV-0013, then REV-0012 again") is None
@@ -0,0 +1,54 @@
+"""
+Tests for the persistent content-hash result cache
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.result_cache import ResultCache, cache_key
+
+
+def test_key_ignores_case_and_whitespace_but_not_model_or_prompt():
+    """Test normalized text maps to one key per prompt version and model"""
+    key = cache_key("The app  crashes\n", "v1", "openai:gpt-4o-mini")
+
+    assert cache_key("the APP crashes", "v1", "openai:gpt-4o-mini") == key
+    assert cache_key("the app crashes", "v2", "openai:gpt-4o-mini") != key
+    assert cache_key("the app crashes", "v1", "ollama:llama3.2") != key
+
+
+def test_hit_rate_and_persistence(tmp_path):
+    """Test values survive a reopen and hits/misses are counted"""
+    path = str(tmp_path / "cache.db")
+    ResultCache("sentiment", path=path).set("a", {"label": "Positive", "score": 0.9})
+
+    cache = ResultCache("sentiment", path=path)
+    assert cache.get_many(["a", "b"]) == {"a": {"label": "Positive", "score": 0.9}}
+    assert cache.stats()["hit_rate"] == 0.5
+    assert ResultCache("detect", path=path).get("a") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    """Test entries older than the TTL are not returned"""
+    cache = ResultCache("detect", path=str(tmp_path / "cache.db"), ttl=1)
+    cache.set("a", [])
+    cache._conn.execute("UPDATE result_cache SET created_at = created_at - 10")
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    """Test the namespace is trimmed to max_entries, keeping recently read keys"""
+    cache = ResultCache("detect", path=str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache._conn.execute("UPDATE result_cache SET accessed_at = accessed_at - 10 WHERE key = 'b'")
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,76 @@
+"""
+Tests for handing the classified batch to the sentiment tool within one turn
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+pytest.importorskip("langgraph.checkpoint.sqlite")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from src.agent.agent_graph import ReviewAgent
+
+
+class FakeTool:
+    """Records its calls; classification claims REV-0001 and REV-0002"""
+
+    metadata = None
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def ainvoke(self, args):
+        self.calls.append((self.name, dict(args)))
+        if self.name == "classify_review_criticality":
+            return json.dumps({"reviews": [], "total_processed": 2, "review_ids": ["REV-0001", "REV-0002"]})
+        return json.dumps({"sentiments": [], "total_analyzed": len(args.get("review_ids") or [])})
+
+
+def _make_agent(calls):
+    agent = ReviewAgent.__new__(ReviewAgent)
+    agent.name = "ReviewAgent"
+    agent.tools = [FakeTool("classify_review_criticality", calls), FakeTool("analyze_review_sentiment", calls)]
+    return agent
+
+
+def _tool_calls(*names):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": {}, "id": f"call-{i}"} for i, name in enumerate(names)])
+
+
+def test_sentiment_in_the_same_step_gets_the_classified_ids():
+    calls = []
+    state = {"messages": [HumanMessage(content="classify new reviews"),
+                          _tool_calls("analyze_review_sentiment", "classify_review_criticality")]}
+
+    result = asyncio.run(_make_agent(calls).tools_node(state))
+
+    assert calls == [("classify_review_criticality", {}),
+                     ("analyze_review_sentiment", {"review_ids": ["REV-0001", "REV-0002"]})]
+    # results keep the order of the calls
+    assert [message.name for message in result["messages"]] == ["analyze_review_sentiment", "classify_review_criticality"]
+
+
+def test_sentiment_uses_only_the_current_turns_classification():
+    calls = []
+    earlier = ToolMessage(content=json.dumps({"review_ids": ["REV-0009"]}),
+                          name="classify_review_criticality", tool_call_id="old")
+    classified = ToolMessage(content=json.dumps({"review_ids": ["REV-0003"]}),
+                             name="classify_review_criticality", tool_call_id="call-0")
+    agent = _make_agent(calls)
+
+    asyncio.run(agent.tools_node({"messages": [HumanMessage(content="classify"), earlier,
+                                               HumanMessage(content="classify again"), classified,
+                                               _tool_calls("analyze_review_sentiment")]}))
+    asyncio.run(agent.tools_node({"messages": [earlier, HumanMessage(content="how do new reviews feel?"),
+                                               _tool_calls("analyze_review_sentiment")]}))
+
+    assert calls == [("analyze_review_sentiment", {"review_ids": ["REV-0003"]}),
+                     ("analyze_review_sentiment", {})]
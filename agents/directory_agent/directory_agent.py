@@ -6,8 +6,8 @@ from agents.directory_agent.tools.updateagentinfo import UpdateAgentStatus
 from common.tools.communicate import create_comm_tool
 import asyncio
 import logging
-from common.ChatManager import ChatManager
-from common.ConnectionManager import ConnectionManager
+from common.ChatManager import ChatManager, LaneQueue, AGENT_WORKERS, thread_id_for
+from common.ConnectionManager import ConnectionManager, current_correlation_id
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
 
@@ -17,7 +17,7 @@ class AgentManager():
            class from the common directory to reduce duplicate code"""
     def __init__(self):
         self.chat_manager = ChatManager(name="DirectoryAgent")
-        self.task_queue = asyncio.Queue()
+        self.task_queue = LaneQueue()
         self.connection_manager = ConnectionManager("DirectoryAgent",
                                                     "An agent that given a query can retrieve information on agents that are able to help with that quary",
                                                     ["RegisterAgentInformation", "RetrieveAgentInformation", "UpdateAgentStatus"])
@@ -26,21 +26,25 @@ class AgentManager():
         logging.info("Starting worker thread")
         while True:
             task_data = await self.task_queue.get()
-            logging.info(f"Worker thread picked up {task_data}")
-            message = ""
-            if task_data["message_type"] == "message":
-                message = f"You have a new message from: sender_id: {task_data['sender_id']}\n+ Message:{task_data['message']}"
-            elif task_data["message_type"] == "registration":
-                message = (f"You have a new agent to register:{task_data["agent_id"]}\n+ "
-                           f"Description:{task_data["description"]}\n+"
-                           f"Capabilities: {task_data['capabilities']}")
-            elif task_data["message_type"] == "update":
-                message = f"Notification:{task_data['agent_id']} is no longer available."
-                logging.info(message)
-            else:
-                logging.info(f"Unknown message type: {task_data['message_type']}")
-            await self.chat_manager.run_agent(message)
-            self.task_queue.task_done()
+            try:
+                logging.info(f"Worker thread picked up {task_data}")
+                message = ""
+                current_correlation_id.set(task_data.get("correlation_id"))
+                if task_data["message_type"] == "message":
+                    message = f"You have a new message from: sender_id: {task_data['sender_id']}\n+ Message:{task_data['message']}"
+                elif task_data["message_type"] == "registration":
+                    message = (f"You have a new agent to register:{task_data["agent_id"]}\n+ "
+                               f"Description:{task_data["description"]}\n+"
+                               f"Capabilities: {task_data['capabilities']}")
+                elif task_data["message_type"] == "update":
+                    message = f"Notification:{task_data['agent_id']} is no longer available."
+                    logging.info(message)
+                else:
+                    logging.info(f"Unknown message type: {task_data['message_type']}")
+                await self.chat_manager.run_agent(message, thread_id_for(task_data))
+            finally:
+                # frees the conversation's lane for its next request
+                self.task_queue.task_done(task_data)
 
     async def message_handler(self, message: dict):
         await self.task_queue.put(message)
@@ -151,7 +155,8 @@ class AgentManager():
 
            """)
         await self.chat_manager.setup(tools=tools, prompt=description, type="web")
-        asyncio.create_task(self.worker())
+        for _ in range(AGENT_WORKERS):
+            asyncio.create_task(self.worker())
 
 application = AgentManager()
 
@@ -14,6 +14,7 @@ class Adaptor:
             agent_id, description, capabilities)
         self.agent_id = agent_id
         self.message_queue = asyncio.Queue()
+        self.pending_requests: dict[str, asyncio.Future] = {}
         self._started = False
 
     @classmethod
@@ -1,12 +1,21 @@
 import asyncio
-import json
 import logging
+import os
+import uuid
 from agents.main_agent.Server.Adaptor import Adaptor
 
 logging.basicConfig(level=logging.INFO)
 
+AGENT_REQUEST_TIMEOUT = float(os.getenv("AGENT_REQUEST_TIMEOUT", "180"))
+
 
 class MainAgentAdaptor(Adaptor):
+    def __init__(self, agent_id: str, description: str, capabilities: list[str]):
+        super().__init__(agent_id, description, capabilities)
+        # requests of this session share one conversation, so the receiving agent keeps
+        # them on one checkpoint thread and lane and runs them in order
+        self.conversation_id = uuid.uuid4().hex
+
     @classmethod
     async def create(cls):
         logging.info("[MainAgentAdaptor] Creating adaptor...")
@@ -27,6 +36,12 @@ class MainAgentAdaptor(Adaptor):
         try:
             logging.info(
                 f"[MainAgentAdaptor] handle_message called with: {message}")
+            # only a message answering a request still waiting is a reply; anything
+            # else, including messages that merely inherited a correlation id, is queued
+            future = self.pending_requests.get(message.get("correlation_id"))
+            if future is not None and not future.done():
+                future.set_result(message)
+                return
             await self.message_queue.put(message)
             logging.info(
                 f"[MainAgentAdaptor] Message queued, queue size: {self.message_queue.qsize()}")
@@ -34,13 +49,18 @@ class MainAgentAdaptor(Adaptor):
             logging.error(
                 f"[MainAgentAdaptor] handle_message failed: {e}", exc_info=True)
 
-    async def send_message(self, recipient_id: str, message: str):
+    async def send_message(self, recipient_id: str, message: str, correlation_id: str | None = None,
+                           conversation_id: str | None = None):
         payload = {
             "message_type": "message",
             "recipient_id": recipient_id,
             "sender_id": self.agent_id,
             "message": message,
         }
+        if correlation_id:
+            payload["correlation_id"] = correlation_id
+        if conversation_id:
+            payload["conversation_id"] = conversation_id
 
         logging.info(
             f"[MainAgentAdaptor] Sending to {recipient_id}: {message}")
@@ -53,7 +73,31 @@ class MainAgentAdaptor(Adaptor):
                 f"[MainAgentAdaptor] Send failed: {e}", exc_info=True)
             raise
 
-    async def receive_message(self, timeout: float = 180.0):
+    async def request(self, recipient_id: str, message: str,
+                      timeout: float = AGENT_REQUEST_TIMEOUT,
+                      conversation_id: str | None = None) -> dict | None:
+        """Send a message and wait for the reply carrying the same correlation id.
+
+        Each call waits on its own future, so several requests can be in flight
+        at once and a late reply is never handed to a different caller. The
+        message carries conversation_id (the adaptor's own by default), which the
+        recipient uses as its checkpoint thread and worker lane.
+        """
+        correlation_id = uuid.uuid4().hex
+        future = asyncio.get_running_loop().create_future()
+        self.pending_requests[correlation_id] = future
+        try:
+            await self.send_message(recipient_id, message, correlation_id,
+                                    conversation_id or self.conversation_id)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logging.warning(
+                f"[MainAgentAdaptor] Request {correlation_id} to {recipient_id} timed out after {timeout}s")
+            return None
+        finally:
+            self.pending_requests.pop(correlation_id, None)
+
+    async def receive_message(self, timeout: float = 180.0) -> dict | None:
         logging.info(
             f"[MainAgentAdaptor] Waiting for message (timeout={timeout}s)")
         logging.info(
@@ -63,7 +107,7 @@ class MainAgentAdaptor(Adaptor):
             message = await asyncio.wait_for(self.message_queue.get(), timeout)
             logging.info(
                 f"[MainAgentAdaptor] Retrieved message from queue: {message}")
-            return json.dumps(message)
+            return message
         except asyncio.TimeoutError:
             logging.warning("[MainAgentAdaptor] Timeout - no message received")
             return None
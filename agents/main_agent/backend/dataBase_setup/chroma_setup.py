@@ -1,12 +1,14 @@
 from datetime import datetime
 import os
 import hashlib
+import threading
 from dotenv import load_dotenv
 from chromadb import Client, PersistentClient
 from sentence_transformers import SentenceTransformer
 from agents.main_agent.backend.model.states.StateManager import StateManager
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
 from agents.main_agent.backend.model.states.qa_state.DocTextClass import Meta
+from agents.main_agent.backend.dataBase_setup.sql_setup import register_document, get_document_names
 from agents.main_agent.backend.nodes.qa_node.rag_retrieval_node import rag_retrieval_node
 from agents.main_agent.backend.utils import get_embedding, get_user_input, log_decorator, sanitize_doc_name
 
@@ -14,42 +16,141 @@ load_dotenv()
 
 CHROMA_PATH = os.getenv("CHROMA_PATH")
 PDF_SUMMARY_COLLECTION = os.getenv("PDF_SUMMARY_COLLECTION")
+# every document's chunks live in this one collection, told apart by the doc_name metadata
+DOC_INDEX_COLLECTION = os.getenv("DOC_INDEX_COLLECTION", "DocChunks")
+MIGRATE_BATCH_SIZE = int(os.getenv("MIGRATE_BATCH_SIZE", 1000))
 
+_chroma_client = None
+_chroma_client_lock = threading.Lock()
+_doc_index_migrated = False
+_migration_lock = threading.Lock()
 
-def get_or_create_doc_collection():
-    state = StateManager.get_state()
 
-    doc_name = sanitize_doc_name(state.qa_state.doc_name)
+def get_chroma_client() -> PersistentClient:
+    """One long-lived PersistentClient per process instead of a new one per call"""
+    global _chroma_client
+    with _chroma_client_lock:
+        if _chroma_client is None:
+            _chroma_client = PersistentClient(path=CHROMA_PATH)
+    return _chroma_client
 
-    chroma_client = PersistentClient(path=CHROMA_PATH)
 
-    try:
+def get_doc_index():
+    """The shared chunk index; per-document collections left from older versions are folded in on first use"""
+    collection = _get_or_create_doc_index()
+    ensure_doc_index_migrated(collection)
+    return collection
+
+
+def _get_or_create_doc_index():
+    return get_chroma_client().get_or_create_collection(
+        name=DOC_INDEX_COLLECTION,
+        metadata={
+            "description": "chunks of every uploaded document, filter by doc_name",
+            "distance_metric": "cosine"
+        })
+
+
+def ensure_doc_index_migrated(index=None):
+    """Run the legacy collection migration once per process; concurrent first callers
+    wait for it, so nobody reads the catalog before old documents are registered"""
+    global _doc_index_migrated
+    if _doc_index_migrated:
+        return
+    with _migration_lock:
+        if not _doc_index_migrated:
+            migrate_doc_collections(index)
+            _doc_index_migrated = True
 
-        collection = chroma_client.get_or_create_collection(
-            name=doc_name,
-            metadata={
-                "description": f"pdf {doc_name} chunks and chunk summary",
-                "created": str(datetime.now()),
-                "distance_metric": "cosine"
-            })
-    except Exception as e:
-        print(f"{e}")
+
+def get_or_create_doc_collection():
+    state = StateManager.get_state()
+
+    collection = get_doc_index()
 
     state.logs.append(
-        f"[collection] {doc_name} created or found")
+        f"[collection] {DOC_INDEX_COLLECTION} found for {sanitize_doc_name(state.qa_state.doc_name)}")
     return collection
 
 
+def migrate_doc_collections(index=None) -> int:
+    """Copy the chunks of every per-document collection into the shared index, register
+    each document in the catalog and drop the old collection. Returns chunks moved."""
+    client = get_chroma_client()
+    index = index or _get_or_create_doc_index()
+    moved = 0
+
+    for collection in client.list_collections():
+        if collection.name in (DOC_INDEX_COLLECTION, PDF_SUMMARY_COLLECTION):
+            continue
+        try:
+            doc_counts: dict[str, int] = {}
+            offset = 0
+            while True:
+                batch = collection.get(include=["documents", "embeddings", "metadatas"],
+                                       limit=MIGRATE_BATCH_SIZE, offset=offset)
+                if not batch["ids"]:
+                    break
+                metadatas = [dict(meta or {}, doc_name=(meta or {}).get("doc_name") or collection.name)
+                             for meta in batch["metadatas"]]
+                index.add(
+                    ids=[chunk_id(f"{meta['doc_name']}:{doc}") for meta, doc in zip(metadatas, batch["documents"])],
+                    embeddings=batch["embeddings"],
+                    documents=batch["documents"],
+                    metadatas=metadatas
+                )
+                for meta in metadatas:
+                    doc_counts[meta["doc_name"]] = doc_counts.get(meta["doc_name"], 0) + 1
+                offset += len(batch["ids"])
+
+            for doc_name, doc_count in doc_counts.items():
+                register_document(doc_name, chunk_count=doc_count)
+            client.delete_collection(name=collection.name)
+            count = sum(doc_counts.values())
+            moved += count
+            print(f"[migrate] {collection.name}: {count} chunks moved to {DOC_INDEX_COLLECTION}")
+        except Exception as e:
+            print(f"[migrate] {collection.name} left in place: {e}")
+
+    return moved
+
+
+def get_doc_chunks(doc_name: str) -> list[str]:
+    """All chunk texts of one document"""
+    result = get_doc_index().get(where={"doc_name": doc_name}, include=["documents"])
+    return result.get("documents", [])
+
+
+def list_document_names() -> list[str]:
+    """Catalog document names, including documents from per-document collections not migrated yet"""
+    ensure_doc_index_migrated()
+    return get_document_names()
+
+
+def find_doc_name(text: str) -> str | None:
+    """Catalog document named in the text, if any"""
+    text = text.strip().lower()
+    for name in list_document_names():
+        if name.lower() in text:
+            return name
+    return None
+
+
 def get_all_collection_name():
-    client = PersistentClient(path=CHROMA_PATH)
+    client = get_chroma_client()
     collections = client.list_collections()
     collection_names_list = [c.name for c in collections]
     return collection_names_list
 
 
+def get_all_collections():
+    """Collection handles for every collection, from one list call"""
+    return list(get_chroma_client().list_collections())
+
+
 def get_or_create_summary_collection(state: GraphState):
 
-    chroma_client = PersistentClient(path=CHROMA_PATH)
+    chroma_client = get_chroma_client()
 
     collection = chroma_client.get_or_create_collection(
         name=PDF_SUMMARY_COLLECTION,
@@ -64,7 +165,7 @@ def get_or_create_summary_collection(state: GraphState):
 
 
 def get_collection(collection_name: str):
-    chroma_client = PersistentClient(path=CHROMA_PATH)
+    chroma_client = get_chroma_client()
     try:
         collection = chroma_client.get_collection(name=collection_name)
         if collection and collection.count():
@@ -74,6 +175,24 @@ def get_collection(collection_name: str):
         return None
 
 
+def insert_data_rows(data: list[str], embeddings: list[list[float]], metadatas: list[dict]) -> int:
+    """Bulk add chunks to the shared index in one call; returns rows sent.
+    Repeats of a chunk within the batch are dropped, Chroma rejects duplicate ids in one add."""
+    rows = {}
+    for text, embedding, metadata in zip(data, embeddings, metadatas):
+        rows.setdefault(chunk_id(f"{metadata.get('doc_name', '')}:{text}"), (text, embedding, metadata))
+    if not rows:
+        return 0
+
+    get_doc_index().add(
+        ids=list(rows),
+        embeddings=[embedding for _, embedding, _ in rows.values()],
+        documents=[text for text, _, _ in rows.values()],
+        metadatas=[metadata for _, _, metadata in rows.values()]
+    )
+    return len(rows)
+
+
 def insert_data_row(data: str, embedding: list[float], metadata: Meta):
     collection = get_or_create_doc_collection()
 
@@ -91,7 +210,7 @@ def insert_data_row(data: str, embedding: list[float], metadata: Meta):
     #         continue
 
     collection.add(
-        ids=[chunk_id(data)],
+        ids=[chunk_id(f"{metadata.get('doc_name', '')}:{data}")],
         embeddings=embedding,
         documents=[data],
         metadatas=[metadata]
@@ -108,7 +227,7 @@ def insert_pdf_summary(state: GraphState) -> GraphState:
     if state.summary_state.final_summary:
         return state
 
-    chroma_client = PersistentClient(path=CHROMA_PATH)
+    chroma_client = get_chroma_client()
 
     collection = chroma_client.get_or_create_collection(
         name=PDF_SUMMARY_COLLECTION,
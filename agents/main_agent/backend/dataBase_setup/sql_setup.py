@@ -1,6 +1,8 @@
 import os
 import sqlite3
 import json
+import threading
+from datetime import datetime
 from langgraph.checkpoint.sqlite import SqliteSaver
 from dotenv import load_dotenv
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
@@ -15,3 +17,56 @@ read_config = {"configurable": {"thread_id": "123"}}
 def create_checkpoint_memory():
     conn = sqlite3.connect(SQL_PATH, check_same_thread=False)
     return SqliteSaver(conn)
+
+
+_catalog_conn = None
+_catalog_lock = threading.Lock()
+
+
+def _get_catalog_conn() -> sqlite3.Connection:
+    """Connection to the document catalog table, created on first use"""
+    global _catalog_conn
+    if _catalog_conn is None:
+        _catalog_conn = sqlite3.connect(SQL_PATH, check_same_thread=False)
+        _catalog_conn.execute("""
+            CREATE TABLE IF NOT EXISTS document_catalog (
+                doc_name TEXT PRIMARY KEY,
+                doc_type TEXT,
+                source_path TEXT,
+                chunk_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
+        _catalog_conn.commit()
+    return _catalog_conn
+
+
+def register_document(doc_name: str, doc_type: str | None = None, source_path: str | None = None, chunk_count: int = 0):
+    """Add or refresh a document in the catalog after its chunks were indexed"""
+    now = datetime.now().isoformat(timespec="seconds")
+    with _catalog_lock:
+        conn = _get_catalog_conn()
+        conn.execute("""
+            INSERT INTO document_catalog (doc_name, doc_type, source_path, chunk_count, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (doc_name) DO UPDATE SET
+                doc_type = COALESCE(excluded.doc_type, document_catalog.doc_type),
+                source_path = COALESCE(excluded.source_path, document_catalog.source_path),
+                chunk_count = excluded.chunk_count,
+                updated_at = excluded.updated_at
+        """, (doc_name, doc_type, source_path, chunk_count, now, now))
+        conn.commit()
+
+
+def list_documents() -> list[dict]:
+    with _catalog_lock:
+        cursor = _get_catalog_conn().execute(
+            "SELECT doc_name, doc_type, source_path, chunk_count, created_at, updated_at "
+            "FROM document_catalog ORDER BY doc_name")
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def get_document_names() -> list[str]:
+    return [document["doc_name"] for document in list_documents()]
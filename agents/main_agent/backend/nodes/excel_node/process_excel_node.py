@@ -3,6 +3,7 @@ import os
 from dotenv import load_dotenv
 import pandas as pd
 from agents.main_agent.backend.dataBase_setup.chroma_setup import insert_data_row
+from agents.main_agent.backend.dataBase_setup.sql_setup import register_document
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
 from agents.main_agent.backend.model.states.qa_state.DocTextClass import DocTextClass, Meta
 from agents.main_agent.backend.utils import clean_text, get_embedding, log_decorator
@@ -50,6 +51,8 @@ async def process_excel_node(state: GraphState) -> GraphState:
         data_row.append(DocTextClass(
             chunk=review_text, meta=meta))
 
+    register_document(doc_name, "excel", state.qa_state.doc_path, len(data_row))
+
     state.qa_state.chunked_doc_text = data_row
 
     return state
@@ -0,0 +1,44 @@
+"""
+Page text extraction for process_pdf_node
+
+Kept free of the backend's model imports: extraction workers are started with
+forkserver/spawn (forking the threaded UI server can deadlock), so every worker
+imports this module and nothing heavier.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+# text extraction workers; smaller PDFs are read in-process, a pool costs more than it saves
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(8, os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 40))
+
+
+def _mp_context():
+    start_methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in start_methods else "spawn")
+
+
+def extract_page_range(doc_path: str, start: int, end: int) -> list[tuple[int, str]]:
+    """(page number, text) for pages [start, end); runs in a worker process"""
+    with fitz.open(doc_path) as pdf:
+        return [(page_num + 1, pdf[page_num].get_text().strip()) for page_num in range(start, end)]
+
+
+def extract_pages(doc_path: str, workers: int = PDF_EXTRACT_WORKERS,
+                  min_pages: int = PDF_PARALLEL_MIN_PAGES) -> list[tuple[int, str]]:
+    """Page texts in page order, split into contiguous ranges across a process pool for large PDFs"""
+    with fitz.open(doc_path) as pdf:
+        page_count = pdf.page_count
+    workers = min(workers, page_count)
+    if workers <= 1 or page_count < min_pages:
+        return extract_page_range(doc_path, 0, page_count)
+
+    step = -(-page_count // workers)
+    starts = range(0, page_count, step)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        ranges = pool.map(extract_page_range, [doc_path] * len(starts), starts,
+                          [min(start + step, page_count) for start in starts])
+        return [page for page_range in ranges for page in page_range]
@@ -1,7 +1,12 @@
 
-from agents.main_agent.backend.dataBase_setup.chroma_setup import insert_data_row
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from common.concurrency import run_blocking
+from agents.main_agent.backend.dataBase_setup.chroma_setup import insert_data_rows
+from agents.main_agent.backend.dataBase_setup.sql_setup import register_document
+from agents.main_agent.backend.nodes.pdf_node.pdf_text import extract_pages
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
-import fitz
 import os
 from dotenv import load_dotenv
 from agents.main_agent.backend.model.states.qa_state.DocTextClass import Meta, DocTextClass
@@ -11,14 +16,13 @@ load_dotenv()
 
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 500))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 100))
+# chunks embedded and added to Chroma per batch
+PDF_INGEST_BATCH_SIZE = int(os.getenv("PDF_INGEST_BATCH_SIZE", 512))
 
 
-async def process_pdf_node(state: GraphState) -> dict:
-    pdf = fitz.open(state.qa_state.doc_path)
+def chunk_pages(pages: list[tuple[int, str]], doc_name: str) -> list[DocTextClass]:
     pdf_text_list: list[DocTextClass] = []
-    doc_name = os.path.splitext(os.path.basename(state.qa_state.doc_path))[0]
-    for page_num, page in enumerate(pdf, start=1):
-        page_text = page.get_text().strip()
+    for page_num, page_text in pages:
         if not page_text:
             continue
         chunk_page_text = get_chunk(
@@ -33,10 +37,46 @@ async def process_pdf_node(state: GraphState) -> dict:
             )
             pdf_text_list.append(
                 DocTextClass(chunk=single_chunk, meta=meta))
+    return pdf_text_list
+
+
+def ingest_chunks(pdf_text_list: list[DocTextClass]) -> int:
+    """Embed chunks in large batches and bulk add each batch; the add of one batch
+    overlaps the embedding of the next. Returns rows added."""
+    added = 0
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for start in range(0, len(pdf_text_list), PDF_INGEST_BATCH_SIZE):
+            batch = pdf_text_list[start:start + PDF_INGEST_BATCH_SIZE]
+            chunks = [doc_text.chunk for doc_text in batch]
+            embeddings = get_embedding(chunks)
+            if pending:
+                added += pending.result()
+            pending = writer.submit(insert_data_rows, chunks, embeddings,
+                                    [doc_text.meta.__dict__ for doc_text in batch])
+        if pending:
+            added += pending.result()
+    return added
+
+
+async def process_pdf_node(state: GraphState) -> dict:
+    doc_name = os.path.splitext(os.path.basename(state.qa_state.doc_path))[0]
+    started = time.perf_counter()
+
+    # extraction, chunking and embedding block, keep them off the UI event loop
+    pages = await run_blocking(extract_pages, state.qa_state.doc_path)
+    extracted = time.perf_counter()
+    pdf_text_list = await run_blocking(chunk_pages, pages, doc_name)
+    await run_blocking(ingest_chunks, pdf_text_list)
+    elapsed = max(time.perf_counter() - started, 1e-6)
 
-            embedding = get_embedding(single_chunk)
+    message = (f"[pdf] {doc_name}: {len(pages)} pages, {len(pdf_text_list)} chunks in {elapsed:.2f}s "
+               f"({len(pages) / elapsed:.1f} pages/s, {len(pdf_text_list) / elapsed:.1f} chunks/s; "
+               f"extraction {extracted - started:.2f}s)")
+    state.logs.append(message)
+    print(message)
 
-            insert_data_row(single_chunk, embedding, meta.__dict__)
+    register_document(doc_name, "pdf", state.qa_state.doc_path, len(pdf_text_list))
 
     state.qa_state.chunked_doc_text = pdf_text_list
     return state
@@ -1,5 +1,6 @@
 from typing import List
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import numpy as np
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
@@ -10,6 +11,7 @@ load_dotenv()
 
 EMBED_MODEL = os.getenv("EMBED_MODEL")
 TOP_K = int(os.getenv("TOP_K", 50))
+RAG_SEARCH_CONCURRENCY = int(os.getenv("RAG_SEARCH_CONCURRENCY", 8))
 
 
 def rag_retrieval_node(state: GraphState, collection, embeded_query) -> tuple[List[DocTextClass], str, float]:
@@ -36,6 +38,50 @@ def rag_retrieval_node(state: GraphState, collection, embeded_query) -> tuple[Li
     return top_k_result, top_k_kb, top_score
 
 
+def _query_collection(collection, embeded_query, top_k: int, where: dict | None = None) -> list[tuple[float, str, dict, str]]:
+    """(distance, document, metadata, collection name) hits for one collection, [] on error"""
+    try:
+        result = collection.query(
+            query_embeddings=embeded_query, n_results=top_k, where=where, include=["documents", "distances", "metadatas"])
+    except Exception as e:
+        print(f"[{collection.name}] {e}")
+        return []
+    if not result.get("documents"):
+        return []
+    return [(distance, doc, meta or {}, collection.name)
+            for doc, meta, distance in zip(result["documents"][0], result["metadatas"][0], result["distances"][0])]
+
+
+def search_collections(state: GraphState, collections, embeded_query, top_k: int = TOP_K,
+                       where: dict | None = None) -> tuple[List[DocTextClass], str, float]:
+    """Query every collection concurrently (optionally with a metadata filter) and keep the global top_k hits by distance"""
+    if not collections:
+        return [], None, 0.0
+
+    with ThreadPoolExecutor(max_workers=max(1, min(RAG_SEARCH_CONCURRENCY, len(collections)))) as pool:
+        per_collection = list(pool.map(lambda c: _query_collection(c, embeded_query, top_k, where), collections))
+
+    hits = sorted((hit for hits in per_collection for hit in hits), key=lambda hit: hit[0])[:top_k]
+    if not hits:
+        return [], None, 0.0
+
+    top_k_result: List[DocTextClass] = []
+    for distance, doc, meta, collection_name in hits:
+        pdf_text_obj = DocTextClass(chunk=doc, meta=Meta(**meta))
+        pdf_text_obj.meta.doc_name = pdf_text_obj.meta.doc_name or collection_name
+        top_k_result.append(pdf_text_obj)
+        state.logs.append(
+            f"[TOP_{top_k}_RESULT] doc_name: {pdf_text_obj.meta.doc_name}, "
+            f"page_number: {pdf_text_obj.meta.referenece_number}, "
+            f"distance: {distance:.4f}, "
+            f"chunk_content: {pdf_text_obj.chunk}"
+        )
+
+    top_k_kb = "\n".join([pdf_text.chunk for pdf_text in top_k_result])
+    top_score = float(np.exp(-hits[0][0]))
+    return top_k_result, top_k_kb, top_score
+
+
 def top_k_result_to_log(state, query) -> List[DocTextClass]:
     top_k_result: List[DocTextClass] = []
     for doc_list, meta_list in zip(query.get('documents', []), query.get('metadatas', [])):
@@ -1,9 +1,9 @@
 import os
 from dotenv import load_dotenv
 
-from agents.main_agent.backend.dataBase_setup.chroma_setup import get_all_collection_name, get_collection
+from agents.main_agent.backend.dataBase_setup.chroma_setup import get_doc_index, get_collection, find_doc_name
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
-from agents.main_agent.backend.nodes.qa_node.rag_retrieval_node import rag_retrieval_node
+from agents.main_agent.backend.nodes.qa_node.rag_retrieval_node import search_collections
 from agents.main_agent.backend.utils import get_embedding, get_user_input
 from constants import SYSTEM_LOG_LIST
 
@@ -28,37 +28,30 @@ def rag_router(state: GraphState) -> str:
     top_k_kb = None
 
     try:
-        collection_names_search_list = get_all_collection_name()
-
-        for collection_name in collection_names_search_list:
-            collection = get_collection(collection_name)
+        # one ANN search over the shared chunk index, limited to a document when the
+        # question names one; otherwise the file summaries are searched alongside it
+        doc_name = find_doc_name(user_input)
+        collections = [get_doc_index()]
+        where = {"doc_name": doc_name} if doc_name else None
+        if not doc_name:
+            summary_collection = get_collection(PDF_SUMMARY_COLLECTION) if PDF_SUMMARY_COLLECTION else None
+            if summary_collection:
+                collections.append(summary_collection)
+        state.logs.append(
+            f"Searching Collections: {[collection.name for collection in collections]}, doc_name filter: {doc_name}")
+        try:
+            embed_user_input = get_embedding([user_input])
+            _, top_k_kb, top_score = search_collections(
+                state, collections, embed_user_input, where=where)
+        except Exception as e:
             state.logs.append(
-                f"Searching Collection: {collection_name}")
-            if collection:
-                if collection.count() == 0:
-                    state.logs.append(
-                        log_template.empty_collection_error)
-                    continue
-                try:
-                    embed_user_input = get_embedding([user_input])
-                    try:
-                        _, top_k_kb, top_score = rag_retrieval_node(
-                            state, collection, embed_user_input)
-                    except Exception as e:
-                        e = e
-                except Exception as e:
-                    state.logs.append(
-                        log_template.rag_retrieval_exception.format(e=e))
-                    return "FALSE"
-                if top_k_kb and top_score >= RAG_THRESHOLD:
-                    state.qa_state.top_k_kb = top_k_kb
-                    state.logs.append(log_template.successful_log.format(
-                        top_score=top_score, RAG_THRESHOLD=RAG_THRESHOLD))
-                    return "TRUE"
-                else:
-                    continue
-            else:
-                return "FALSE"
+                log_template.rag_retrieval_exception.format(e=e))
+            return "FALSE"
+        if top_k_kb and top_score >= RAG_THRESHOLD:
+            state.qa_state.top_k_kb = top_k_kb
+            state.logs.append(log_template.successful_log.format(
+                top_score=top_score, RAG_THRESHOLD=RAG_THRESHOLD))
+            return "TRUE"
     except Exception as e:
         state.logs.append(
             log_template.get_collection_exception.format(e=e))
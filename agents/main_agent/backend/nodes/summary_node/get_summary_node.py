@@ -2,7 +2,7 @@ import copy
 import os
 from dotenv import load_dotenv
 
-from agents.main_agent.backend.dataBase_setup.chroma_setup import get_all_collection_name, get_collection, insert_pdf_summary
+from agents.main_agent.backend.dataBase_setup.chroma_setup import find_doc_name, get_doc_chunks, insert_pdf_summary
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
 from agents.main_agent.backend.utils import get_embedding, get_user_input, single_chunk_summary, clean_text, log_decorator
 
@@ -48,22 +48,8 @@ def get_summary_node(state: GraphState) -> GraphState:
 
 
 def get_collection_name(user_input: str) -> str | None:
-    user_input = user_input.strip().lower()
-
-    collection_names = get_all_collection_name()
-
-    for name in collection_names:
-        if name.lower() in user_input:
-            return name
-
-    return None
+    return find_doc_name(user_input)
 
 
 def format_chunk_list(collection_name: str):
-
-    collection = get_collection(collection_name)
-
-    result = collection.get(include=["documents"])
-    documents = result.get("documents", [])
-
-    return documents
+    return get_doc_chunks(collection_name)
@@ -134,9 +134,8 @@ async def invoke_tool(message, bind_tools, state: GraphState) -> GraphState:
         if should_recall:
             format_data = prompt_generator(finalized_result.agent_response)
             directory_message = format_data.get("message")
-            await main_agent.send_message(recipient_id="DirectoryAgent", message=directory_message)
             # await main_agent.send_message(recipient_id="WebAgent", message=directory_message)
-            directory_response = await main_agent.receive_message()
+            directory_response = await main_agent.request("DirectoryAgent", directory_message)
             if not directory_response:
                 logging.info("No response from DirectoryAgent.")
                 break
@@ -160,13 +159,12 @@ async def invoke_tool(message, bind_tools, state: GraphState) -> GraphState:
             # await main_agent.send_message(recipient_id="WebAgent", message=next_message)
 
 
-            finalized_result.agent_response = directory_response
-            agent_obj = json.loads(directory_response )
+            finalized_result.agent_response = directory_response["message"]
             logging.info(
-                f"Response from {agent_obj['sender_id']}: {directory_response }")
+                f"Response from {directory_response['sender_id']}: {directory_response['message']}")
             new_state.tool_outputs.append({
-                "tool": agent_obj["sender_id"],
-                "agent_response": agent_obj["message"]})
+                "tool": directory_response["sender_id"],
+                "agent_response": directory_response["message"]})
 
         attempt += 1
 
@@ -11,6 +11,7 @@ import pandas as pd
 from sentence_transformers import SentenceTransformer
 import numpy as np
 from openai import OpenAI
+from common.embedding_cache import cached_embed
 from functools import wraps
 from transformers import pipeline
 from constants import SYSTEM_PROMPT_LIST
@@ -24,6 +25,7 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL")
 EMBED_MODEL = os.getenv("EMBED_MODEL")
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", 64))
 summary_pipeline = pipeline("summarization", model=SUMMARIZER_MODEL)
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "ollama").lower()
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL")
@@ -80,15 +82,24 @@ def get_embedding(chunk: str):
     if isinstance(chunk, str):
         chunk = [chunk]
     if LLM_PROVIDER == "openai":
-        response = client.embeddings.create(
-            model=os.getenv("OPENAI_EMBED_MODEL"),
-            input=chunk
-        )
-        return [data.embedding for data in response.data]
-    embed_model = load_model()
-    embed_result = embed_model.encode(
-        chunk, show_progress_bar=True, normalize_embeddings=True)
-    return normalize_vector(embed_result)
+        embed_model_name = os.getenv("OPENAI_EMBED_MODEL")
+
+        def embed(texts):
+            response = client.embeddings.create(
+                model=embed_model_name,
+                input=texts
+            )
+            return [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+
+        return cached_embed(f"openai:{embed_model_name}", chunk, embed).tolist()
+
+    def embed(texts):
+        embed_model = load_model()
+        return embed_model.encode(
+            texts, batch_size=EMBED_BATCH_SIZE, show_progress_bar=False, normalize_embeddings=True)
+
+    # rows come back unit length from the model, cached per text
+    return [normalize_vector(row) for row in cached_embed(f"sentence-transformers:{EMBED_MODEL}", chunk, embed)]
 
 
 def normalize_vector(vec: list[float]) -> list[float]:
@@ -2,7 +2,7 @@ import asyncio
 import os
 from nicegui import ui
 import tempfile
-from agents.main_agent.backend.dataBase_setup.chroma_setup import get_all_collection_name
+from agents.main_agent.backend.dataBase_setup.chroma_setup import list_document_names
 from agents.main_agent.backend.model.states.StateManager import StateManager
 from agents.main_agent.backend.model.states.graph_state.GraphState import GraphState
 from langchain_core.messages import HumanMessage, AIMessage
@@ -165,7 +165,7 @@ def render_sidebar():
 @ui.refreshable
 def render_collection_list():
     state = StateManager.get_state()
-    collection_names = get_all_collection_name()
+    collection_names = list_document_names()
     with ui.column().classes('h-[300px] w-full overflow-y-auto p-3 bg-gray-50'):
         if collection_names:
             for collection_name in collection_names:
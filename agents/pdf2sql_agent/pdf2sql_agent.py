@@ -8,9 +8,9 @@ from agents.pdf2sql_agent.src.agent.tools import (
 from common.tools.communicate import create_comm_tool
 import asyncio
 import logging
-from common.ConnectionManager import ConnectionManager
+from common.ConnectionManager import ConnectionManager, current_correlation_id
 from nicegui.events import UploadEventArguments
-from common.ChatManager import ChatManager
+from common.ChatManager import ChatManager, LaneQueue, AGENT_WORKERS, thread_id_for
 from nicegui import app, ui
 
 logging.basicConfig(level=logging.INFO,
@@ -23,7 +23,7 @@ class AgentManager():
 
     def __init__(self):
         self.chat_manager = ChatManager(name="InventoryAgent")
-        self.task_queue = asyncio.Queue()
+        self.task_queue = LaneQueue()
         self.connection_manager = ConnectionManager("InventoryAgent",
                                                     """I am the Inventory Agent. I have direct access to our live inventory database.
                                                                 
@@ -44,17 +44,21 @@ class AgentManager():
         logging.info("Starting worker thread")
         while True:
             task_data = await self.task_queue.get()
-            logging.info(f"Worker thread picked up {task_data}")
-            logging.info(type(self.chat_manager))
-            message = ""
-            if isinstance(task_data, dict):
-                message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
-            elif isinstance(task_data, str):
-                message = task_data
-            else:
-                logging.info(f"Incorrect message format")
-            await self.chat_manager.run_agent(message)
-            self.task_queue.task_done()
+            try:
+                logging.info(f"Worker thread picked up {task_data}")
+                logging.info(type(self.chat_manager))
+                message = ""
+                current_correlation_id.set(task_data.get("correlation_id") if isinstance(task_data, dict) else None)
+                if isinstance(task_data, dict):
+                    message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
+                elif isinstance(task_data, str):
+                    message = task_data
+                else:
+                    logging.info(f"Incorrect message format")
+                await self.chat_manager.run_agent(message, thread_id_for(task_data))
+            finally:
+                # frees the conversation's lane for its next request
+                self.task_queue.task_done(task_data)
             if self.update_ui_callback:
                 self.update_ui_callback()
 
@@ -78,7 +82,8 @@ class AgentManager():
         ]
 
         await self.chat_manager.setup(tools=tools, prompt="", type="sql2pdf")
-        asyncio.create_task(self.worker())
+        for _ in range(AGENT_WORKERS):
+            asyncio.create_task(self.worker())
 
 
 
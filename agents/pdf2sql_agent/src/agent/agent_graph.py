@@ -1,5 +1,4 @@
 from typing import Literal
-from langchain.chat_models import init_chat_model
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver    # type: ignore 
 from langchain_core.messages import ToolMessage                  # type: ignore
@@ -7,11 +6,12 @@ import aiosqlite                                                     # type: ign
 from typing import List, Any
 from agents.pdf2sql_agent.src.config import (
     AGENT_CHECKPOINT_DB,
-    AGENT_VERBOSE
+    AGENT_VERBOSE,
+    TOOL_CONCURRENCY
 )
 from agents.pdf2sql_agent.src.agent.agent_state import SQL2PDFAgentState
-from langgraph.prebuilt import ToolNode
-from config.config_helper import get_model_config
+from config.config_helper import get_llm
+from common.concurrency import run_blocking, gather_ordered, runs_sequentially
 
 
 from agents.pdf2sql_agent.src.agent.prompts import get_system_prompt
@@ -37,8 +37,7 @@ class SQL2PDFAgent:
             enable_critique: Whether to enable the critique/self-review loop
             enable_memory: Whether to enable long term memory (needs qdrant running)
         """
-        model_config = get_model_config()
-        self.llm = init_chat_model(f"{model_config["provider"]}:{model_config['model']}")
+        self.llm = get_llm()
         self.name = name
         self.description = description or get_system_prompt()
         self.enable_critique = enable_critique
@@ -74,7 +73,7 @@ class SQL2PDFAgent:
             print(f"[{self.name}] Initialized with {len(self.tools)} tools")
             print(f"[{self.name}] Critique enabled: {self.enable_critique}")
 
-    def retrieve_memory(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def retrieve_memory(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """retrieve relevant memories before planning"""
         if not self.enable_memory or not self.memory_store:
             return {}
@@ -85,7 +84,7 @@ class SQL2PDFAgent:
         user_message = state["messages"][-1].content if state["messages"] else ""
 
         try:
-            memories = self.memory_store.get(user_message, top_k=5, score_threshold=0.7)
+            memories = await run_blocking(self.memory_store.get, user_message, top_k=5, score_threshold=0.7)
 
             if memories:
                 memory_context = "## past experiences:\n\n"
@@ -109,7 +108,7 @@ class SQL2PDFAgent:
 
         return {}
 
-    def planner(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def planner(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """
         Create a step-by-step plan for handling the user's request
 
@@ -142,14 +141,14 @@ class SQL2PDFAgent:
 
         planner_messages = [("system", system_msg), ("user", user_message)]
 
-        plan = self.llm.invoke(planner_messages).content
+        plan = (await self.llm.ainvoke(planner_messages)).content
 
         if AGENT_VERBOSE:
             print(f"[{self.name}] Plan created:\n{plan}")
 
         return {"plan": plan}
 
-    def chat(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def chat(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """
         Main agent node that processes messages and calls tools
 
@@ -241,7 +240,7 @@ Format it clearly for the user. This is MANDATORY.
         messages_with_prompt = [("system", system_prompt)] + state["messages"]
 
         # Invoke LLM with tools
-        ai_response = self.llm_with_tools.invoke(messages_with_prompt)
+        ai_response = await self.llm_with_tools.ainvoke(messages_with_prompt)
 
         if AGENT_VERBOSE:
             if hasattr(ai_response, "tool_calls") and ai_response.tool_calls:
@@ -252,7 +251,7 @@ Format it clearly for the user. This is MANDATORY.
 
         return {"messages": [ai_response]}
 
-    def tools_node(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def tools_node(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """
         Execute tools called by the agent
 
@@ -262,41 +261,50 @@ Format it clearly for the user. This is MANDATORY.
         Returns:
             Updated state with tool results
         """
-        outputs = []
         last_message = state["messages"][-1]
 
         tools_by_name = {tool.name: tool for tool in self.tools}
 
-        if hasattr(last_message, "tool_calls") and last_message.tool_calls:
-            for tool_call in last_message.tool_calls:
-                tool_name = tool_call["name"]
-                tool_args = tool_call["args"]
-                tool_id = tool_call["id"]
+        if not (hasattr(last_message, "tool_calls") and last_message.tool_calls):
+            return {"messages": []}
 
+        async def run_tool_call(tool_call) -> ToolMessage:
+            tool_name = tool_call["name"]
+            tool_args = tool_call["args"]
+            tool_id = tool_call["id"]
+
+            if AGENT_VERBOSE:
+                print(f"[Tool] Executing {tool_name}...")
+
+            tool = tools_by_name[tool_name]
+            try:
+                # sync-only tools (psycopg, reportlab) run in an executor via BaseTool.ainvoke
+                result = await tool.ainvoke(tool_args)
+                if AGENT_VERBOSE:
+                    print(f"[Tool] {tool_name} completed successfully")
+            except Exception as e:
+                result = f"Error executing {tool_name}: {str(e)}"
                 if AGENT_VERBOSE:
-                    print(f"[Tool] Executing {tool_name}...")
+                    print(f"[Tool] {tool_name} failed: {str(e)}")
 
-                tool = tools_by_name[tool_name]
-                try:
-                    result = tool.invoke(tool_args)
-                    if AGENT_VERBOSE:
-                        print(f"[Tool] {tool_name} completed successfully")
-                except Exception as e:
-                    result = f"Error executing {tool_name}: {str(e)}"
-                    if AGENT_VERBOSE:
-                        print(f"[Tool] {tool_name} failed: {str(e)}")
+            # Create tool message
+            return ToolMessage(
+                content=result,
+                name=tool_name,
+                tool_call_id=tool_id
+            )
 
-                # Create tool message
-                tool_message = ToolMessage(
-                    content=result,
-                    name=tool_name,
-                    tool_call_id=tool_id
-                )
-                outputs.append(tool_message)
+        # independent calls run concurrently, results keep call order
+        outputs = await gather_ordered(
+            last_message.tool_calls,
+            run_tool_call,
+            limit=TOOL_CONCURRENCY,
+            sequential=lambda call: runs_sequentially(tools_by_name.get(call["name"])),
+        )
 
         return {"messages": outputs}
 
-    def critique(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def critique(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """
         Review the agent's response for quality and completeness
 
@@ -329,7 +337,7 @@ Format it clearly for the user. This is MANDATORY.
             ("system", critique_prompt)
         ]
 
-        critique = self.llm.invoke(critique_message).content
+        critique = (await self.llm.ainvoke(critique_message)).content
 
         if AGENT_VERBOSE:
             print(f"[{self.name}] Critique: {critique}")
@@ -379,7 +387,7 @@ Format it clearly for the user. This is MANDATORY.
             # Good to go
             return "end"
 
-    def store_memory(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
+    async def store_memory(self, state: SQL2PDFAgentState) -> SQL2PDFAgentState:
         """extract and store memories from conversation"""
         if not self.enable_memory or not self.memory_manager:
             return {}
@@ -388,7 +396,7 @@ Format it clearly for the user. This is MANDATORY.
             print(f"\n[{self.name}] Storing memories...")
 
         try:
-            extracted = self.memory_manager.extract(state["messages"])
+            extracted = await run_blocking(self.memory_manager.extract, state["messages"])
 
             if AGENT_VERBOSE:
                 print(f"[{self.name}] Extracted {len(extracted)} memories from conversation")
@@ -403,7 +411,7 @@ Format it clearly for the user. This is MANDATORY.
             skipped_count = 0
             for memory in extracted:
                 try:
-                    mem_id = self.memory_store.put(memory, check_duplicates=True)
+                    mem_id = await run_blocking(self.memory_store.put, memory, check_duplicates=True)
                     # Check if it was actually stored or was a duplicate
                     if mem_id:
                         stored_count += 1
@@ -440,11 +448,10 @@ Format it clearly for the user. This is MANDATORY.
         # Create graph
         graph = StateGraph(SQL2PDFAgentState)
 
-        tool_node = ToolNode(tools=self.tools)
-        # Add nodes
+        # Add nodes - custom tools_node bounds concurrency and honours sequential tools
         graph.add_node("planner", self.planner)
         graph.add_node("chat", self.chat)
-        graph.add_node("tools", tool_node)
+        graph.add_node("tools", self.tools_node)
 
         if self.enable_critique:
             graph.add_node("critique", self.critique)
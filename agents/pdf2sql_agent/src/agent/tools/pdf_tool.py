@@ -11,6 +11,9 @@ from decimal import Decimal
 
 from langchain_core.tools import BaseTool
 
+from common.concurrency import SEQUENTIAL_HINT
+
+
 class DecimalEncoder(json.JSONEncoder):  # added this because the json .dumps was having trouble with dataframes
     def default(self, obj):
         if isinstance(obj, Decimal):
@@ -22,6 +25,8 @@ class DecimalEncoder(json.JSONEncoder):  # added this because the json .dumps wa
 class PDFTool(BaseTool):
     model_config = {"arbitrary_types_allowed": True}
     name: str = "generate_pdf_report"
+    # reports on the query results, so it waits for the SQL call
+    metadata: Optional[dict] = {SEQUENTIAL_HINT: True}
     description: str = ("Generates a structured PDF report summarizing a DataFrame's key statistics and trends, optionally including a data visualization.")
 
     api_key: str = ""
@@ -29,6 +29,7 @@ AGENT_TEMPERATURE = float(os.getenv("AGENT_TEMPERATURE", "0"))
 AGENT_CHECKPOINT_DB = os.getenv("AGENT_CHECKPOINT_DB", "pdf2sql_agent.db")
 AGENT_VERBOSE = os.getenv("AGENT_VERBOSE", "true").lower() in ("true", "1", "yes")
 AGENT_MAX_ITERATIONS = int(os.getenv("AGENT_MAX_ITERATIONS", "10"))
+TOOL_CONCURRENCY = int(os.getenv("TOOL_CONCURRENCY", "4"))
 
 # Memory Configuration (local, no docker/api needed)
 MEMORY_ENABLED = os.getenv("MEMORY_ENABLED", "false").lower() in ("true", "1", "yes")
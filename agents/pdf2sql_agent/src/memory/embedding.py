@@ -1,5 +1,6 @@
 from sentence_transformers import SentenceTransformer
 from typing import Union, List
+from common.embedding_cache import cached_embed
 from .schemas import Episode, Semantic
 
 
@@ -10,6 +11,7 @@ class EmbeddingGenerator:
         # lightweight model
         # downloads automatically on first use
         self.model = SentenceTransformer(model)
+        self.model_id = f"sentence-transformers:{model}"
 
     def memory_to_text(self, memory: Union[Episode, Semantic]) -> str:
         """convert memory obj to text for embedding"""
@@ -20,20 +22,18 @@ class EmbeddingGenerator:
             return f"{memory.subject} {memory.predicate} {memory.object}{ctx}"
         return str(memory)
 
+    def _encode(self, texts: List[str]):
+        return self.model.encode(texts, convert_to_numpy=True)
+
     def generate(self, text: Union[str, List[str]]) -> Union[List[float], List[List[float]]]:
-        """generate embedding vector"""
+        """generate embedding vector, served from the shared embedding cache when seen before"""
         is_single = isinstance(text, str)
 
+        embeddings = cached_embed(self.model_id, [text] if is_single else text, self._encode)
         if is_single:
-            # for single string, encode directly returns 1d array
-            embedding = self.model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
-        else:
-            # for list, encode returns 2d array
-            embeddings = self.model.encode(text, convert_to_numpy=True)
-            return [emb.tolist() for emb in embeddings]
+            return embeddings[0].tolist()
+        return [emb.tolist() for emb in embeddings]
 
     def generate_query_embedding(self, query: str) -> List[float]:
         """generate embedding for search queries - same as document for this model"""
-        embedding = self.model.encode(query, convert_to_numpy=True)
-        return embedding.tolist()
+        return self.generate(query)
@@ -1,14 +1,14 @@
 import sys
 
 from nicegui.events import UploadEventArguments
-from common.ChatManager import ChatManager
+from common.ChatManager import ChatManager, LaneQueue, AGENT_WORKERS, thread_id_for
 import websockets
 from nicegui import app, ui
 import asyncio
 import json
 import os
 import logging
-from common.ConnectionManager import ConnectionManager
+from common.ConnectionManager import ConnectionManager, current_correlation_id
 from agents.web_agent.tools.webscrape import WebScrape
 from agents.web_agent.tools.websearch import WebSearch
 from common.tools.memorytool import MemoryTool
@@ -30,7 +30,7 @@ class AgentManager():
             description="A specialized agent for web-based information retrieval. It uses WebSearch to find relevant pages and Webscrape to extract specific data.",
             capabilities=["WebSearch", "Webscrape"])
         self.chat_manager = ChatManager(name="WebAgent")
-        self.task_queue = asyncio.Queue()
+        self.task_queue = LaneQueue()
         self.user_input = None
         self.update_ui_callback = None
 
@@ -38,17 +38,21 @@ class AgentManager():
         logging.info("Starting worker thread")
         while True:
             task_data = await self.task_queue.get()
-            logging.info(f"Worker thread picked up {task_data}")
-            logging.info(type(self.chat_manager))
-            message = ""
-            if isinstance(task_data, dict):
-                message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
-            elif isinstance(task_data, str):
-                message = task_data
-            else:
-                logging.info(f"Incorrect message format")
-            await self.chat_manager.run_agent(message)
-            self.task_queue.task_done()
+            try:
+                logging.info(f"Worker thread picked up {task_data}")
+                logging.info(type(self.chat_manager))
+                message = ""
+                current_correlation_id.set(task_data.get("correlation_id") if isinstance(task_data, dict) else None)
+                if isinstance(task_data, dict):
+                    message = f"You have a new message from: {task_data['sender_id']}\n+ Message:{task_data['message']}"
+                elif isinstance(task_data, str):
+                    message = task_data
+                else:
+                    logging.info(f"Incorrect message format")
+                await self.chat_manager.run_agent(message, thread_id_for(task_data))
+            finally:
+                # frees the conversation's lane for its next request
+                self.task_queue.task_done(task_data)
             if self.update_ui_callback:
                 self.update_ui_callback()
 
@@ -105,7 +109,8 @@ class AgentManager():
         )
 
         tools = [communicate, websearch, webscrape, datetime, csv]
-        asyncio.create_task(self.worker())
+        for _ in range(AGENT_WORKERS):
+            asyncio.create_task(self.worker())
         await self.chat_manager.setup(tools = tools, prompt=description, type="web")
 
 
@@ -1,10 +1,10 @@
-from common.ChatManager import ChatManager
+from common.ChatManager import ChatManager, LaneQueue, AGENT_WORKERS, thread_id_for
 import websockets
 from typing import List, Any
 import asyncio
 import json
 import logging
-from common.ConnectionManager import ConnectionManager
+from common.ConnectionManager import ConnectionManager, current_correlation_id
 from agents.web_agent.tools.webscrape import WebScrape
 from agents.web_agent.tools.websearch import WebSearch
 from common.tools.memorytool import MemoryTool
@@ -29,7 +29,7 @@ class AgentManager():
             description=self.description,
             capabilities=self.capabilities)
         self.chat_manager = ChatManager(name=self.agent_id)
-        self.task_queue = asyncio.Queue()
+        self.task_queue = LaneQueue()
         self.user_input = None
         self.update_ui_callback = None
 
@@ -37,17 +37,21 @@ class AgentManager():
         logging.info("Starting worker thread")
         while True:
             task_data = await self.task_queue.get()
-            logging.info(f"Worker thread picked up {task_data}")
-            logging.info(type(self.chat_manager))
-            message = ""
-            if isinstance(task_data, dict):
-                message = f"You have a new message from: {task_data['sender']}\n+ Message:{task_data['message']}"
-            elif isinstance(task_data, str):
-                message = task_data
-            else:
-                logging.info(f"Incorrect message format")
-            await self.chat_manager.run_agent(message)
-            self.task_queue.task_done()
+            try:
+                logging.info(f"Worker thread picked up {task_data}")
+                logging.info(type(self.chat_manager))
+                message = ""
+                current_correlation_id.set(task_data.get("correlation_id") if isinstance(task_data, dict) else None)
+                if isinstance(task_data, dict):
+                    message = f"You have a new message from: {task_data['sender']}\n+ Message:{task_data['message']}"
+                elif isinstance(task_data, str):
+                    message = task_data
+                else:
+                    logging.info(f"Incorrect message format")
+                await self.chat_manager.run_agent(message, thread_id_for(task_data))
+            finally:
+                # frees the conversation's lane for its next request
+                self.task_queue.task_done(task_data)
             if self.update_ui_callback:
                 self.update_ui_callback()
 
@@ -63,5 +67,6 @@ class AgentManager():
             return
         await self.connection_manager.start_listening(message_handler=self.message_handler)
 
-        asyncio.create_task(self.worker())
+        for _ in range(AGENT_WORKERS):
+            asyncio.create_task(self.worker())
         await self.chat_manager.setup(tools = self.tools, prompt=self.prompt)
\ No newline at end of file
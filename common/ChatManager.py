@@ -3,12 +3,71 @@ from common.agent.Agent import Agent
 from agents.classification_agent.src.agent.agent_graph import ReviewAgent
 from agents.pdf2sql_agent.src.agent.agent_graph import SQL2PDFAgent
 import aiosqlite
+import asyncio
+import os
+from collections import deque
 from typing import List, Any
 import logging
 from typing import Any, List
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
 
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "4"))
+DEFAULT_THREAD_ID = "3"
+
+
+def thread_id_for(task_data) -> str:
+    """Checkpoint thread and worker lane for a task: its explicit conversation id if
+    it has one, otherwise its sender. The correlation id is per request, keying on it
+    would drop the history and let one sender's requests run out of order."""
+    if isinstance(task_data, dict):
+        key = task_data.get("conversation_id") or task_data.get("sender_id") or task_data.get("sender")
+        if key:
+            return str(key)
+    return DEFAULT_THREAD_ID
+
+
+class LaneQueue:
+    """Task queue with one FIFO lane per conversation (thread_id_for key).
+
+    get() only hands out the head of a lane that no worker is running, and the lane
+    becomes available again when task_done() is called for that task. Requests of one
+    conversation therefore run one at a time in arrival order, while a worker that is
+    free always takes the next waiting conversation instead of blocking behind a busy
+    one. Lanes are served round robin.
+    """
+    def __init__(self, key=thread_id_for):
+        self.key = key
+        self.lanes: dict[str, deque] = {}   # key -> waiting tasks, present while queued or running
+        self.ready: asyncio.Queue = asyncio.Queue()  # keys with a waiting task and no running one
+
+    async def put(self, task):
+        self.put_nowait(task)
+
+    def put_nowait(self, task):
+        key = self.key(task)
+        lane = self.lanes.get(key)
+        if lane is None:
+            self.lanes[key] = deque([task])
+            self.ready.put_nowait(key)
+        else:
+            lane.append(task)
+
+    async def get(self):
+        key = await self.ready.get()
+        return self.lanes[key].popleft()
+
+    def task_done(self, task):
+        key = self.key(task)
+        if self.lanes.get(key):
+            self.ready.put_nowait(key)
+        else:
+            self.lanes.pop(key, None)
+
+    def qsize(self) -> int:
+        return sum(len(lane) for lane in self.lanes.values())
+
+
 class ChatManager:
     def __init__(self, name: str):
         self.messages = []
@@ -43,18 +102,20 @@ class ChatManager:
             else:
                 continue
 
-    async def run_agent(self, user_input):
+    async def run_agent(self, user_input, thread_id: str = DEFAULT_THREAD_ID):
+        # callers serialise runs of one thread (see LaneQueue), runs on different threads
+        # proceed in parallel
         try:
             input_to = {"messages": [HumanMessage(content=user_input)]}
             final_state = await self.graph.ainvoke(input = input_to,
-                                                   config={"configurable": {"thread_id": "3"}})
+                                                   config={"configurable": {"thread_id": thread_id}})
             msg = final_state["messages"][-1].content
             self.messages.append({"role": "agent", "content": msg})
             logging.info(f"Agent output {msg}")
         except Exception as e:
             logging.error(e)
         finally:
-            logging.info("Agent finished")
+            logging.info(f"Agent finished (thread {thread_id})")
 
 
 
@@ -1,3 +1,4 @@
+from contextvars import ContextVar
 from typing import List
 import websockets
 import asyncio
@@ -5,6 +6,13 @@ import json
 import logging
 from websockets import ConnectionClosedError
 
+from common import codec
+from common.concurrency import LoopLagMonitor
+
+# correlation id of the message currently being handled, so replies sent while
+# handling it carry the same id back to whoever started the exchange
+current_correlation_id: ContextVar[str | None] = ContextVar("current_correlation_id", default=None)
+
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
 
@@ -17,6 +25,8 @@ class ConnectionManager:
         self.agent_id = agent_id
         self.description = description
         self.capabilities = capabilities
+        self.codec = codec.JSON
+        self.loop_monitor = LoopLagMonitor(agent_id)
 
     async def connect(self):
         try:
@@ -40,10 +50,14 @@ class ConnectionManager:
             "agent_id": self.agent_id,
             "description": self.description,
             "capabilities": self.capabilities,
-
+            "codecs": codec.SUPPORTED_CODECS,
         }))
         registration_response = await self._websocket.recv()
         logging.info(registration_response)
+        try:
+            self.codec = json.loads(registration_response).get("codec", codec.JSON)
+        except (TypeError, ValueError, AttributeError):
+            self.codec = codec.JSON
 
     async def send(self, payload):
         logging.info(f"Sending message")
@@ -51,12 +65,16 @@ class ConnectionManager:
             logging.error("Websocket not connected")
             return "Websocket not connected"
 
-        await self._websocket.send(json.dumps(payload))
+        correlation_id = current_correlation_id.get()
+        if correlation_id and "correlation_id" not in payload:
+            payload = {**payload, "correlation_id": correlation_id}
+        await self._websocket.send(codec.encode(payload, self.codec))
 
     async def start_listening(self, message_handler):
         if not self._websocket:
             raise ConnectionError("Websocket not connected")
         self.task = asyncio.create_task(self.receive(message_handler))
+        self.loop_monitor.start()
 
     async def receive(self, message_handler):
         while True:
@@ -65,7 +83,7 @@ class ConnectionManager:
             else:
                 try:
                     async for message in self._websocket:
-                        task_data = json.loads(message)
+                        task_data = codec.decode(message)
                         logging.info(f"Received message: {task_data}")
                         await message_handler(task_data)
                 except (websockets.exceptions.ConnectionClosedError, ConnectionResetError) as error:
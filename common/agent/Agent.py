@@ -1,13 +1,12 @@
 from langmem import create_memory_manager
 from .AgentState import State
 from langgraph.graph import StateGraph, START, END
-from langchain.chat_models import init_chat_model
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from langgraph.prebuilt import ToolNode
 from typing_extensions import List, Any
 from common.memory.semantic import Semantic
 from common.memory.episodic import Episode
-from config.config_helper import get_model_config
+from config.config_helper import get_llm
 from common.stores.QdrantStore import QdrantStore
 import logging
 
@@ -17,10 +16,9 @@ class Agent:
     """An Agent class"""
     def __init__(self, tools: List[Any],name: str, prompt: str):
         """init method for class Agent requires tools as a list of tools"""
-        model_config = get_model_config()
         self.name = name
         self.prompt= prompt
-        self.llm = init_chat_model(f"{model_config["provider"]}:{model_config['model']}")
+        self.llm = get_llm()
         self.tools = tools
         self.llm_with_tools  = self.llm.bind_tools(self.tools)
         self.manager =  create_memory_manager(
@@ -30,7 +28,7 @@ class Agent:
             )
         #self.store = QdrantStore(collection_name="WebAgent") #don't uncomment if you don't have qdrant running
 
-    def planner(self, state: State):
+    async def planner(self, state: State):
         if self.name == "WebAgent":
             planner_messages =  [("user", f"{state["messages"][-1].content}")] + [
                 (
@@ -53,13 +51,13 @@ class Agent:
                     f"Available tools: {[tool.name for tool in self.tools]}\n"
                 )
             ]
-        plan = self.llm_with_tools.invoke(planner_messages).content
+        plan = (await self.llm_with_tools.ainvoke(planner_messages)).content
 
         state["plan"] = plan
 
         return state
 
-    def chat(self, state: State):
+    async def chat(self, state: State):
         system_prompt = (
            self.prompt + f"You must follow this plan {state['plan']}"
         )
@@ -67,7 +65,7 @@ class Agent:
         if state.get('critique') and state['critique'] != 'None':
             system_prompt += f"you must revise your previous answer based on the following critique: {state['critique']}"
         messages_with_prompt = [("system", system_prompt)] + state["messages"]
-        ai_response = self.llm_with_tools.invoke(messages_with_prompt)
+        ai_response = await self.llm_with_tools.ainvoke(messages_with_prompt)
         return {"messages":[ai_response]}
 
 
@@ -0,0 +1,87 @@
+import json
+import os
+import struct
+import zlib
+
+import ormsgpack
+
+JSON = "json"
+MSGPACK = "msgpack"
+SUPPORTED_CODECS = [MSGPACK, JSON]
+
+COMPRESS_THRESHOLD = int(os.getenv("WIRE_COMPRESS_THRESHOLD", "4096"))
+COMPRESS_LEVEL = int(os.getenv("WIRE_COMPRESS_LEVEL", "1"))
+
+# frame layout: magic(1) | flags(1) | header length(2) | header | body
+# the header carries every routing field (everything except "message") so the
+# server can route a frame without decoding or decompressing its body.
+_MAGIC = 0xA7
+_FLAG_ZLIB = 0x01
+_PREFIX = struct.Struct(">BBH")
+
+
+class FrameError(ValueError):
+    pass
+
+
+def negotiate(offered: list[str] | None) -> str:
+    """pick the first codec offered by the client that we also speak, JSON otherwise"""
+    for codec in offered or []:
+        if codec in SUPPORTED_CODECS:
+            return codec
+    return JSON
+
+
+def encode(payload: dict, codec: str = MSGPACK) -> bytes | str:
+    if codec != MSGPACK:
+        return json.dumps(payload)
+
+    header = {key: value for key, value in payload.items() if key != "message"}
+    header_bytes = ormsgpack.packb(header)
+    if len(header_bytes) > 0xFFFF:
+        raise FrameError("Frame header too large")
+
+    flags = 0
+    body = ormsgpack.packb(payload.get("message"))
+    if len(body) > COMPRESS_THRESHOLD:
+        compressed = zlib.compress(body, COMPRESS_LEVEL)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= _FLAG_ZLIB
+
+    return _PREFIX.pack(_MAGIC, flags, len(header_bytes)) + header_bytes + body
+
+
+def _split(frame: bytes) -> tuple[int, bytes, memoryview]:
+    if len(frame) < _PREFIX.size:
+        raise FrameError("Frame too short")
+    magic, flags, header_length = _PREFIX.unpack_from(frame)
+    if magic != _MAGIC:
+        raise FrameError(f"Unknown frame magic: {magic:#x}")
+    view = memoryview(frame)
+    header_end = _PREFIX.size + header_length
+    return flags, view[_PREFIX.size:header_end], view[header_end:]
+
+
+def read_header(frame: bytes) -> dict:
+    """routing fields of a binary frame, the body is left untouched"""
+    _, header, _ = _split(frame)
+    return ormsgpack.unpackb(header)
+
+
+def decode(frame: bytes | str) -> dict:
+    """decode a frame of either codec, text frames are always JSON"""
+    if isinstance(frame, str):
+        return json.loads(frame)
+
+    flags, header, body = _split(frame)
+    payload = ormsgpack.unpackb(header)
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    payload["message"] = ormsgpack.unpackb(body)
+    return payload
+
+
+def transcode_to_json(frame: bytes) -> str:
+    """for recipients that never negotiated the binary codec"""
+    return json.dumps(decode(frame))
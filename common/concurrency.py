@@ -0,0 +1,117 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logging.basicConfig(level=logging.INFO,
+                    format='%(asctime)s %(levelname)s %(message)s')
+
+BLOCKING_WORKERS = int(os.getenv("BLOCKING_WORKERS", "8"))
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))
+LOOP_LAG_WARN = float(os.getenv("LOOP_LAG_WARN", "0.2"))
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="blocking")
+    return _executor
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a synchronous call (model inference, psycopg query, ...) on the shared
+    thread pool so it does not stall the event loop. Context variables such as the
+    current correlation id are carried over to the worker thread."""
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_get_executor(), call)
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop wakes up a periodic sleep.
+
+    Anything that blocks the loop (a sync LLM call, a long tokenizer run) shows up
+    as lag, so this is the number to watch when checking that work was moved off it.
+    """
+    def __init__(self, name: str, interval: float = LOOP_LAG_INTERVAL, warn_threshold: float = LOOP_LAG_WARN):
+        self.name = name
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.task: asyncio.Task | None = None
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.slow_ticks = 0
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self.task:
+            self.task.cancel()
+            self.task = None
+
+    def record(self, lag: float):
+        self.samples += 1
+        self.last_lag = lag
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.warn_threshold:
+            self.slow_ticks += 1
+            logging.warning(f"[{self.name}] event loop lag {lag * 1000:.0f} ms")
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - expected))
+
+    def stats(self) -> dict:
+        return {
+            "samples": self.samples,
+            "last_ms": round(self.last_lag * 1000, 1),
+            "max_ms": round(self.max_lag * 1000, 1),
+            "avg_ms": round(self.total_lag / self.samples * 1000, 1) if self.samples else 0.0,
+            "slow_ticks": self.slow_ticks,
+        }
+
+
+# tools whose metadata carries this flag run on their own: after every earlier call
+# in the same AIMessage has finished and before any later one starts
+SEQUENTIAL_HINT = "sequential"
+
+
+def runs_sequentially(tool) -> bool:
+    return bool((getattr(tool, "metadata", None) or {}).get(SEQUENTIAL_HINT))
+
+
+async def gather_ordered(items: list, run, limit: int, sequential=lambda item: False) -> list:
+    """Await run(item) for every item with at most `limit` in flight and return the
+    results in item order. Items flagged by `sequential` act as barriers."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+    results = [None] * len(items)
+    pending = []
+
+    async def bounded(index, item):
+        async with semaphore:
+            results[index] = await run(item)
+
+    for index, item in enumerate(items):
+        if sequential(item):
+            if pending:
+                await asyncio.gather(*pending)
+                pending = []
+            await bounded(index, item)
+        else:
+            pending.append(asyncio.create_task(bounded(index, item)))
+
+    if pending:
+        await asyncio.gather(*pending)
+    return results
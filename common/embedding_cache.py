@@ -0,0 +1,185 @@
+"""
+Content-addressed embedding cache shared by every embedding front-end
+
+Vectors are keyed by sha256(model id, normalized text) and stored as float32 blobs
+in SQLite, so the same task description, user question or memory is only sent to
+OpenAI / a sentence-transformer once. The least recently used entries are evicted
+once the cache holds more than EMBEDDING_CACHE_MAX_ENTRIES vectors.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Callable, Sequence
+
+import numpy as np
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("true", "1", "yes")
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "./embedding_cache.db")
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "200000"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace and unicode form do not change the key; case does, it changes the embedding"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def embedding_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x1f{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite store of float32 vectors with LRU eviction"""
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH, max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_lru ON embeddings (accessed_at)")
+        self._conn.commit()
+        [self._count] = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    def get_many(self, keys: Sequence[str]) -> dict[str, np.ndarray]:
+        """Cached vectors for the keys that are present"""
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, np.ndarray] = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+            if found:
+                now = time.time()
+                self._conn.executemany("UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, items: dict[str, np.ndarray]):
+        if not items:
+            return
+
+        now = time.time()
+        rows = []
+        for key, vector in items.items():
+            vector = np.ascontiguousarray(vector, dtype=np.float32)
+            rows.append((key, model, int(vector.shape[0]), vector.tobytes(), now))
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, model, dim, vector, accessed_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            inserted = self._conn.total_changes - before
+            self.writes += inserted
+            self._count += inserted
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Trim to 90% of max_entries once over the limit, so eviction runs rarely (caller holds the lock)"""
+        if not self.max_entries or self._count <= self.max_entries:
+            return
+        [self._count] = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+            self._count -= excess
+            self.evictions += excess
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+
+_cache: EmbeddingCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Process-wide cache, or None when EMBEDDING_CACHE_ENABLED is off or the file cannot be opened"""
+    global _cache
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = EmbeddingCache()
+            except sqlite3.Error as e:
+                logging.warning(f"Embedding cache disabled, cannot open {EMBEDDING_CACHE_PATH}: {e}")
+                return None
+    return _cache
+
+
+def cached_embed(model: str, texts: Sequence[str], embed: Callable[[list[str]], Sequence],
+                 cache: EmbeddingCache | None = None) -> np.ndarray:
+    """Embeds texts through the cache.
+
+    Only texts without a cached vector are passed to `embed` (once each, in one call);
+    returns a float32 array of shape (len(texts), dim) in input order.
+    """
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    cache = cache or get_embedding_cache()
+    if cache is None:
+        return np.asarray(embed(texts), dtype=np.float32)
+
+    keys = [embedding_key(model, text) for text in texts]
+    vectors = cache.get_many(keys)
+
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing.setdefault(key, text)
+    if missing:
+        computed = np.asarray(embed(list(missing.values())), dtype=np.float32)
+        fresh = dict(zip(missing.keys(), computed))
+        cache.put_many(model, fresh)
+        vectors.update(fresh)
+
+    return np.stack([vectors[key] for key in keys])
@@ -1,21 +1,46 @@
 from typing import Any
+import logging
 import os
-from qdrant_client import QdrantClient, models
-from qdrant_client.models import VectorParams, Distance
-from openai import OpenAI
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from openai import OpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+from common.embedding_cache import cached_embed
 from common.memory.semantic import Semantic
 from common.memory.episodic import Episode
 from typing import Union
 
 MemoryObject = Union[Semantic, Episode]
 
+# OpenAI accepts up to 2048 inputs (and ~300k tokens) per embeddings request
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "2048"))
+EMBEDDING_BATCH_MAX_CHARS = int(os.getenv("EMBEDDING_BATCH_MAX_CHARS", "600000"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "5"))
+
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
 class Embedding:
     """
     Embedding class for the custom qdrant class, it uses open AI embedding by default
     """
-    def __init__(self):
+    def __init__(self, batch_size: int = EMBEDDING_BATCH_SIZE, max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+                 max_retries: int = EMBEDDING_MAX_RETRIES):
         self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
         self.model = "text-embedding-3-small"
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
 
     def semantic_to_sentence(self, memory: Semantic):
         """converts semantic memory to sentence representation for embedding"""
@@ -26,58 +51,74 @@ class Embedding:
         """converts episodic memory to sentence representation for embedding"""
         return f"{memory.observation} {memory.thoughts} {memory.action} {memory.result}"
 
-    def get_embedding(self, quary: MemoryObject | str) -> list[float]:
-        """Get the embedding for the given memory using openai. expects a memory object which contains
-        both semantic and episodic memories
-        """
+    def to_text(self, quary: MemoryObject | str) -> str:
+        """text that gets embedded for a memory object or a plain string"""
         if isinstance(quary, Semantic):
-            text = self.semantic_to_sentence(quary)
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text,
-            )
-            # as vector
-            embeddings = response.data[0].embedding
-            if not embeddings or len(embeddings) == 0:
-                msg = "No embeddings returned from OpenAI."
-                raise ValueError(msg)
-
-            return list(embeddings)
-
+            return self.semantic_to_sentence(quary)
         elif isinstance(quary, Episode):
-            text = self.episodic_to_sentence(quary)
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text,
-            )
-            embeddings = response.data[0].embedding
-            if not embeddings or len(embeddings) == 0:
-                msg = "No embeddings returned from OpenAI."
-                raise ValueError(msg)
-
-            return list(embeddings)
-
-        elif isinstance(quary, Semantic):
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=quary,
-            )
-            embeddings = response.data[0].embedding
-            if not embeddings or len(embeddings) == 0:
-                msg = "No embeddings returned from OpenAI."
-                raise ValueError(msg)
-
-            return list(embeddings)
-
+            return self.episodic_to_sentence(quary)
         elif isinstance(quary, str):
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=quary,
-            )
-            embeddings = response.data[0].embedding
-            if not embeddings or len(embeddings) == 0:
-                msg = "No embeddings returned from OpenAI."
-                raise ValueError(msg)
-            return list(embeddings)
+            return quary
         else:
-            raise Exception(f"Unknown memory type: {type(memory)}")
\ No newline at end of file
+            raise TypeError(f"Unknown memory type: {type(quary)}")
+
+    def _batches(self, texts: list[str]) -> list[tuple[int, list[str]]]:
+        """splits texts into (start index, batch) pairs within the request input and size limits"""
+        batches = []
+        start, chars = 0, 0
+        for i, text in enumerate(texts):
+            if i > start and (i - start >= self.batch_size or chars + len(text) > EMBEDDING_BATCH_MAX_CHARS):
+                batches.append((start, texts[start:i]))
+                start, chars = i, 0
+            chars += len(text)
+        if start < len(texts):
+            batches.append((start, texts[start:]))
+        return batches
+
+    def _embed_batch(self, texts: list[str]) -> np.ndarray:
+        """one embeddings request, retried with exponential backoff on rate limits, timeouts and 5xx"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.embeddings.create(
+                    model=self.model,
+                    input=texts,
+                )
+                break
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = _retry_after(e) or min(30.0, 0.5 * 2 ** attempt)
+                logging.warning(f"Embedding request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay + random.uniform(0, delay / 4))
+
+        data = sorted(response.data, key=lambda item: item.index)
+        if len(data) != len(texts) or any(not item.embedding for item in data):
+            msg = "No embeddings returned from OpenAI."
+            raise ValueError(msg)
+        return np.asarray([item.embedding for item in data], dtype=np.float32)
+
+    def get_embeddings(self, quaries: list[MemoryObject | str]) -> np.ndarray:
+        """Embeds many memories/strings with as few requests as possible.
+
+        Texts already in the embedding cache are not sent again; the rest are packed up
+        to the provider's per-request limit and the batches run concurrently. Returns a
+        float32 array of shape (len(quaries), dim) in input order.
+        """
+        texts = [self.to_text(quary) for quary in quaries]
+        return cached_embed(f"openai:{self.model}", texts, self._embed_texts)
+
+    def _embed_texts(self, texts: list[str]) -> np.ndarray:
+        """embeds texts with batched, concurrent requests"""
+        batches = self._batches(texts)
+        if len(batches) == 1:
+            return self._embed_batch(texts)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+            results = list(pool.map(lambda batch: self._embed_batch(batch[1]), batches))
+        return np.concatenate(results, axis=0)
+
+    def get_embedding(self, quary: MemoryObject | str) -> list[float]:
+        """Get the embedding for the given memory using openai. expects a memory object which contains
+        both semantic and episodic memories
+        """
+        return self.get_embeddings([quary])[0].tolist()
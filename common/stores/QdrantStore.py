@@ -38,14 +38,18 @@ class QdrantStore():
 
     def put(self, memories):
         """Stores the memory, while also checking for duplicate memories"""
-        for memory in memories:
-            vector = self.embedding.get_embedding(memory)
-            check = self._check_for_duplicates(vector=vector)
+        memories = list(memories)
+        if not memories:
+            return
+        # one batched embedding call for every memory and its content
+        vectors = self.embedding.get_embeddings(memories + [memory.content for memory in memories])
+        for i, memory in enumerate(memories):
+            check = self._check_for_duplicates(vector=vectors[i].tolist())
             if check is None:
                 id = memory.id
             else:
                 id = check
-            vector = self.embedding.get_embedding(memory.content)
+            vector = vectors[len(memories) + i].tolist()
             self.client.upsert(
                 collection_name=self.collection_name,
                 points=[
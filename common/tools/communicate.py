@@ -4,6 +4,7 @@ import logging
 from pydantic import BaseModel, Field, create_model, PrivateAttr
 from enum import Enum
 from common.ConnectionManager import ConnectionManager
+from common.concurrency import SEQUENTIAL_HINT
 import json
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
@@ -15,6 +16,8 @@ logging.basicConfig(level=logging.INFO,
 class Communicate(BaseTool):
     """Tool class that inherits from base tool"""
     name: str = "CommunicateTool"
+    # replies summarise the other tool results, send them last
+    metadata: dict | None = {SEQUENTIAL_HINT: True}
     description: str = "A tool that allows you to contact other agents given a message, sender and recipient"
     args_schema: type[BaseModel]
 
@@ -1,4 +1,5 @@
 import asyncio
+import os
 import websockets
 import json
 import logging
@@ -7,50 +8,139 @@ from websockets import ConnectionClosedOK
 from websockets.client import ClientConnection
 from websockets.exceptions import ConnectionClosed, ConnectionClosedError
 
+from common import codec
+
 
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
 
+OUTBOUND_QUEUE_SIZE = int(os.getenv("OUTBOUND_QUEUE_SIZE", "200"))
+
+
+class OutboundChannel:
+    """Bounded outbound queue for a single recipient, drained by its own sender task.
+
+    Frames stay queued while the recipient is disconnected and are delivered
+    once it registers again, unless the queue fills up first.
+    """
+    def __init__(self, agent_id: str, maxsize: int = OUTBOUND_QUEUE_SIZE):
+        self.agent_id = agent_id
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.task: asyncio.Task | None = None
+        self.registered = False
+        self.sent = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.queue.qsize(),
+            "capacity": self.queue.maxsize,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "connected": self.task is not None and not self.task.done(),
+        }
+
+
 class AgentServer:
     def __init__(self):
         self.agent_registry = {}
-        self.queue = asyncio.Queue(maxsize=1000)
+        self.channels: dict[str, OutboundChannel] = {}
+        self.agent_codecs: dict[str, str] = {}
         logging.info("Agent server started.")
 
+    def _get_channel(self, agent_id: str) -> OutboundChannel:
+        channel = self.channels.get(agent_id)
+        if channel is None:
+            channel = OutboundChannel(agent_id)
+            self.channels[agent_id] = channel
+        return channel
+
+    def _start_sender(self, agent_id: str):
+        channel = self._get_channel(agent_id)
+        channel.registered = True
+        if channel.task is None or channel.task.done():
+            channel.task = asyncio.create_task(self._sender(channel))
+
+    def _stop_sender(self, agent_id: str):
+        channel = self.channels.get(agent_id)
+        if channel and channel.task:
+            channel.task.cancel()
+            channel.task = None
+
+    def enqueue(self, recipient_id: str, frame: str | bytes) -> bool:
+        """Queue a serialised frame for a recipient without waiting on its socket.
+
+        Returns False (and counts a reject) when the recipient's queue is full,
+        so one stalled agent cannot hold up delivery to the others.
+        """
+        channel = self._get_channel(recipient_id)
+        if not channel.registered:
+            channel.dropped += 1
+            logging.warning(f"Agent {recipient_id} is not registered, message dropped")
+            return False
+        try:
+            channel.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            channel.rejected += 1
+            logging.warning(f"Outbound queue for {recipient_id} is full ({channel.queue.maxsize}), message rejected")
+            return False
+
+    def backpressure_stats(self) -> dict:
+        return {agent_id: channel.stats() for agent_id, channel in self.channels.items()}
+
     async def unregister_agent(self, agent_id:str):
         if agent_id in self.agent_registry:
             del self.agent_registry[agent_id]
+            self._stop_sender(agent_id)
             await self.update_directory_agent(agent_id, None)
             logging.info(f"Agent {agent_id} was unregistered.")
 
     async def register_agent(self, agent_id:str, websocket: ClientConnection):
         self.agent_registry[agent_id] = websocket
+        self._start_sender(agent_id)
         logging.info(f"Agent {agent_id} was registered.")
         await websocket.send(json.dumps({"status": "registered"}))
 
-    async def forward_message(self, message_type: str, sender_id: str, recipient_id: str ,message:str):
-        recipient_ws = self.agent_registry.get(recipient_id)
-        if recipient_ws:
-            try:
-                await recipient_ws.send(json.dumps({
-                    "message_type": message_type,
-                    "sender_id": sender_id,
-                    "message": message,
-                }))
-                logging.info(f"Agent {message_type}{sender_id} sent a message to {recipient_id}.")
-            except ConnectionClosedError:
-                logging.warning(f"Agent {sender_id} sending {message} failed")
-        else:
-            logging.warning(f"Agent {sender_id} sending {message} failed")
-
-    async def dispatch_message(self):
+    def forward_message(self, message_type: str, sender_id: str, recipient_id: str ,message:str,
+                        correlation_id: str | None = None) -> bool:
+        frame = {
+            "message_type": message_type,
+            "sender_id": sender_id,
+            "message": message,
+        }
+        if correlation_id:
+            frame["correlation_id"] = correlation_id
+        return self.enqueue(recipient_id, json.dumps(frame))
+
+    def forward_frame(self, recipient_id: str, frame: bytes) -> bool:
+        """Forward a binary frame as-is, transcoding only for JSON-only recipients."""
+        if self.agent_codecs.get(recipient_id, codec.JSON) != codec.MSGPACK:
+            frame = codec.transcode_to_json(frame)
+        return self.enqueue(recipient_id, frame)
+
+    async def _sender(self, channel: OutboundChannel):
         while True:
+            frame = await channel.queue.get()
+            recipient_ws = self.agent_registry.get(channel.agent_id)
             try:
-                message_type, recipient_id, sender_id, message = await self.queue.get()
-                await self.forward_message(message_type, sender_id, recipient_id, message)
-                self.queue.task_done()
+                if recipient_ws is None:
+                    channel.dropped += 1
+                    logging.warning(f"Agent {channel.agent_id} disconnected, message dropped")
+                    continue
+                await recipient_ws.send(frame)
+                channel.sent += 1
+                logging.info(f"Delivered message to {channel.agent_id} (queue depth {channel.queue.qsize()}).")
+            except ConnectionClosed:
+                channel.dropped += 1
+                logging.warning(f"Sending to {channel.agent_id} failed, connection closed")
             except Exception as e:
-                logging.error(f"Error sending message: {e}")
+                channel.dropped += 1
+                logging.error(f"Error sending message to {channel.agent_id}: {e}")
+            finally:
+                channel.queue.task_done()
 
     async def update_directory_agent(self, message, websocket: websockets.ClientProtocol | None):
         data = message
@@ -58,15 +148,15 @@ class AgentServer:
             try:
                 agent_id = data["agent_id"]
             except KeyError:
-                logging.error(f"Agent {data["agent_id"]} is missing agent_id.")
+                logging.error(f"Registration message is missing agent_id: {data}")
                 return
             self.agent_registry[agent_id] = websocket
+            self._start_sender(agent_id)
             if agent_id == "DirectoryAgent":
                 logging.info(f"Agent {agent_id} was registered.")
                 return
-            directory_ws = self.agent_registry.get("DirectoryAgent")
-
-            if directory_ws:
+            logging.info(f"Agent {agent_id} was registered.")
+            if "DirectoryAgent" in self.agent_registry:
                 logging.info(f"Notifying Directory Agent about new agent: {agent_id}")
                 notification = {
                     "message_type": "registration",
@@ -74,40 +164,17 @@ class AgentServer:
                     "description": data.get("description", "No description provided."),
                     "capabilities": data.get("capabilities", [])
                 }
-                try:
-                    logging.info(f"Agent {agent_id} was registered.")
-                    await directory_ws.send(json.dumps(notification))
-                    # logging.info(f"Agent {agent_id} was registered.")
-                except ConnectionClosedError:
-                    logging.info(f"Agent {agent_id} sending {notification} failed")
-                return
-            else:
-                logging.info(f"Agent {agent_id} was registered.")
-        elif websocket is None:
-            try:
-                agent_id = data
-                directory_ws = self.agent_registry.get("DirectoryAgent")
-                if directory_ws:
-                    logging.info(f"Notifying Directory Agent that {agent_id} disconnected")
-                    notification = {
-                        "message_type": "update",
-                        "agent_id": agent_id,
-                    }
-                    try:
-                        await directory_ws.send(json.dumps(notification))
-                    except ConnectionClosedError:
-                        logging.info(f"Agent {agent_id} sending {notification} failed")
-                    finally:
-                        logging.info(f"Agent {agent_id} was disconnected.")
-                        return
-            except Exception as e:
-                logging.info(f"Error sending message: {e}")
-                return
+                self.enqueue("DirectoryAgent", json.dumps(notification))
         else:
-            logging.info("Wrong message type sent to websocket")
-            return
-
-
+            agent_id = data
+            if "DirectoryAgent" in self.agent_registry:
+                logging.info(f"Notifying Directory Agent that {agent_id} disconnected")
+                notification = {
+                    "message_type": "update",
+                    "agent_id": agent_id,
+                }
+                self.enqueue("DirectoryAgent", json.dumps(notification))
+            logging.info(f"Agent {agent_id} was disconnected.")
 
     async def connection_handler(self, websocket):
             #logging.info("A client connected")
@@ -118,23 +185,39 @@ class AgentServer:
                 if data.get("message_type") == "register" and "agent_id" in data:
                     agent_id = data["agent_id"]
                     logging.info(f"Client Connected and registering: {data['agent_id']}")
+                    agent_codec = codec.negotiate(data.get("codecs"))
+                    self.agent_codecs[agent_id] = agent_codec
                     await self.update_directory_agent(message=data, websocket=websocket)
-                    await websocket.send(json.dumps({"status": "registration successful"}))
+                    await websocket.send(json.dumps({"status": "registration successful", "codec": agent_codec}))
                 else:
                     await websocket.close(1008, json.dumps({"status": "registration failed"}))
 
                     return
                 async for message in websocket:
                     try:
-                        data = json.loads(message)
+                        if isinstance(message, bytes):
+                            header = codec.read_header(message)
+                            recipient_id = header.get("recipient_id")
+                            if recipient_id and header.get("message_type") != "stats":
+                                self.forward_frame(recipient_id, message)
+                                continue
+                            data = codec.decode(message)
+                        else:
+                            data = json.loads(message)
                         message_type = data.get("message_type")
                         recipient_id = data.get("recipient_id")
                         sender_id = data.get("sender_id")
                         message_content = data.get("message")
-                        if recipient_id and message:
-                            item = (message_type, recipient_id, sender_id, message_content)
+                        if message_type == "stats":
+                            self.enqueue(agent_id, json.dumps({
+                                "message_type": "stats",
+                                "sender_id": "server",
+                                "message": self.backpressure_stats(),
+                            }))
+                        elif recipient_id and message:
                             #logging.info(f"Agent {sender_id} sending {message}")
-                            await self.queue.put(item)
+                            self.forward_message(message_type, sender_id, recipient_id, message_content,
+                                                 data.get("correlation_id"))
                         else:
                             logging.error(f"Invalid message format: {message}")
                     except Exception as e:
@@ -152,7 +235,6 @@ class AgentServer:
 
     async def startup(self):
         logging.info("Server Started startup")
-        asyncio.create_task(self.dispatch_message())
 
 async def main():
     server = AgentServer()
@@ -1,30 +1,64 @@
+import os
 import pathlib
+import threading
+import time
 import yaml
 import json
 import logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s %(levelname)s %(message)s')
 
+CONFIG_PATH = pathlib.Path(__file__).parent.joinpath("config.yaml")
+# how often (seconds) the file's mtime is checked for a hot reload
+CONFIG_RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "2"))
+
+_lock = threading.Lock()
+_config_state = {"config": None, "mtime": None, "checked_at": 0.0}
+_llm_registry = {}
+
+
+def _load_config() -> dict:
+    """parsed config.yaml, re-read only when the file has changed since the last load"""
+    now = time.monotonic()
+    with _lock:
+        if _config_state["config"] is not None and now - _config_state["checked_at"] < CONFIG_RELOAD_INTERVAL:
+            return _config_state["config"]
+        _config_state["checked_at"] = now
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+        if _config_state["config"] is None or mtime != _config_state["mtime"]:
+            try:
+                with open(CONFIG_PATH, 'r') as f:
+                    config = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                # keep serving the last good config while the file is being edited
+                if _config_state["config"] is None:
+                    raise
+                logging.error(f"Yaml Error on reload, keeping previous config: {e}")
+                return _config_state["config"]
+            if _config_state["mtime"] is not None:
+                logging.info("config.yaml changed, reloaded")
+            _config_state["config"] = config
+            _config_state["mtime"] = mtime
+        return _config_state["config"]
+
 
 def get_model_config():
-    path = pathlib.Path(__file__).parent.joinpath("config.yaml")
     try:
-        with open(path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = _load_config()
 
-            choice = config.get("model_choice")
-            if not choice:
-                raise ValueError("Config 'model_choice' not set in config.yaml")
+        choice = config.get("model_choice")
+        if not choice:
+            raise ValueError("Config 'model_choice' not set in config.yaml")
 
-            all_models = config.get("models")
-            if not all_models:
-                raise ValueError("Config 'models' section not set in config.yaml")
+        all_models = config.get("models")
+        if not all_models:
+            raise ValueError("Config 'models' section not set in config.yaml")
 
-            provider_choice = all_models.get(choice)
-            if not provider_choice:
-                raise ValueError(f"Model '{choice}' not found in 'models' section.")
+        provider_choice = all_models.get(choice)
+        if not provider_choice:
+            raise ValueError(f"Model '{choice}' not found in 'models' section.")
 
-            return provider_choice
+        return dict(provider_choice)
 
     except FileNotFoundError:
         logging.error("Storage File Not Found")
@@ -40,4 +74,32 @@ def get_model_config():
         return None
     except Exception as e:
         logging.error(f"Unknown Error: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def get_llm(temperature: float | None = None, **kwargs):
+    """
+    Shared chat model for the current config.yaml choice
+
+    Clients are built lazily and cached per (provider, model, temperature, kwargs), so
+    every caller in the process reuses the same instance and its HTTP connection pool.
+    Editing config.yaml switches callers to a new client on their next call.
+    """
+    from langchain.chat_models import init_chat_model  # type: ignore
+
+    config = get_model_config()
+    if config is None:
+        raise ValueError("No model configured in config.yaml")
+
+    key = (config["provider"], config["model"], temperature, tuple(sorted(kwargs.items())))
+    llm = _llm_registry.get(key)
+    if llm is None:
+        with _lock:
+            llm = _llm_registry.get(key)
+            if llm is None:
+                if temperature is not None:
+                    kwargs = {**kwargs, "temperature": temperature}
+                llm = init_chat_model(f"{config['provider']}:{config['model']}", **kwargs)
+                _llm_registry[key] = llm
+                logging.info(f"Created LLM client {config['provider']}:{config['model']} (temperature={temperature})")
+    return llm
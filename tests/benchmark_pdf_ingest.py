@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF ingestion: serial vs pooled page extraction, then the full
+extract -> chunk -> embed -> Chroma pipeline of process_pdf_node.
+
+Usage:
+    python tests/benchmark_pdf_ingest.py [num_pages] [--full]
+
+--full also embeds and indexes the chunks (needs the embedding model); Chroma
+and the document catalog go to a temporary directory. Set PDF_EXTRACT_WORKERS,
+PDF_INGEST_BATCH_SIZE and EMBED_BATCH_SIZE to compare configurations.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import fitz
+
+from agents.main_agent.backend.nodes.pdf_node.pdf_text import PDF_EXTRACT_WORKERS, extract_pages
+
+WORDS = ("booking payment refund guest hotel room checkout invoice error timeout account "
+         "support ticket password login sync report export calendar reminder").split()
+
+
+def make_pdf(path: str, pages: int):
+    """A text-heavy PDF, roughly 2-3k characters per page"""
+    random.seed(0)
+    pdf = fitz.open()
+    for page_num in range(pages):
+        page = pdf.new_page()
+        lines = [" ".join(random.choice(WORDS) for _ in range(12)) for _ in range(40)]
+        page.insert_textbox(page.rect + (36, 36, -36, -36), f"Page {page_num + 1}\n" + "\n".join(lines), fontsize=8)
+    pdf.save(path)
+    pdf.close()
+
+
+def bench_extraction(path: str, pages: int):
+    start = time.perf_counter()
+    extract_pages(path, workers=1)
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    extract_pages(path, min_pages=1)
+    pooled = time.perf_counter() - start
+
+    print(f"Serial extraction:  {pages / serial:8.1f} pages/sec ({serial:.2f}s)")
+    print(f"Pooled extraction:  {pages / pooled:8.1f} pages/sec ({pooled:.2f}s, {PDF_EXTRACT_WORKERS} workers)")
+
+
+def bench_full(path: str, pages: int, workdir: str):
+    os.environ["CHROMA_PATH"] = os.path.join(workdir, "chroma")
+    os.environ["SQL_PATH"] = os.path.join(workdir, "catalog.db")
+    os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+    from agents.main_agent.backend.nodes.pdf_node.process_pdf_node import chunk_pages, ingest_chunks
+
+    # load the model outside the timed run
+    ingest_chunks(chunk_pages([(0, "warm up")], "warmup"))
+
+    start = time.perf_counter()
+    chunks = chunk_pages(extract_pages(path), "benchmark")
+    ingest_chunks(chunks)
+    elapsed = time.perf_counter() - start
+
+    print(f"Full pipeline:      {pages / elapsed:8.1f} pages/sec, {len(chunks) / elapsed:.1f} chunks/sec "
+          f"({len(chunks)} chunks in {elapsed:.2f}s)")
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    pages = int(args[0]) if args else 500
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "benchmark.pdf")
+        make_pdf(path, pages)
+
+        print("=" * 60)
+        print(f"PDF ingestion benchmark: {pages} pages")
+        print("=" * 60)
+
+        bench_extraction(path, pages)
+        if "--full" in sys.argv:
+            bench_full(path, pages, workdir)
+
+
+if __name__ == "__main__":
+    main()
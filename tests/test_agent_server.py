@@ -0,0 +1,113 @@
+"""
+Tests for per-recipient outbound queues in the communication server
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import codec
+from communication_server.server import AgentServer
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, frame):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(frame)
+
+
+async def _register(server, agent_id, websocket):
+    await server.update_directory_agent({"agent_id": agent_id}, websocket)
+
+
+def test_slow_recipient_does_not_block_others():
+    async def scenario():
+        server = AgentServer()
+        slow, fast = FakeWebSocket(delay=10), FakeWebSocket()
+        await _register(server, "SlowAgent", slow)
+        await _register(server, "FastAgent", fast)
+
+        server.forward_message("message", "main_agent", "SlowAgent", "first")
+        server.forward_message("message", "main_agent", "FastAgent", "second")
+        await asyncio.sleep(0.05)
+
+        assert len(fast.sent) == 1
+        assert json.loads(fast.sent[0])["message"] == "second"
+        assert slow.sent == []
+        server._stop_sender("SlowAgent")
+        server._stop_sender("FastAgent")
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_and_unknown_recipient_drops():
+    async def scenario():
+        server = AgentServer()
+        slow = FakeWebSocket(delay=10)
+        await _register(server, "SlowAgent", slow)
+        channel = server.channels["SlowAgent"]
+        for _ in range(channel.queue.maxsize + 1):
+            server.forward_message("message", "main_agent", "SlowAgent", "hello")
+        await asyncio.sleep(0)
+        for _ in range(3):
+            server.forward_message("message", "main_agent", "SlowAgent", "hello")
+
+        assert not server.forward_message("message", "main_agent", "NoSuchAgent", "hello")
+
+        stats = server.backpressure_stats()
+        assert stats["SlowAgent"]["depth"] == channel.queue.maxsize
+        assert stats["SlowAgent"]["rejected"] == 3
+        assert stats["NoSuchAgent"]["dropped"] == 1
+        server._stop_sender("SlowAgent")
+
+    asyncio.run(scenario())
+
+
+def test_queued_messages_delivered_after_reconnect():
+    async def scenario():
+        server = AgentServer()
+        await _register(server, "WebAgent", FakeWebSocket())
+        await server.unregister_agent("WebAgent")
+
+        assert server.forward_message("message", "main_agent", "WebAgent", "while offline")
+
+        websocket = FakeWebSocket()
+        await _register(server, "WebAgent", websocket)
+        await asyncio.sleep(0.05)
+
+        assert [json.loads(f)["message"] for f in websocket.sent] == ["while offline"]
+        server._stop_sender("WebAgent")
+
+    asyncio.run(scenario())
+
+
+def test_binary_frames_forwarded_raw_or_transcoded():
+    async def scenario():
+        server = AgentServer()
+        binary, legacy = FakeWebSocket(), FakeWebSocket()
+        await _register(server, "BinaryAgent", binary)
+        await _register(server, "LegacyAgent", legacy)
+        server.agent_codecs["BinaryAgent"] = codec.MSGPACK
+        server.agent_codecs["LegacyAgent"] = codec.JSON
+
+        payload = {"message_type": "message", "recipient_id": "BinaryAgent",
+                   "sender_id": "main_agent", "message": {"rows": list(range(5))}}
+        frame = codec.encode(payload, codec.MSGPACK)
+        server.forward_frame("BinaryAgent", frame)
+        server.forward_frame("LegacyAgent", frame)
+        await asyncio.sleep(0.05)
+
+        assert binary.sent == [frame]
+        assert json.loads(legacy.sent[0]) == payload
+        server._stop_sender("BinaryAgent")
+        server._stop_sender("LegacyAgent")
+
+    asyncio.run(scenario())
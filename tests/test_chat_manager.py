@@ -0,0 +1,99 @@
+"""
+Tests for per-sender ordering and cross-sender parallelism in ChatManager and LaneQueue
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("aiosqlite")
+pytest.importorskip("langgraph")
+
+from langchain_core.messages import AIMessage
+from common.ChatManager import ChatManager, LaneQueue, thread_id_for
+
+
+class FakeGraph:
+    """Records when each run starts and ends; a run takes 0.05s"""
+
+    def __init__(self):
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    async def ainvoke(self, input, config):
+        message = input["messages"][0].content
+        thread_id = config["configurable"]["thread_id"]
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.events.append(("start", thread_id, message))
+        await asyncio.sleep(0.05)
+        self.events.append(("end", thread_id, message))
+        self.running -= 1
+        return {"messages": [AIMessage(content=f"done {message}")]}
+
+
+async def _run_workers(tasks, workers):
+    chat_manager = ChatManager("test")
+    chat_manager.graph = FakeGraph()
+    queue = LaneQueue()
+    for task in tasks:
+        queue.put_nowait(task)
+
+    async def worker():
+        while True:
+            task = await queue.get()
+            try:
+                await chat_manager.run_agent(task["message"], thread_id_for(task))
+            finally:
+                queue.task_done(task)
+
+    runners = [asyncio.create_task(worker()) for _ in range(workers)]
+    while queue.qsize() or chat_manager.graph.running:
+        await asyncio.sleep(0.01)
+    for runner in runners:
+        runner.cancel()
+    return chat_manager.graph
+
+
+def test_thread_id_ignores_per_request_correlation_id():
+    first = {"sender_id": "main_agent", "correlation_id": "a1", "message": "hi"}
+    second = {"sender_id": "main_agent", "correlation_id": "b2", "message": "again"}
+
+    assert thread_id_for(first) == thread_id_for(second) == "main_agent"
+    assert thread_id_for({**first, "conversation_id": "chat-7"}) == "chat-7"
+
+
+def test_same_sender_requests_run_in_order():
+    tasks = [{"sender_id": "main_agent", "correlation_id": str(i), "message": f"m{i}"} for i in range(4)]
+
+    graph = asyncio.run(_run_workers(tasks, workers=4))
+
+    assert graph.peak == 1
+    assert [message for kind, _, message in graph.events if kind == "start"] == ["m0", "m1", "m2", "m3"]
+    assert {thread_id for _, thread_id, _ in graph.events} == {"main_agent"}
+
+
+def test_different_senders_run_in_parallel():
+    tasks = [{"sender_id": f"agent{i}", "correlation_id": str(i), "message": f"m{i}"} for i in range(4)]
+
+    graph = asyncio.run(_run_workers(tasks, workers=4))
+
+    assert graph.peak == 4
+
+
+def test_busy_sender_does_not_hold_up_other_senders():
+    tasks = [{"sender_id": "main_agent", "correlation_id": str(i), "message": f"m{i}"} for i in range(6)]
+    tasks.append({"sender_id": "web_agent", "correlation_id": "w", "message": "w"})
+
+    graph = asyncio.run(_run_workers(tasks, workers=2))
+
+    starts = [message for kind, _, message in graph.events if kind == "start"]
+    # the second worker takes the other sender right away instead of waiting behind m0
+    assert starts.index("w") == 1
+    assert [message for message in starts if message != "w"] == [f"m{i}" for i in range(6)]
+    assert graph.peak == 2
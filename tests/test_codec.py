@@ -0,0 +1,50 @@
+"""
+Tests for the inter-agent wire codec
+"""
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import codec
+
+
+PAYLOAD = {
+    "message_type": "message",
+    "recipient_id": "ClassificationAgent",
+    "sender_id": "main_agent",
+    "message": "classify review REV-0001",
+}
+
+
+def test_msgpack_roundtrip_and_header_only_read():
+    frame = codec.encode(PAYLOAD, codec.MSGPACK)
+
+    assert isinstance(frame, bytes)
+    assert codec.decode(frame) == PAYLOAD
+    assert codec.read_header(frame) == {
+        "message_type": "message",
+        "recipient_id": "ClassificationAgent",
+        "sender_id": "main_agent",
+    }
+
+
+def test_large_bodies_are_compressed():
+    payload = dict(PAYLOAD, message="review text " * 2000)
+    frame = codec.encode(payload, codec.MSGPACK)
+
+    assert len(frame) < len(json.dumps(payload)) // 10
+    assert codec.decode(frame) == payload
+
+
+def test_json_fallback_and_negotiation():
+    frame = codec.encode(PAYLOAD, codec.JSON)
+
+    assert isinstance(frame, str)
+    assert codec.decode(frame) == PAYLOAD
+    assert codec.transcode_to_json(codec.encode(PAYLOAD)) == json.dumps(PAYLOAD)
+    assert codec.negotiate(["msgpack", "json"]) == codec.MSGPACK
+    assert codec.negotiate(["cbor"]) == codec.JSON
+    assert codec.negotiate(None) == codec.JSON
@@ -0,0 +1,72 @@
+"""
+Tests for the executor offload helper and the event loop lag monitor
+"""
+import asyncio
+import contextvars
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.concurrency import LoopLagMonitor, gather_ordered, run_blocking
+
+
+def test_run_blocking_keeps_loop_responsive():
+    async def scenario():
+        monitor = LoopLagMonitor("test", interval=0.01, warn_threshold=1.0)
+        monitor.start()
+        await run_blocking(time.sleep, 0.2)
+        monitor.stop()
+        return monitor.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["samples"] >= 5
+    assert stats["max_ms"] < 100
+
+
+def test_blocking_call_on_loop_shows_up_as_lag():
+    async def scenario():
+        monitor = LoopLagMonitor("test", interval=0.01, warn_threshold=0.1)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.2)
+        await asyncio.sleep(0.02)
+        monitor.stop()
+        return monitor.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["max_ms"] >= 150
+    assert stats["slow_ticks"] >= 1
+
+
+def test_run_blocking_carries_context_variables():
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    async def scenario():
+        request_id.set("abc")
+        return await run_blocking(request_id.get)
+
+    assert asyncio.run(scenario()) == "abc"
+
+
+def test_gather_ordered_bounds_concurrency_and_keeps_order():
+    running, peak, finished = 0, 0, []
+
+    async def run(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05 if item == "slow" else 0.01)
+        running -= 1
+        finished.append(item)
+        return item.upper()
+
+    items = ["slow", "a", "b", "report", "c"]
+    results = asyncio.run(gather_ordered(items, run, limit=2, sequential=lambda item: item == "report"))
+
+    assert results == ["SLOW", "A", "B", "REPORT", "C"]
+    assert peak == 2
+    # the sequential call waits for everything before it and runs before what follows
+    assert finished.index("report") == 3
@@ -0,0 +1,61 @@
+"""
+Tests for cached, hot-reloaded model config
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import config_helper
+
+
+CONFIG = """model_choice: {choice}
+models:
+  gpt:
+    model: gpt-4o-mini
+    provider: openai
+  local:
+    model: qwen3:8b
+    provider: ollama
+"""
+
+
+def _write(path: Path, choice: str, mtime: int):
+    path.write_text(CONFIG.format(choice=choice))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_config_is_cached_and_reloaded_on_change(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    _write(path, "gpt", 1_000_000_000)
+    monkeypatch.setattr(config_helper, "CONFIG_PATH", path)
+    monkeypatch.setattr(config_helper, "CONFIG_RELOAD_INTERVAL", 0)
+    monkeypatch.setattr(config_helper, "_config_state", {"config": None, "mtime": None, "checked_at": 0.0})
+
+    loads = []
+    real_load = config_helper.yaml.safe_load
+    monkeypatch.setattr(config_helper.yaml, "safe_load", lambda f: loads.append(1) or real_load(f))
+
+    assert config_helper.get_model_config()["provider"] == "openai"
+    assert config_helper.get_model_config()["provider"] == "openai"
+    assert len(loads) == 1
+
+    _write(path, "local", 2_000_000_000)
+    assert config_helper.get_model_config() == {"model": "qwen3:8b", "provider": "ollama"}
+    assert len(loads) == 2
+
+
+def test_broken_edit_keeps_previous_config(tmp_path, monkeypatch):
+    path = tmp_path / "config.yaml"
+    _write(path, "gpt", 1_000_000_000)
+    monkeypatch.setattr(config_helper, "CONFIG_PATH", path)
+    monkeypatch.setattr(config_helper, "CONFIG_RELOAD_INTERVAL", 0)
+    monkeypatch.setattr(config_helper, "_config_state", {"config": None, "mtime": None, "checked_at": 0.0})
+    assert config_helper.get_model_config()["model"] == "gpt-4o-mini"
+
+    path.write_text("model_choice: [unclosed")
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    assert config_helper.get_model_config()["model"] == "gpt-4o-mini"
@@ -0,0 +1,77 @@
+"""
+Tests for agent registration over the ConnectionManager websocket
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common import codec
+from common import ConnectionManager as connection_module
+from common.ConnectionManager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, response):
+        self.sent = []
+        self.response = response
+
+    async def send(self, data):
+        self.sent.append(data)
+
+    async def recv(self):
+        return self.response
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+def test_connect_registers_and_starts_listening(monkeypatch):
+    websocket = FakeWebSocket(json.dumps({"status": "registered", "codec": codec.MSGPACK}))
+
+    async def fake_connect(uri):
+        return websocket
+
+    async def no_sleep(seconds):
+        raise AssertionError("connect() hit its error path")
+
+    monkeypatch.setattr(connection_module.websockets, "connect", fake_connect)
+    monkeypatch.setattr(connection_module.asyncio, "sleep", no_sleep)
+
+    async def scenario():
+        manager = ConnectionManager("TestAgent", "test agent", ["testing"])
+        await manager.connect()
+        assert manager._websocket is websocket
+        await manager.start_listening(lambda message: None)
+        manager.loop_monitor.stop()
+        manager.task.cancel()
+        return manager
+
+    manager = asyncio.run(scenario())
+
+    registration = json.loads(websocket.sent[0])
+    assert registration["message_type"] == "register"
+    assert registration["agent_id"] == "TestAgent"
+    assert registration["codecs"] == codec.SUPPORTED_CODECS
+    assert manager.codec == codec.MSGPACK
+
+
+def test_register_falls_back_to_json_on_plain_response():
+    websocket = FakeWebSocket("registered")
+
+    async def scenario():
+        manager = ConnectionManager("TestAgent", "test agent", [])
+        manager._websocket = websocket
+        await manager._register()
+        return manager
+
+    assert asyncio.run(scenario()).codec == codec.JSON
@@ -0,0 +1,74 @@
+"""
+Tests for folding per-document Chroma collections into the shared chunk index
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+chromadb = pytest.importorskip("chromadb")
+
+from agents.main_agent.backend.dataBase_setup import chroma_setup, sql_setup
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Chroma and the document catalog in a temporary directory"""
+    monkeypatch.setattr(chroma_setup, "CHROMA_PATH", str(tmp_path / "chroma"))
+    monkeypatch.setattr(chroma_setup, "PDF_SUMMARY_COLLECTION", "PdfSummary")
+    monkeypatch.setattr(chroma_setup, "MIGRATE_BATCH_SIZE", 2)
+    monkeypatch.setattr(chroma_setup, "_chroma_client", None)
+    monkeypatch.setattr(chroma_setup, "_doc_index_migrated", False)
+    monkeypatch.setattr(sql_setup, "SQL_PATH", str(tmp_path / "catalog.db"))
+    monkeypatch.setattr(sql_setup, "_catalog_conn", None)
+    return chroma_setup.get_chroma_client()
+
+
+def _legacy_collection(client, name, chunks, doc_name=None):
+    collection = client.create_collection(name=name)
+    collection.add(
+        ids=[f"{name}-{i}" for i in range(len(chunks))],
+        embeddings=[[float(i), 1.0, 0.0] for i in range(len(chunks))],
+        documents=chunks,
+        metadatas=[{"doc_name": doc_name or "", "referenece_number": i} for i in range(len(chunks))],
+    )
+
+
+def test_legacy_collections_are_migrated_before_the_catalog_is_read(stores):
+    _legacy_collection(stores, "manual", ["install the app", "reset the router", "call support"], "manual")
+    _legacy_collection(stores, "report", ["q3 revenue", "q3 costs"])
+    stores.create_collection(name="PdfSummary").add(ids=["s"], embeddings=[[0.0, 0.0, 1.0]], documents=["summary"])
+
+    # the catalog is read before anything touched the index
+    assert chroma_setup.find_doc_name("Summarize the Manual please") == "manual"
+    assert chroma_setup.list_document_names() == ["manual", "report"]
+
+    names = {collection.name for collection in stores.list_collections()}
+    assert names == {chroma_setup.DOC_INDEX_COLLECTION, "PdfSummary"}
+    assert sorted(chroma_setup.get_doc_chunks("manual")) == ["call support", "install the app", "reset the router"]
+    assert sorted(chroma_setup.get_doc_chunks("report")) == ["q3 costs", "q3 revenue"]
+    assert {d["doc_name"]: d["chunk_count"] for d in sql_setup.list_documents()} == {"manual": 3, "report": 2}
+
+
+def test_concurrent_first_calls_migrate_once(stores, monkeypatch):
+    calls = []
+
+    def slow_migration(index=None):
+        calls.append(index)
+        time.sleep(0.1)
+        return 0
+
+    monkeypatch.setattr(chroma_setup, "migrate_doc_collections", slow_migration)
+
+    threads = [threading.Thread(target=chroma_setup.list_document_names) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
@@ -0,0 +1,85 @@
+"""
+Tests for batched OpenAI embeddings in common.stores.Embedding
+"""
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openai import RateLimitError
+
+from common.memory.semantic import Semantic
+from common.stores.Embedding import Embedding
+
+
+class FakeEmbeddings:
+    """Embeds each text as [len(text), request number]; the first `fail` requests hit a 429"""
+    def __init__(self, fail=0):
+        self.fail = fail
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def create(self, model, input):
+        with self.lock:
+            self.requests.append(list(input))
+            if self.fail:
+                self.fail -= 1
+                response = httpx.Response(429, headers={"retry-after": "0"},
+                                          request=httpx.Request("POST", "https://api.openai.com/v1/embeddings"))
+                raise RateLimitError("rate limited", response=response, body=None)
+        data = [SimpleNamespace(index=i, embedding=[float(len(text)), 1.0]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=list(reversed(data)))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    """Keep the on-disk embedding cache out of tests that count requests"""
+    monkeypatch.setattr("common.embedding_cache.get_embedding_cache", lambda: None)
+
+
+def _embedding(monkeypatch, fake, **kwargs) -> Embedding:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    embedding = Embedding(**kwargs)
+    embedding.client = SimpleNamespace(embeddings=fake)
+    return embedding
+
+
+def test_inputs_are_packed_into_batches_in_order(monkeypatch):
+    fake = FakeEmbeddings()
+    embedding = _embedding(monkeypatch, fake, batch_size=3, max_concurrency=2)
+    texts = ["a" * n for n in range(1, 8)]
+
+    vectors = embedding.get_embeddings(texts)
+
+    assert vectors.dtype == np.float32
+    assert vectors.shape == (7, 2)
+    assert vectors[:, 0].tolist() == list(range(1, 8))
+    assert sorted(len(batch) for batch in fake.requests) == [1, 3, 3]
+
+
+def test_single_item_wrapper_and_memory_objects(monkeypatch):
+    fake = FakeEmbeddings()
+    embedding = _embedding(monkeypatch, fake)
+
+    vector = embedding.get_embedding(Semantic(subject="user", predicate="likes", object="tea"))
+
+    assert vector == [float(len("user likes tea")), 1.0]
+    assert fake.requests == [["user likes tea"]]
+
+
+def test_rate_limited_batches_are_retried(monkeypatch):
+    fake = FakeEmbeddings(fail=2)
+    embedding = _embedding(monkeypatch, fake, max_retries=3)
+    monkeypatch.setattr("common.stores.Embedding.time.sleep", lambda seconds: None)
+
+    vectors = embedding.get_embeddings(["x", "yy"])
+
+    assert len(fake.requests) == 3
+    assert vectors[:, 0].tolist() == [1.0, 2.0]
@@ -0,0 +1,58 @@
+"""
+Tests for the content-addressed embedding cache
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.embedding_cache import EmbeddingCache, cached_embed
+
+
+def _fake_embed(calls):
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+    return embed
+
+
+def test_only_unseen_texts_are_embedded(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.db"))
+    calls = []
+
+    first = cached_embed("model-a", ["hello", "world!", "hello"], _fake_embed(calls), cache=cache)
+    second = cached_embed("model-a", ["  hello ", "new"], _fake_embed(calls), cache=cache)
+
+    assert calls == [["hello", "world!"], ["new"]]
+    assert first.dtype == np.float32 and first.shape == (3, 2)
+    assert second[:, 0].tolist() == [5.0, 3.0]
+    assert cache.stats()["hits"] == 1
+
+
+def test_model_is_part_of_the_key(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.db"))
+    calls = []
+
+    cached_embed("model-a", ["hello"], _fake_embed(calls), cache=cache)
+    cached_embed("model-b", ["hello"], _fake_embed(calls), cache=cache)
+
+    assert calls == [["hello"], ["hello"]]
+
+
+def test_least_recently_used_vectors_are_evicted(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    cache = EmbeddingCache(path=path, max_entries=3)
+    calls = []
+
+    cached_embed("m", ["a", "b", "c"], _fake_embed(calls), cache=cache)
+    cache._conn.execute("UPDATE embeddings SET accessed_at = accessed_at - 10")
+    cached_embed("m", ["a"], _fake_embed(calls), cache=cache)
+    cached_embed("m", ["d"], _fake_embed(calls), cache=cache)
+
+    reopened = EmbeddingCache(path=path, max_entries=3)
+    cached_embed("m", ["a", "b", "c", "d"], _fake_embed(calls), cache=reopened)
+    assert calls[-1] == ["b", "c"]
+    assert cache.stats()["evictions"] == 2
@@ -0,0 +1,105 @@
+"""
+Tests for correlated request/response handling in MainAgentAdaptor
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.main_agent.Server.MainAgentAdaptor import MainAgentAdaptor
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload):
+        self.sent.append(payload)
+
+
+def _make_adaptor():
+    adaptor = MainAgentAdaptor("main_agent", "Interactive client", [])
+    adaptor.connection = FakeConnection()
+    return adaptor
+
+
+def _reply(request, message):
+    return {
+        "message_type": "message",
+        "sender_id": request["recipient_id"],
+        "correlation_id": request["correlation_id"],
+        "message": message,
+    }
+
+
+def test_concurrent_requests_resolve_by_correlation_id():
+    async def scenario():
+        adaptor = _make_adaptor()
+        first = asyncio.create_task(adaptor.request("DirectoryAgent", "first", timeout=1))
+        second = asyncio.create_task(adaptor.request("WebAgent", "second", timeout=1))
+        await asyncio.sleep(0)
+
+        first_request, second_request = adaptor.connection.sent
+        assert first_request["correlation_id"] != second_request["correlation_id"]
+
+        # replies arrive out of order
+        await adaptor.handle_message(_reply(second_request, "second reply"))
+        await adaptor.handle_message(_reply(first_request, "first reply"))
+
+        assert (await first)["message"] == "first reply"
+        assert (await second)["message"] == "second reply"
+        assert adaptor.pending_requests == {}
+
+    asyncio.run(scenario())
+
+
+def test_late_reply_is_not_attributed_to_next_request():
+    async def scenario():
+        adaptor = _make_adaptor()
+        assert await adaptor.request("DirectoryAgent", "slow", timeout=0.01) is None
+        late_request = adaptor.connection.sent[0]
+
+        task = asyncio.create_task(adaptor.request("DirectoryAgent", "next", timeout=1))
+        await asyncio.sleep(0)
+        await adaptor.handle_message(_reply(late_request, "late reply"))
+        await adaptor.handle_message(_reply(adaptor.connection.sent[1], "next reply"))
+
+        assert (await task)["message"] == "next reply"
+        assert (await adaptor.receive_message(timeout=0.01))["message"] == "late reply"
+
+    asyncio.run(scenario())
+
+
+def test_unsolicited_message_with_inherited_correlation_id_is_queued():
+    async def scenario():
+        adaptor = _make_adaptor()
+        task = asyncio.create_task(adaptor.request("DirectoryAgent", "question", timeout=1))
+        await asyncio.sleep(0)
+        request = adaptor.connection.sent[0]
+
+        # another agent forwards a message stamped with the id of the exchange it came from
+        await adaptor.handle_message({"message_type": "message", "sender_id": "WebAgent",
+                                      "correlation_id": "upstream-id", "message": "fyi"})
+        await adaptor.handle_message(_reply(request, "answer"))
+
+        assert (await task)["message"] == "answer"
+        assert (await adaptor.receive_message(timeout=0.01))["message"] == "fyi"
+        assert adaptor.message_queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_requests_carry_the_conversation_id():
+    async def scenario():
+        adaptor = _make_adaptor()
+        await adaptor.request("DirectoryAgent", "first", timeout=0.01)
+        await adaptor.request("WebAgent", "second", timeout=0.01, conversation_id="chat-7")
+        return adaptor
+
+    adaptor = asyncio.run(scenario())
+
+    first, second = adaptor.connection.sent
+    assert first["conversation_id"] == adaptor.conversation_id
+    assert second["conversation_id"] == "chat-7"